@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark the tree and regex matching engines of the processor.
+
+Both engines are run on the same pre-processed input (the canonical poem
+and Sindarin fixture lines, repeated) for each mode. The tokens are checked
+for equality before timing, so a faster engine can never hide a mismatch.
+
+Usage:
+    python -m scripts.benchmark_engines
+    python -m scripts.benchmark_engines --repeat 200 --rounds 5
+"""
+
+import argparse
+import json
+import os
+import time
+
+from glaemscribe.parsers.mode_parser import ModeParser
+from glaemscribe.resources import get_mode_path
+from glaemscribe.core.transcription_processor import TranscriptionProcessor
+
+
+def load_fixture_lines():
+    """Load the canonical fixture lines, grouped by mode name."""
+    repo_root = os.path.dirname(os.path.dirname(__file__))
+    fixtures_dir = os.path.join(repo_root, 'tests', 'fixtures')
+
+    lines = {}
+    with open(os.path.join(fixtures_dir, 'poem_transcription_canonical.json'), 'r', encoding='utf-8') as f:
+        lines['quenya-tengwar-classical'] = [case['line'] for case in json.load(f)]
+    with open(os.path.join(fixtures_dir, 'sindarin_transcription_canonical.json'), 'r', encoding='utf-8') as f:
+        for case in json.load(f):
+            lines.setdefault(case['mode'], []).append(case['line'])
+    return lines
+
+
+def time_engine(processor: TranscriptionProcessor, engine: str, text: str, rounds: int) -> float:
+    """Return the best wall time of `rounds` transcriptions of text."""
+    processor.set_engine(engine)
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        processor.transcribe(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the tree and regex matching engines.")
+    parser.add_argument('--repeat', type=int, default=100, help="Times the fixture text is repeated")
+    parser.add_argument('--rounds', type=int, default=3, help="Timing rounds per engine (best is kept)")
+    args = parser.parse_args()
+
+    print(f"{'mode':32} {'chars':>8} {'build ms':>9} {'tree ms':>9} {'regex ms':>9} {'speedup':>8}")
+    for mode_name, lines in load_fixture_lines().items():
+        mode = ModeParser().parse(str(get_mode_path(mode_name)))
+        mode.processor.finalize({})
+        processor = mode.processor
+
+        text = mode.pre_processor.apply(" ".join(lines).lower())
+        text = " ".join([text] * args.repeat)
+
+        start = time.perf_counter()
+        processor.set_engine(TranscriptionProcessor.ENGINE_REGEX)
+        build_time = time.perf_counter() - start
+
+        processor.set_engine(TranscriptionProcessor.ENGINE_TREE)
+        tree_tokens = processor.transcribe(text)
+        processor.set_engine(TranscriptionProcessor.ENGINE_REGEX)
+        if processor.transcribe(text) != tree_tokens:
+            print(f"{mode_name:32} MISMATCH between engines")
+            continue
+
+        tree_time = time_engine(processor, TranscriptionProcessor.ENGINE_TREE, text, args.rounds)
+        regex_time = time_engine(processor, TranscriptionProcessor.ENGINE_REGEX, text, args.rounds)
+
+        print(f"{mode_name:32} {len(text):8d} {build_time * 1000:9.1f} {tree_time * 1000:9.1f} "
+              f"{regex_time * 1000:9.1f} {tree_time / regex_time:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
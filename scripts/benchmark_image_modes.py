@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark the image modes and encoder settings of the renderer.
+
+Renders the canonical Namárië transcription (one image per line, plus the
+whole poem as one image) in each image mode, encodes it with each format
+and encoder setting, and reports the total encoded size and the best
+encode time. Rendering itself is timed apart from encoding.
+
+Usage:
+    python -m scripts.benchmark_image_modes
+    python -m scripts.benchmark_image_modes --font-size 48 --rounds 5
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+
+from glaemscribe.render import TengwarRenderer
+
+
+# (format, label, encoder options)
+ENCODINGS = [
+    ("PNG", "default", {}),
+    ("PNG", "level 9 + optimize", {"compress_level": 9, "optimize": True}),
+    ("PNG", "level 1", {"compress_level": 1}),
+    ("WEBP", "lossless", {"lossless": True}),
+    ("WEBP", "lossless method 6", {"lossless": True, "method": 6}),
+    ("WEBP", "quality 80", {"quality": 80}),
+]
+
+# (label, render_text options)
+MODES = [
+    ("RGB", {"mode": "RGB"}),
+    ("RGBA", {"mode": "RGBA"}),
+    ("L", {"mode": "L"}),
+    ("P 2 colors", {"mode": "P", "palette_colors": 2}),
+    ("P 4 colors", {"mode": "P", "palette_colors": 4}),
+    ("P 16 colors", {"mode": "P", "palette_colors": 16}),
+    ("1", {"mode": "1"}),
+]
+
+
+def load_texts():
+    """Load the canonical Tengwar lines of the poem, and the whole poem."""
+    repo_root = os.path.dirname(os.path.dirname(__file__))
+    path = os.path.join(repo_root, 'tests', 'fixtures', 'poem_transcription_canonical.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [case['output'] for case in json.load(f)]
+    return lines + ["\n".join(lines)]
+
+
+def encode(image, format, options):
+    """Encode an image, returning its bytes."""
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **options)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare image modes and encoder settings.")
+    parser.add_argument('--font', default='freemono', help="Bundled font name")
+    parser.add_argument('--font-size', type=int, default=32, help="Font size in points")
+    parser.add_argument('--rounds', type=int, default=3, help="Timing rounds (best is kept)")
+    args = parser.parse_args()
+
+    renderer = TengwarRenderer(font_name=args.font, font_size=args.font_size)
+    texts = load_texts()
+
+    print(f"{'mode':12} {'format':6} {'encoder':20} {'bytes':>9} {'ratio':>6} {'render ms':>10} {'encode ms':>10}")
+    baseline = None
+    for mode_label, mode_options in MODES:
+        start = time.perf_counter()
+        images = [renderer.render_text(text, **mode_options) for text in texts]
+        render_time = time.perf_counter() - start
+
+        for format, encoder_label, encoder_options in ENCODINGS:
+            size = sum(len(encode(image, format, encoder_options)) for image in images)
+            best = float('inf')
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                for image in images:
+                    encode(image, format, encoder_options)
+                best = min(best, time.perf_counter() - start)
+            if baseline is None:
+                baseline = size
+            print(f"{mode_label:12} {format:6} {encoder_label:20} {size:9d} {baseline / size:5.1f}x "
+                  f"{render_time * 1000:10.1f} {best * 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
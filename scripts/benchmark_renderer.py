@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Benchmark TengwarRenderer latency and throughput.
+
+For each bundled font, font size, text length and output format, the
+rendering pipeline is timed phase by phase:
+
+- load: loading the font file (uncached, as a fresh process would)
+- measure: the renderer measuring the text (bounding box, or glyph atlas
+  mask with --atlas)
+- draw: the renderer creating the image and drawing the measured text
+- encode: encoding the image as render_to_bytes() does (and base64 / HTML
+  formatting)
+
+and end to end through the public renderer API, from which the throughput
+is derived. Phases report the median over the rounds, in milliseconds.
+Results are printed as a table and written as JSON, to size rendering
+capacity and compare runs for regressions.
+
+Usage:
+    python -m scripts.benchmark_renderer
+    python -m scripts.benchmark_renderer --fonts freemono --sizes 24 48 --rounds 20
+    python -m scripts.benchmark_renderer --atlas
+    python -m scripts.benchmark_renderer --output data/benchmark_renderer.json
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import platform
+import statistics
+import time
+
+import PIL
+from PIL import ImageFont
+
+from glaemscribe.render import TengwarRenderer
+
+
+FONTS = ['freemono', 'alcarin-reg', 'alcarin-bold']
+SIZES = [16, 32, 64]
+FORMATS = ['png', 'jpeg', 'base64', 'html']
+
+
+def load_texts():
+    """Build short, medium and long texts from the canonical Namárië transcription."""
+    repo_root = os.path.dirname(os.path.dirname(__file__))
+    path = os.path.join(repo_root, 'tests', 'fixtures', 'poem_transcription_canonical.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [case['output'] for case in json.load(f)]
+    return {
+        'short': lines[0].split(' ')[0],
+        'medium': lines[0],
+        'long': "\n".join(lines),
+    }
+
+
+def median_ms(samples):
+    """Median of timings in seconds, in milliseconds."""
+    return statistics.median(samples) * 1000
+
+
+def time_phases(renderer, text, output, rounds):
+    """Time the renderer's measure, draw and encode phases of one render (medians in ms)."""
+    measure, draw, encode = [], [], []
+    # Untimed warm-up (glyph atlas, glyph coverage of the HTML path, allocator)
+    renderer.render_to_bytes(text)
+    renderer.render_html(text)
+    for _ in range(rounds):
+        start = time.perf_counter()
+        text_mask, bbox = renderer._measure_text(text)
+        measured = time.perf_counter()
+
+        image = renderer._draw_text(text, text_mask, bbox, None, 10, "white", "black", "RGB", 2)
+        drawn = time.perf_counter()
+
+        if output == 'html':
+            renderer.render_html(text)
+        else:
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG' if output == 'jpeg' else 'PNG')
+            if output == 'base64':
+                base64.b64encode(buffer.getvalue()).decode('ascii')
+        encoded = time.perf_counter()
+
+        measure.append(measured - start)
+        draw.append(drawn - measured)
+        encode.append(encoded - drawn)
+
+    if output == 'html':
+        # The web font path neither measures nor draws
+        measure = draw = [0.0]
+    return median_ms(measure), median_ms(draw), median_ms(encode)
+
+
+def time_end_to_end(renderer, text, output, rounds):
+    """Time whole renders through the public API, returning (median ms, output bytes)."""
+    render = {
+        'png': lambda: renderer.render_to_bytes(text, format='PNG'),
+        'jpeg': lambda: renderer.render_to_bytes(text, format='JPEG'),
+        'base64': lambda: renderer.render_to_base64(text),
+        'html': lambda: renderer.render_html(text),
+    }[output]
+    samples = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = render()
+        samples.append(time.perf_counter() - start)
+    size = len(result) if isinstance(result, bytes) else len(result.encode('utf-8'))
+    return median_ms(samples), size
+
+
+def time_font_load(font_path, size, rounds):
+    """Median time of loading a font file, bypassing the font cache (ms)."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        ImageFont.truetype(font_path, size)
+        samples.append(time.perf_counter() - start)
+    return median_ms(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TengwarRenderer across fonts, sizes, texts and formats.")
+    parser.add_argument('--fonts', nargs='+', default=FONTS, choices=FONTS, help="Bundled fonts")
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES, help="Font sizes")
+    parser.add_argument('--formats', nargs='+', default=FORMATS, choices=FORMATS, help="Output formats")
+    parser.add_argument('--atlas', action='store_true', help="Render single lines through the glyph atlas")
+    parser.add_argument('--rounds', type=int, default=10, help="Timed rounds per case (median is kept)")
+    parser.add_argument('--output', default=os.path.join('data', 'benchmark_renderer.json'),
+                        help="JSON results file")
+    args = parser.parse_args()
+
+    texts = load_texts()
+    results = []
+
+    print(f"{'font':13} {'size':>4} {'text':6} {'format':6} {'load ms':>8} {'measure':>8} {'draw':>8} "
+          f"{'encode':>8} {'total ms':>9} {'per s':>8} {'bytes':>8}")
+    for font_name in args.fonts:
+        for size in args.sizes:
+            renderer = TengwarRenderer(font_name=font_name, font_size=size, use_atlas=args.atlas)
+            load_ms = time_font_load(renderer.font_path, size, args.rounds)
+            for text_name, text in texts.items():
+                for output in args.formats:
+                    measure_ms, draw_ms, encode_ms = time_phases(renderer, text, output, args.rounds)
+                    total_ms, output_bytes = time_end_to_end(renderer, text, output, args.rounds)
+                    throughput = 1000 / total_ms if total_ms else float('inf')
+                    results.append({
+                        'font': font_name,
+                        'size': size,
+                        'text': text_name,
+                        'chars': len(text),
+                        'format': output,
+                        'load_ms': load_ms,
+                        'measure_ms': measure_ms,
+                        'draw_ms': draw_ms,
+                        'encode_ms': encode_ms,
+                        'total_ms': total_ms,
+                        'renders_per_second': throughput,
+                        'output_bytes': output_bytes,
+                    })
+                    print(f"{font_name:13} {size:4d} {text_name:6} {output:6} {load_ms:8.2f} {measure_ms:8.3f} "
+                          f"{draw_ms:8.3f} {encode_ms:8.3f} {total_ms:9.3f} {throughput:8.0f} {output_bytes:8d}")
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'platform': platform.platform(),
+            'raqm': ImageFont.core.HAVE_RAQM if hasattr(ImageFont.core, 'HAVE_RAQM') else None,
+        },
+        'rounds': args.rounds,
+        'atlas': args.atlas,
+        'results': results,
+    }
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
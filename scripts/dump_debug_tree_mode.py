@@ -23,16 +23,16 @@ from glaemscribe.parsers.mode_parser import ModeParser
 from glaemscribe.resources import get_mode_path
 
 
-def build_node_dict(node, path: str = ""):
+def build_node_dict(node, token_table, path: str = ""):
     children = []
     for char in sorted(node.siblings.keys()):
         child = node.siblings[char]
-        children.append(build_node_dict(child, path + (char or "")))
+        children.append(build_node_dict(child, token_table, path + (char or "")))
 
     return {
         "character": node.character if node.character is not None else "ROOT",
         "path": path,
-        "replacement": node.replacement,
+        "replacement": token_table.names_of(node.replacement) if node.replacement is not None else None,
         "effective": node.is_effective(),
         "child_count": len(children),
         "children": children,
@@ -68,7 +68,7 @@ def main() -> None:
     mode.processor.finalize({})
 
     tree_root = mode.processor.transcription_tree
-    tree_dict = build_node_dict(tree_root)
+    tree_dict = build_node_dict(tree_root, mode.processor.token_table)
 
     with out_path.open("w", encoding="utf-8") as f:
         json.dump(tree_dict, f, ensure_ascii=False, indent=2)
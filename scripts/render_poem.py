@@ -18,6 +18,7 @@ import json
 import os
 from PIL import Image, ImageDraw, ImageFont
 from glaemscribe.parsers.mode_parser import ModeParser
+from glaemscribe.render.layout import layout_text
 
 def load_poem_outputs():
     """Load the poem transcription outputs."""
@@ -69,11 +70,10 @@ def _render_with_font(poem_data, font_path, label, base_filename):
     draw2 = ImageDraw.Draw(img2)
 
     draw2.text((50, 30), f"Namárië - Tengwar Transcription ({label})", font=title_font, fill='black')
-    y_position = 80
-    for i, line_data in enumerate(poem_data):
-        tengwar_text = line_data['output']
-        draw2.text((50, y_position), tengwar_text, font=font, fill='black')
-        y_position += 50
+    tengwar_layout = layout_text(font, "\n".join(line_data['output'] for line_data in poem_data),
+                                 max_width=width - 100, line_spacing=2.0)
+    for line in tengwar_layout.lines:
+        draw2.text((50 + line.x, 80 + line.y), line.text, font=font, fill='black')
 
     draw2.text((50, height - 40), label, font=font, fill='gray')
     out2 = os.path.join(output_dir, f'{base_filename}_tengwar_only.png')
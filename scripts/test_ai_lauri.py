@@ -16,16 +16,16 @@ from glaemscribe.parsers.mode_parser import ModeParser
 import json
 import os
 
-def build_node_dict(node, path: str = ""):
+def build_node_dict(node, token_table, path: str = ""):
     children = []
     for char in sorted(node.siblings.keys()):
         child = node.siblings[char]
-        children.append(build_node_dict(child, path + (char or "")))
+        children.append(build_node_dict(child, token_table, path + (char or "")))
 
     return {
         "character": node.character if node.character is not None else "ROOT",
         "path": path,
-        "replacement": node.replacement,
+        "replacement": token_table.names_of(node.replacement) if node.replacement is not None else None,
         "effective": node.is_effective(),
         "child_count": len(children),
         "children": children,
@@ -39,7 +39,7 @@ mode.processor.finalize({})
 
 # Dump the Python transcription tree
 tree_root = mode.processor.transcription_tree
-tree_dict = build_node_dict(tree_root)
+tree_dict = build_node_dict(tree_root, mode.processor.token_table)
 
 output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 os.makedirs(output_dir, exist_ok=True)
@@ -16,6 +16,7 @@ Advanced API:
 
 from typing import Dict, List, Optional, Tuple
 from .parsers.mode_parser import ModeParser
+from .parsers.charset_parser import clear_charset_registry
 from .resources import get_mode_path
 
 
@@ -166,7 +167,7 @@ def list_modes() -> List[str]:
 
 
 def clear_cache():
-    """Clear the mode cache.
+    """Clear the mode cache and the shared charsets.
     
     Useful if you want to reload modes or free memory.
     
@@ -174,4 +175,5 @@ def clear_cache():
         >>> clear_cache()  # Force reload of all modes on next use
     """
     _mode_cache.clear()
+    clear_charset_registry()
 
@@ -1,7 +1,43 @@
 """Character set definitions for Glaemscribe."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass, field
-from typing import Dict, Optional, List, Set
+from types import MappingProxyType
+from typing import Any, Dict, Optional, List, Set, Tuple
+
+
+class VirtualTriggerIndex:
+    """Inverted index of the virtual characters of a charset.
+    
+    Maps each trigger name to the virtual classes it triggers, so that
+    virtual resolution only touches the classes a token actually affects.
+    
+    Attributes:
+        virtuals: Distinct virtual characters, in definition order
+        positions: Virtual character name -> index in virtuals
+        triggers: Trigger name -> tuple of (index in virtuals, result char)
+        size: Number of virtual_chars entries the index was built from
+    """
+    
+    def __init__(self, virtual_chars: Dict[str, Any]):
+        self.virtuals: List[Any] = []
+        self.positions: Dict[str, int] = {}
+        seen: Dict[int, int] = {}
+        for name, vc in virtual_chars.items():
+            if id(vc) not in seen:
+                seen[id(vc)] = len(self.virtuals)
+                self.virtuals.append(vc)
+            self.positions[name] = seen[id(vc)]
+        
+        triggers: Dict[str, List[Tuple[int, Any]]] = {}
+        for index, vc in enumerate(self.virtuals):
+            for trigger_name, result_char in getattr(vc, 'lookup_table', {}).items():
+                triggers.setdefault(trigger_name, []).append((index, result_char))
+        self.triggers: Dict[str, Tuple[Tuple[int, Any], ...]] = {
+            name: tuple(entries) for name, entries in triggers.items()
+        }
+        self.size = len(virtual_chars)
 
 
 @dataclass
@@ -13,6 +49,7 @@ class Charset:
     virtual_chars: Dict[str, str] = field(default_factory=dict)
     sequences: Dict[str, List[str]] = field(default_factory=dict)
     swaps: Dict[str, Set[str]] = field(default_factory=dict)
+    _virtual_index: Optional[VirtualTriggerIndex] = field(default=None, init=False, repr=False, compare=False)
     
     def get_character(self, char_name: str) -> str:
         """Get the Unicode character for a given character name."""
@@ -44,13 +81,49 @@ class Charset:
         """Resolve a virtual character to its definition."""
         return self.virtual_chars.get(virtual_name)
 
+    def virtual_trigger_index(self) -> VirtualTriggerIndex:
+        """Get the inverted trigger index of the virtual characters.
+        
+        Built on first use and rebuilt when virtual characters are added.
+        """
+        index = self._virtual_index
+        if index is None or index.size != len(self.virtual_chars):
+            index = self._virtual_index = VirtualTriggerIndex(self.virtual_chars)
+        return index
+
+    def freeze(self) -> Charset:
+        """Make the charset read-only, so that it can be shared.
+        
+        The mappings become read-only views, swap targets frozensets and
+        sequences tuples, and the virtual trigger index is built up front.
+        
+        Returns:
+            The charset itself
+        """
+        self.characters = MappingProxyType(dict(self.characters))
+        self.virtual_chars = MappingProxyType(dict(self.virtual_chars))
+        self.sequences = MappingProxyType({name: tuple(tokens) for name, tokens in self.sequences.items()})
+        self.swaps = MappingProxyType({trigger: frozenset(targets) for trigger, targets in self.swaps.items()})
+        self.virtual_trigger_index()
+        return self
+    
+    def is_frozen(self) -> bool:
+        """Check whether the charset was made read-only by freeze()."""
+        return isinstance(self.characters, MappingProxyType)
+
     def has_swap_target(self, trigger: str, target: str) -> bool:
         """Check if there is a swap rule for trigger that targets the given next token."""
         tgts = self.swaps.get(trigger)
         return target in tgts if tgts else False
 
     def add_swap(self, trigger: str, targets: List[str]) -> None:
-        """Add swap targets for a trigger."""
+        """Add swap targets for a trigger.
+        
+        Raises:
+            ValueError: If the charset is frozen
+        """
+        if self.is_frozen():
+            raise ValueError(f"Charset {self.name} is frozen")
         if trigger not in self.swaps:
             self.swaps[trigger] = set()
         self.swaps[trigger].update(targets)
@@ -0,0 +1,375 @@
+"""Read-only binary format for a finalized transcription tree.
+
+A finalized TranscriptionTreeNode (and its token table) is flattened into
+a file of fixed-width integer arrays that can be memory-mapped and walked
+in place, without building any Python node objects. Processes that open
+the same file (e.g. the workers of a pre-fork server) share one physical
+copy of it through the page cache, and loading is just a file open.
+
+Layout (all integers are native-endian uint32, sections 4-byte aligned):
+
+    header              magic, format version, byte order, source key, counts,
+                        CRC-32 of everything after the header
+    node_first_edge     [nodes + 1]  edges of node i are [first[i], first[i+1])
+    node_replacement    [nodes]      replacement id, NO_REPLACEMENT if none
+    edge_char           [edges]      code point, sorted within each node
+    edge_child          [edges]      target node
+    replacement_start   [replacements + 1]  slice into replacement_tokens
+    replacement_tokens  [...]        token ids
+    string_start        [strings + 1]  slice into the UTF-8 string blob
+    charset_char        [chars]      sorted input characters (in_charset)
+    charset_group       [chars]      group name string id
+    string blob         UTF-8 token names (in token ID order), then group names
+
+The source key is a SHA-256 digest of the format version, the .glaem
+source and the transcription options, so a stale file is rejected
+instead of silently transcribing with outdated rules. The file length and
+the payload checksum are verified on open, so a truncated, padded or
+partly overwritten file is rejected as well.
+"""
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import Dict, List, Optional, Set, Tuple, Union, Any
+
+from .token_table import TokenTable
+from .transcription_tree_node import TranscriptionTreeNode
+
+
+FORMAT_MAGIC = b"GLTR"
+FORMAT_VERSION = 4
+
+NO_REPLACEMENT = 0xFFFFFFFF
+
+# magic, version, byte order, source key, 8 section counts, payload CRC-32
+_HEADER = struct.Struct("<4sHH32s9I")
+_BYTE_ORDERS = {"little": 1, "big": 2}
+
+
+def compiled_tree_key(source: Union[str, bytes, os.PathLike], trans_options: Optional[Dict[str, Any]] = None) -> bytes:
+    """Compute the source key of a compiled tree.
+
+    Args:
+        source: Path to the .glaem file, or its raw content as bytes
+        trans_options: Transcription options the processor is finalized with
+
+    Returns:
+        32-byte SHA-256 digest
+    """
+    if isinstance(source, bytes):
+        content = source
+    else:
+        with open(source, 'rb') as f:
+            content = f.read()
+
+    digest = hashlib.sha256()
+    digest.update(FORMAT_MAGIC + struct.pack("<H", FORMAT_VERSION))
+    digest.update(content)
+    digest.update(json.dumps(trans_options or {}, sort_keys=True, default=str).encode('utf-8'))
+    return digest.digest()
+
+
+def _u32(values) -> bytes:
+    """Pack integers as a native-endian uint32 array."""
+    return array('I', values).tobytes()
+
+
+def write_compiled_tree(tree: TranscriptionTreeNode, path: str, source_key: bytes,
+                        in_charset: Optional[Dict[str, str]] = None,
+                        token_table: Optional[TokenTable] = None):
+    """Serialize a finalized tree to the compiled binary format.
+
+    The file is written next to its destination and renamed into place,
+    so concurrent readers never see a partial file.
+
+    Args:
+        tree: Root of the finalized transcription tree
+        path: Destination file
+        source_key: Key from compiled_tree_key()
+        in_charset: Optional mapping of input character to rule group name
+        token_table: Table the tree replacements are interned in. If not
+            given, the replacements are token names and are interned into
+            a new table.
+    """
+    if len(source_key) != 32:
+        raise ValueError("Source key must be a 32-byte digest")
+
+    if token_table is None:
+        token_table = TokenTable()
+        to_ids = token_table.intern_all
+    else:
+        to_ids = tuple
+
+    replacements: Dict[Tuple[int, ...], int] = {}
+
+    def replacement_id(replacement) -> int:
+        key = to_ids(replacement)
+        if key not in replacements:
+            replacements[key] = len(replacements)
+        return replacements[key]
+
+    # Breadth-first numbering keeps the edges of a node contiguous
+    nodes = [tree]
+    node_first_edge = []
+    node_replacement = []
+    edge_char = []
+    edge_child = []
+    index = 0
+    while index < len(nodes):
+        node = nodes[index]
+        node_first_edge.append(len(edge_char))
+        node_replacement.append(replacement_id(node.replacement) if node.is_effective() else NO_REPLACEMENT)
+        for char in sorted(node.siblings, key=ord):
+            edge_char.append(ord(char))
+            edge_child.append(len(nodes))
+            nodes.append(node.siblings[char])
+        index += 1
+    node_first_edge.append(len(edge_char))
+
+    replacement_start = [0]
+    replacement_tokens = []
+    for replacement in replacements:
+        replacement_tokens.extend(replacement)
+        replacement_start.append(len(replacement_tokens))
+
+    # Token names take the first string ids, group names follow
+    token_count = len(token_table)
+    strings: Dict[str, int] = {}
+    string_list = list(token_table.names)
+
+    def string_id(string: str) -> int:
+        if string not in strings:
+            strings[string] = len(string_list)
+            string_list.append(string)
+        return strings[string]
+
+    charset_items = sorted((in_charset or {}).items(), key=lambda item: ord(item[0]))
+    charset_char = [ord(char) for char, _ in charset_items]
+    charset_group = [string_id(group_name) for _, group_name in charset_items]
+
+    string_start = [0]
+    blob = bytearray()
+    for string in string_list:
+        blob.extend(string.encode('utf-8'))
+        string_start.append(len(blob))
+    blob.extend(b"\0" * (-len(blob) % 4))
+
+    payload = b"".join(_u32(section) for section in (
+        node_first_edge, node_replacement, edge_char, edge_child,
+        replacement_start, replacement_tokens, string_start,
+        charset_char, charset_group,
+    )) + bytes(blob)
+
+    header = _HEADER.pack(
+        FORMAT_MAGIC, FORMAT_VERSION, _BYTE_ORDERS[sys.byteorder], source_key,
+        len(nodes), len(edge_char), len(replacements), len(replacement_tokens),
+        len(string_list), len(blob), len(charset_char), token_count, zlib.crc32(payload),
+    )
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _payload_length(counts) -> int:
+    """Length in bytes of the sections and string blob described by the header counts."""
+    (node_count, edge_count, replacement_count, replacement_token_count,
+     string_count, blob_length, charset_count, _) = counts
+    words = ((node_count + 1) + node_count + 2 * edge_count + (replacement_count + 1)
+             + replacement_token_count + (string_count + 1) + 2 * charset_count)
+    return words * 4 + blob_length
+
+
+class CompiledTranscriptionTree:
+    """A memory-mapped, read-only transcription tree.
+
+    Exposes the same transcribe() method as TranscriptionTreeNode, walking
+    the mapped arrays directly. Replacements are returned as token ID
+    tuples (see token_names()); only those actually returned are decoded
+    (and memoized) in process memory.
+
+    Examples:
+        >>> key = compiled_tree_key(mode_path, {})
+        >>> write_compiled_tree(processor.transcription_tree, "quenya.gltr", key)
+        >>> tree = CompiledTranscriptionTree.open("quenya.gltr", expected_key=key)
+        >>> tokens, consumed = tree.transcribe("\\x00aiya\\x00")
+    """
+
+    def __init__(self, buffer, source_key: bytes, counts: Tuple[int, ...]):
+        """Wrap a buffer holding a compiled tree (use open() instead)."""
+        self._buffer = buffer
+        self.source_key: bytes = source_key
+
+        (node_count, edge_count, replacement_count, replacement_token_count,
+         string_count, blob_length, charset_count, token_count) = counts
+
+        view = self._view = memoryview(buffer)
+        offset = _HEADER.size
+
+        def take(count: int) -> memoryview:
+            nonlocal offset
+            section = view[offset:offset + count * 4].cast('I')
+            offset += count * 4
+            return section
+
+        self._node_first_edge = take(node_count + 1)
+        self._node_replacement = take(node_count)
+        self._edge_char = take(edge_count)
+        self._edge_child = take(edge_count)
+        self._replacement_start = take(replacement_count + 1)
+        self._replacement_tokens = take(replacement_token_count)
+        self._string_start = take(string_count + 1)
+        self._charset_char = take(charset_count)
+        self._charset_group = take(charset_count)
+        self._blob = view[offset:offset + blob_length]
+        if len(self._blob) != blob_length:
+            raise ValueError("Compiled tree file is truncated")
+
+        self.node_count: int = node_count
+        self.token_count: int = token_count
+        self._replacement_cache: Dict[int, Tuple[int, ...]] = {}
+
+    @classmethod
+    def open(cls, path: str, expected_key: Optional[bytes] = None) -> CompiledTranscriptionTree:
+        """Memory-map a compiled tree file.
+
+        Args:
+            path: File written by write_compiled_tree()
+            expected_key: If given, the file must have been built from the
+                same source and options
+
+        Returns:
+            The mapped tree
+
+        Raises:
+            ValueError: If the file is not a compiled tree, has another
+                format version or byte order, its key does not match, or
+                its length or checksum is wrong (corrupted file)
+        """
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(buffer) < _HEADER.size:
+                raise ValueError(f"{path} is not a compiled transcription tree")
+            magic, version, byte_order, source_key, *counts, checksum = _HEADER.unpack_from(buffer)
+            if magic != FORMAT_MAGIC:
+                raise ValueError(f"{path} is not a compiled transcription tree")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path} has format version {version}, expected {FORMAT_VERSION}")
+            if byte_order != _BYTE_ORDERS[sys.byteorder]:
+                raise ValueError(f"{path} was compiled for another byte order")
+            if expected_key is not None and source_key != expected_key:
+                raise ValueError(f"{path} was compiled from a different mode source or options")
+            if len(buffer) != _HEADER.size + _payload_length(counts):
+                raise ValueError(f"{path} is truncated or padded")
+            with memoryview(buffer) as view, view[_HEADER.size:] as payload:
+                if zlib.crc32(payload) != checksum:
+                    raise ValueError(f"{path} is corrupted (checksum mismatch)")
+            return cls(buffer, source_key, tuple(counts))
+        except Exception:
+            buffer.close()
+            raise
+
+    def _string(self, string_id: int) -> str:
+        """Decode one string of the string table."""
+        start = self._string_start[string_id]
+        end = self._string_start[string_id + 1]
+        return bytes(self._blob[start:end]).decode('utf-8')
+
+    def _replacement(self, replacement_id: int) -> Tuple[int, ...]:
+        """Decode (and memoize) a replacement token ID tuple."""
+        tokens = self._replacement_cache.get(replacement_id)
+        if tokens is None:
+            start = self._replacement_start[replacement_id]
+            end = self._replacement_start[replacement_id + 1]
+            tokens = tuple(self._replacement_tokens[start:end])
+            self._replacement_cache[replacement_id] = tokens
+        return tokens
+
+    def transcribe(self, string: str, unknown: Tuple[int, ...] = (TokenTable.UNKNOWN,)) -> Tuple[Tuple[int, ...], int]:
+        """Find the longest source at the start of string.
+
+        Matches TranscriptionTreeNode.transcribe exactly, with token IDs.
+
+        Args:
+            string: The input string to transcribe
+            unknown: Replacement returned when nothing matches
+
+        Returns:
+            A tuple of (replacement_token_ids, characters_consumed)
+        """
+        first_edge = self._node_first_edge
+        edge_char = self._edge_char
+        edge_child = self._edge_child
+        node_replacement = self._node_replacement
+
+        node = 0
+        depth = 0
+        best = NO_REPLACEMENT
+        best_depth = 0
+
+        for char in string:
+            lo = first_edge[node]
+            hi = first_edge[node + 1]
+            if lo == hi:
+                break
+            code = ord(char)
+            i = bisect_left(edge_char, code, lo, hi)
+            if i == hi or edge_char[i] != code:
+                break
+            node = edge_child[i]
+            depth += 1
+            if node_replacement[node] != NO_REPLACEMENT:
+                best = node_replacement[node]
+                best_depth = depth
+
+        if best == NO_REPLACEMENT:
+            return unknown, 1
+        return self._replacement(best), best_depth
+
+    def token_names(self) -> List[str]:
+        """Return the stored token names, in token ID order."""
+        return [self._string(i) for i in range(self.token_count)]
+
+    def source_chars(self) -> Set[str]:
+        """Return every character appearing in a rule source."""
+        return {chr(code) for code in self._edge_char}
+
+    def in_charset(self) -> Dict[str, str]:
+        """Return the stored mapping of input character to rule group name."""
+        return {
+            chr(self._charset_char[i]): self._string(self._charset_group[i])
+            for i in range(len(self._charset_char))
+        }
+
+    def close(self):
+        """Unmap the file."""
+        if self._buffer is not None:
+            for name in ('_node_first_edge', '_node_replacement', '_edge_char', '_edge_child',
+                         '_replacement_start', '_replacement_tokens', '_string_start',
+                         '_charset_char', '_charset_group', '_blob'):
+                getattr(self, name).release()
+            self._view.release()
+            self._buffer.close()
+            self._buffer = None
+
+    def __enter__(self) -> CompiledTranscriptionTree:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __str__(self) -> str:
+        """String representation of the compiled tree."""
+        return f"<CompiledTranscriptionTree: {self.node_count} nodes>"
@@ -126,6 +126,8 @@ class Mode:
             self.processor.finalize(trans_options)
         if self.post_processor:
             self.post_processor.finalize(trans_options)
+            if self.processor:
+                self.post_processor.prepare(self.supported_charsets.values(), self.processor.token_table)
     
     def get_charset(self, charset_name: Optional[str] = None) -> Charset:
         """Get a charset by name, returning default if not specified."""
@@ -179,30 +181,30 @@ class Mode:
         if not self.processor:
             return False, "*** No processor available for transcription. Failed!", debug_context
         
-        # Process content line by line (match Ruby behavior)
-        lines = content.split('\n')
+        # Lowercasing and the line-safe pre-processor operators run once
+        # over the whole content ("\n" is neither cased nor case-ignorable,
+        # so lower() never looks across lines); the rest is per line
+        lowered = content.lower()
+        if self.pre_processor:
+            processed_lines = self.pre_processor.apply_lines(lowered)
+        else:
+            processed_lines = lowered.split('\n')
         results = []
         
-        for i, line in enumerate(lines):
+        for i, processed_line in enumerate(processed_lines):
             # Restore line feed at end (except for last line)
-            restore_lf = (i < len(lines) - 1)
-            
-            # Apply preprocessor if available
-            if self.pre_processor:
-                processed_line = self.pre_processor.apply(line.lower())
-            else:
-                # Fallback: just apply lowercasing
-                processed_line = line.lower()
+            restore_lf = (i < len(processed_lines) - 1)
             
-            # Apply processor
-            line_result = self.processor.transcribe(processed_line, debug_context)
+            # Apply processor (tokens are interned IDs from here on)
+            runs = []
+            line_ids = self.processor.transcribe_ids(processed_line, debug_context, runs)
             
             # Apply post-processor to convert tokens to Unicode characters
             # This is the critical step that converts "TELCO" → actual Tengwar chars
-            line_str = self.post_processor.apply(line_result, target_charset)
+            line_str = self.post_processor.apply_ids(line_ids, target_charset, self.processor.token_table, runs)
             
             # Add debug output
-            debug_context.processor_output.extend(line_result)
+            debug_context.processor_output.extend(self.processor.token_table.names_of(line_ids))
             debug_context.postprocessor_output += line_str + "\n"
             
             # Restore line feed if needed
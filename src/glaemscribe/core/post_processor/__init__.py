@@ -11,6 +11,7 @@ from .base import (
     TranscriptionPrePostProcessor,
     TranscriptionPreProcessor,
     TranscriptionPostProcessor,
+    PostProcessorStream,
     UNKNOWN_CHAR_OUTPUT
 )
 
@@ -24,6 +25,7 @@ __all__ = [
     'TranscriptionPrePostProcessor',
     'TranscriptionPreProcessor',
     'TranscriptionPostProcessor',
+    'PostProcessorStream',
     'CharsetResolverPostProcessor',
     'ResolveVirtualsPostProcessorOperator',
     'UNKNOWN_CHAR_OUTPUT'
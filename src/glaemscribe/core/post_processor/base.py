@@ -7,12 +7,10 @@ using charset resolution and other post-processing operations.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, FrozenSet, Optional, Union
 
 from ...parsers.glaeml import Node
-
-
-UNKNOWN_CHAR_OUTPUT = "?"
+from ..token_table import TokenTable, CharsetTokenTables, OutputTable, charset_outputs, UNKNOWN_CHAR_OUTPUT
 
 
 class PrePostProcessorOperator(ABC):
@@ -90,12 +88,45 @@ class PrePostProcessorOperator(ABC):
 
 class PreProcessorOperator(PrePostProcessorOperator):
     """Base class for pre-processor operators."""
-    pass
+    
+    def required_chars(self) -> Optional[FrozenSet[str]]:
+        """Characters of which the text must contain one for the operator
+        to have any effect, or None if it may always apply."""
+        return None
 
 
 class PostProcessorOperator(PrePostProcessorOperator):
     """Base class for post-processor operators."""
-    pass
+    
+    def apply_ids(self, token_ids: List[int], tables: CharsetTokenTables) -> List[int]:
+        """Apply the operator to token IDs.
+        
+        The default goes through the token names and apply(); operators on
+        the hot path override it to work on the ID-indexed tables directly.
+        
+        Args:
+            token_ids: List of transcription token IDs
+            tables: ID-indexed tables of the output charset
+            
+        Returns:
+            Processed token IDs
+        """
+        token_table = tables.token_table
+        tokens = self.apply(token_table.names_of(token_ids), tables.charset)
+        return list(token_table.intern_all(tokens))
+    
+    def is_boundary_local(self, tables: CharsetTokenTables) -> bool:
+        """Check whether the operator works independently between separators.
+        
+        An operator is boundary-local when applying it to a token list gives
+        the same result as applying it to the pieces obtained by cutting the
+        list right after any *SPACE or *LF token. Operators that do not know
+        are assumed not to be.
+        
+        Args:
+            tables: ID-indexed tables of the output charset
+        """
+        return False
 
 
 class TranscriptionPrePostProcessor:
@@ -125,7 +156,67 @@ class TranscriptionPrePostProcessor:
 
 
 class TranscriptionPreProcessor(TranscriptionPrePostProcessor):
-    """Pre-processor that applies operators to input text."""
+    """Pre-processor that applies operators to input text.
+    
+    Consecutive literal substitutions that cannot interact are fused into
+    a single pass (see fuse_substitutions), and an operator is skipped when
+    the text contains none of its required characters. The leading
+    operators proven line-safe run once over a whole document in
+    apply_lines(). The plan is rebuilt whenever the operators change or
+    are finalized.
+    """
+    
+    def __init__(self, mode):
+        """Initialize the pre-processor.
+        
+        Args:
+            mode: The mode instance
+        """
+        super().__init__(mode)
+        self._plan: Optional[List[Any]] = None
+        self._plan_filters: List[Optional[str]] = []
+        self._plan_line_safe_count: int = 0
+        self._plan_operators: List[PrePostProcessorOperator] = []
+    
+    def finalize(self, trans_options: Dict[str, Any]):
+        """Finalize all operators and drop the fused plan.
+        
+        Args:
+            trans_options: Transcription options
+        """
+        super().finalize(trans_options)
+        self._plan = None
+    
+    def plan(self) -> List[Any]:
+        """Return the operators to apply, with substitutions fused."""
+        if self._plan is None or self._plan_operators != self.operators:
+            from ..pre_processor_operators import fuse_substitutions
+            self._plan = fuse_substitutions(self.operators)
+            self._plan_filters = []
+            for operator in self._plan:
+                required = getattr(operator, 'required_chars', None)
+                required = required() if required else None
+                self._plan_filters.append("".join(sorted(required)) if required is not None else None)
+            self._plan_line_safe_count = 0
+            for operator in self._plan:
+                is_line_safe = getattr(operator, 'is_line_safe', None)
+                if not (is_line_safe and is_line_safe()):
+                    break
+                self._plan_line_safe_count += 1
+            self._plan_operators = list(self.operators)
+        return self._plan
+    
+    def _apply_steps(self, text: str, start: int, end: int) -> str:
+        """Apply a slice of the plan to text."""
+        plan = self._plan
+        filters = self._plan_filters
+        for index in range(start, end):
+            required = filters[index]
+            # Skip operators that cannot match (no required character)
+            if required is not None and not any(char in text for char in required):
+                continue
+            text = plan[index].apply(text)
+        return text
     
     def apply(self, text: str) -> str:
         """Apply all pre-processor operators to text.
@@ -136,10 +227,27 @@ class TranscriptionPreProcessor(TranscriptionPrePostProcessor):
         Returns:
             Processed text
         """
-        result = text
-        for operator in self.operators:
-            result = operator.apply(result)
-        return result
+        return self._apply_steps(text, 0, len(self.plan()))
+    
+    def apply_lines(self, text: str) -> List[str]:
+        """Pre-process a whole document and split it into lines.
+        
+        Same result as applying apply() to each line of text.split("\\n"),
+        but the leading line-safe operators run once over the whole text;
+        only the remaining ones run line by line.
+        
+        Args:
+            text: Input document
+            
+        Returns:
+            Processed lines
+        """
+        plan = self.plan()
+        safe_count = self._plan_line_safe_count
+        lines = self._apply_steps(text, 0, safe_count).split("\n")
+        if safe_count < len(plan):
+            lines = [self._apply_steps(line, safe_count, len(plan)) for line in lines]
+        return lines
 
 
 class TranscriptionPostProcessor(TranscriptionPrePostProcessor):
@@ -157,6 +265,112 @@ class TranscriptionPostProcessor(TranscriptionPrePostProcessor):
         """
         super().__init__(mode)
         self.out_space: Optional[List[str]] = None
+        self._charset_tables: Dict[int, CharsetTokenTables] = {}
+        self._output_tables: Dict[int, OutputTable] = {}
+    
+    def finalize(self, trans_options: Dict[str, Any]):
+        """Finalize all operators and drop the cached charset tables.
+        
+        Args:
+            trans_options: Transcription options
+        """
+        super().finalize(trans_options)
+        self._charset_tables = {}
+        self._output_tables = {}
+    
+    def prepare(self, charsets, token_table: TokenTable):
+        """Build the output tables of charsets ahead of the first transcription.
+        
+        Args:
+            charsets: Charsets the mode can transcribe to
+            token_table: The finalized processor's token table
+        """
+        for charset in charsets:
+            self.charset_tables(charset, token_table)
+            self.output_table(charset)
+    
+    def output_table(self, out_charset) -> OutputTable:
+        """Get the token name -> output table of a charset, building it if needed."""
+        outputs = self._output_tables.get(id(out_charset))
+        if outputs is None or outputs.charset is not out_charset:
+            outputs = charset_outputs(out_charset, self.out_space)
+            self._output_tables[id(out_charset)] = outputs
+        return outputs
+    
+    def charset_tables(self, out_charset, token_table: TokenTable) -> CharsetTokenTables:
+        """Get the ID-indexed tables of a charset, building them if needed.
+        
+        Args:
+            out_charset: Charset for character resolution
+            token_table: Token table the IDs belong to
+            
+        Returns:
+            Tables covering every token currently interned
+        """
+        tables = self._charset_tables.get(id(out_charset))
+        if (tables is None or tables.charset is not out_charset
+                or tables.token_table is not token_table or not tables.is_current()):
+            tables = CharsetTokenTables(token_table, out_charset, self.out_space)
+            self._charset_tables[id(out_charset)] = tables
+        return tables
+    
+    def apply_ids(self, token_ids: List[int], out_charset, token_table: Optional[TokenTable] = None,
+                  runs: Optional[List[str]] = None) -> str:
+        """Apply post-processing to token IDs.
+        
+        Same result as apply() on the corresponding token names, with every
+        per-token lookup done in arrays indexed by token ID.
+        
+        Args:
+            token_ids: List of transcription token IDs
+            out_charset: Charset for character resolution
+            token_table: Token table the IDs belong to (defaults to the
+                mode processor's)
+            runs: Outputs of the *UNKNOWN_RUN tokens, in order (as collected
+                by TranscriptionProcessor.transcribe_ids)
+            
+        Returns:
+            Final Unicode string
+        """
+        if token_table is None:
+            token_table = self.mode.processor.token_table
+        tables = self.charset_tables(out_charset, token_table)
+        
+        # Cleanup the output by removing empty tokens and structural markers
+        token_ids = [tid for tid in token_ids if tid != TokenTable.EMPTY and tid != TokenTable.BACKSLASH]
+        
+        # Apply all operators
+        for operator in self.operators:
+            token_ids = operator.apply_ids(token_ids, tables)
+        
+        # Operators falling back to names may have interned new tokens
+        if not tables.is_current():
+            tables = self.charset_tables(out_charset, token_table)
+        
+        outputs = tables.outputs
+        if runs:
+            # Operators never move a run token past another one
+            run_outputs = iter(runs)
+            return "".join([
+                outputs[tid] if tid != TokenTable.UNKNOWN_RUN else next(run_outputs)
+                for tid in token_ids
+            ])
+        return "".join([outputs[tid] for tid in token_ids])
+    
+    def stream(self, out_charset, token_table: Optional[TokenTable] = None) -> PostProcessorStream:
+        """Start an incremental post-processing of a token ID stream.
+        
+        Args:
+            out_charset: Charset for character resolution
+            token_table: Token table the IDs belong to (defaults to the
+                mode processor's)
+            
+        Returns:
+            A stream to feed() token IDs to
+        """
+        if token_table is None:
+            token_table = self.mode.processor.token_table
+        return PostProcessorStream(self, out_charset, token_table)
     
     def apply(self, tokens: List[str], out_charset) -> str:
         """Apply post-processing to convert tokens to Unicode string.
@@ -177,27 +391,83 @@ class TranscriptionPostProcessor(TranscriptionPrePostProcessor):
         for operator in self.operators:
             tokens = operator.apply(tokens, out_charset)
         
-        # Handle out_space configuration
-        out_space_str = " "
-        if self.out_space and out_charset:
-            out_space_str = "".join([
-                out_charset.get_character(token) if out_charset.has_character(token) else UNKNOWN_CHAR_OUTPUT
-                for token in self.out_space
-            ])
-        
         # Convert tokens to characters
-        result = ""
-        for token in tokens:
-            if token == "":
-                continue
-            elif token == "*UNKNOWN":
-                result += UNKNOWN_CHAR_OUTPUT
-            elif token == "*SPACE":
-                result += out_space_str
-            elif token == "*LF":
-                result += "\n"
-            else:
-                # This is the key line - convert token to charset character!
-                result += out_charset.get_character(token) if out_charset.has_character(token) else UNKNOWN_CHAR_OUTPUT
-        
-        return result
+        return "".join(map(self.output_table(out_charset).__getitem__, tokens))
+
+
+class PostProcessorStream:
+    """Incremental post-processing of a token ID stream.
+    
+    Output is released as soon as a *SPACE or *LF token makes it final, so
+    only the current word is held back and arbitrarily long lines are
+    processed in bounded memory. The concatenated outputs of feed() and
+    flush() equal TranscriptionPostProcessor.apply_ids() on the whole stream.
+    
+    If an operator is not boundary-local for the charset (see
+    PostProcessorOperator.is_boundary_local), everything is held back until
+    flush().
+    
+    Examples:
+        >>> stream = mode.post_processor.stream(charset)
+        >>> for chunk in chunks:
+        ...     out.write(stream.feed(mode.processor.transcribe_ids(chunk)))
+        >>> out.write(stream.flush())
+    """
+    
+    def __init__(self, post_processor: TranscriptionPostProcessor, out_charset, token_table: TokenTable):
+        """Initialize the stream.
+        
+        Args:
+            post_processor: The post-processor to apply
+            out_charset: Charset for character resolution
+            token_table: Token table the IDs belong to
+        """
+        self.post_processor = post_processor
+        self.out_charset = out_charset
+        self.token_table = token_table
+        tables = post_processor.charset_tables(out_charset, token_table)
+        self.splittable = all(operator.is_boundary_local(tables) for operator in post_processor.operators)
+        self._pending: List[int] = []
+        self._pending_runs: List[str] = []
+    
+    def feed(self, token_ids: List[int], runs: Optional[List[str]] = None) -> str:
+        """Add token IDs to the stream.
+        
+        Args:
+            token_ids: Next transcription token IDs
+            runs: Outputs of the *UNKNOWN_RUN tokens among them, in order
+            
+        Returns:
+            Output of every token up to the last separator seen so far
+            that has not been returned yet
+        """
+        start = len(self._pending)
+        self._pending.extend(token_ids)
+        if runs:
+            self._pending_runs.extend(runs)
+        if not self.splittable:
+            return ""
+        
+        # Only the new tokens can hold a later separator
+        pending = self._pending
+        cut = 0
+        for index in range(len(pending) - 1, start - 1, -1):
+            if pending[index] == TokenTable.SPACE or pending[index] == TokenTable.LF:
+                cut = index + 1
+                break
+        if not cut:
+            return ""
+        return self._release(cut)
+    
+    def flush(self) -> str:
+        """Release the output of the held back tokens and empty the stream."""
+        return self._release(len(self._pending))
+    
+    def _release(self, cut: int) -> str:
+        """Post-process and drop the first cut pending tokens."""
+        finished = self._pending[:cut]
+        del self._pending[:cut]
+        run_count = finished.count(TokenTable.UNKNOWN_RUN)
+        runs = self._pending_runs[:run_count]
+        del self._pending_runs[:run_count]
+        return self.post_processor.apply_ids(finished, self.out_charset, self.token_table, runs)
@@ -32,3 +32,11 @@ class CharsetResolverPostProcessor(PostProcessorOperator):
         # The actual character conversion happens in TranscriptionPostProcessor
         # This allows for future expansion (virtual chars, sequences, etc.)
         return tokens
+    
+    def apply_ids(self, token_ids: List[int], tables) -> List[int]:
+        """Token IDs are passed through, like token names in apply()."""
+        return token_ids
+    
+    def is_boundary_local(self, tables) -> bool:
+        """Passing tokens through is local to anything."""
+        return True
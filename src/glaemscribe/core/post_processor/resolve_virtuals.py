@@ -8,9 +8,18 @@ based on the surrounding context (what comes before/after them).
 """
 
 from __future__ import annotations
-from typing import List, Dict, Optional, Any
+from itertools import chain
+from typing import List, Dict, Optional, Any, Iterator, Tuple
 from .base import PostProcessorOperator
-from ..charset import Charset
+from ..charset import Charset, VirtualTriggerIndex
+from ..token_table import TokenTable, CharsetTokenTables
+
+
+def virtual_trigger_index(charset) -> VirtualTriggerIndex:
+    """Get the virtual trigger index of a charset (built on the fly for charset-likes)."""
+    if isinstance(charset, Charset):
+        return charset.virtual_trigger_index()
+    return VirtualTriggerIndex(getattr(charset, 'virtual_chars', {}))
 
 
 class ResolveVirtualsPostProcessorOperator(PostProcessorOperator):
@@ -29,7 +38,7 @@ class ResolveVirtualsPostProcessorOperator(PostProcessorOperator):
             glaeml_element: Optional GLAEML element for this operator
         """
         super().__init__(mode, glaeml_element)
-        self.last_triggers: Dict[Any, Any] = {}
+        self.last_triggers: List[Any] = []
     
     def finalize(self, trans_options: Dict[str, Any]):
         """Finalize the operator.
@@ -39,7 +48,7 @@ class ResolveVirtualsPostProcessorOperator(PostProcessorOperator):
         """
         super().finalize(trans_options)
         # Initialize trigger states for each virtual character class
-        self.last_triggers = {}
+        self.last_triggers = []
     
     def reset_trigger_states(self, charset: Charset):
         """Reset trigger states for all virtual character classes.
@@ -47,37 +56,36 @@ class ResolveVirtualsPostProcessorOperator(PostProcessorOperator):
         Args:
             charset: The charset containing virtual character definitions
         """
-        if hasattr(charset, 'virtual_chars'):
-            # charset.virtual_chars is a dict: name -> VirtualChar
-            for vc in getattr(charset, 'virtual_chars', {}).values():
-                self.last_triggers[vc] = None
+        self.last_triggers = [None] * len(virtual_trigger_index(charset).virtuals)
     
     def apply_loop(self, charset: Charset, tokens: List[str], new_tokens: List[str], 
                    reversed: bool, token: str, idx: int) -> str:
         """Apply virtual character resolution for a single token.
         
-        Matches Ruby's apply_loop method exactly.
+        Matches Ruby's apply_loop method, with the trigger states of the
+        virtual classes held in a list indexed like the charset's virtual
+        trigger index.
         """
         if token in ['*SPACE', '*LF']:
             self.reset_trigger_states(charset)
             return token
         
+        index = virtual_trigger_index(charset)
+        
         # Check if token is a virtual character
-        if hasattr(charset, 'virtual_chars') and token in getattr(charset, 'virtual_chars', {}):
-            virtual_char = charset.virtual_chars[token]
+        position = index.positions.get(token)
+        if position is not None:
+            virtual_char = index.virtuals[position]
             if virtual_char.is_virtual() and reversed == virtual_char.reversed:
                 # Try to replace with last triggered character
-                last_trigger = self.last_triggers.get(virtual_char)
+                last_trigger = self.last_triggers[position]
                 if last_trigger is not None and hasattr(last_trigger, 'names') and last_trigger.names:
                     new_tokens[idx] = last_trigger.names[0]  # Take the first name of the non-virtual replacement
                     token = new_tokens[idx]  # Consider the token replaced, being itself a potential trigger for further virtuals (cascading virtuals)
         
-        # Update states of virtual classes
-        if hasattr(charset, 'virtual_chars'):
-            for vc in getattr(charset, 'virtual_chars', {}).values():
-                result_char = vc[token]  # Use the __getitem__ method
-                if result_char is not None:
-                    self.last_triggers[vc] = result_char
+        # Update states of the virtual classes this token triggers
+        for position, result_char in index.triggers.get(token, ()):
+            self.last_triggers[position] = result_char
         
         return token
     
@@ -120,6 +128,129 @@ class ResolveVirtualsPostProcessorOperator(PostProcessorOperator):
         
         return new_tokens
 
+    def apply_ids(self, token_ids: List[int], tables: CharsetTokenTables) -> List[int]:
+        """Apply virtual character resolution to token IDs.
+        
+        Same result as apply(), with its stages fused: a single forward
+        pass expands sequences, applies swaps (holding back one token) and
+        resolves left-to-right virtuals while filling the output list. The
+        right-to-left virtuals are then fixed up in place, walking back only
+        over the words that contain one.
+        
+        Args:
+            token_ids: List of transcription token IDs
+            tables: ID-indexed tables of the output charset
+            
+        Returns:
+            Modified token ID list with virtual characters resolved
+        """
+        sequences = tables.sequences
+        swap_targets = tables.swap_targets
+        virtual_index = tables.virtual_index
+        virtual_reversed = tables.virtual_reversed
+        forward_triggers = tables.virtual_triggers[False]
+        class_count = len(virtual_reversed)
+        has_reversed = any(virtual_reversed)
+        
+        out: List[int] = []
+        last_triggers: List[Optional[int]] = [None] * class_count
+        # Unresolved IDs of the tokens resolved left-to-right (the backward
+        # fixup reads triggers from unresolved tokens, like apply())
+        originals: Dict[int, int] = {}
+        # Words holding a right-to-left virtual, as (start, end) positions
+        fixups: List[Tuple[int, int]] = []
+        word_start = 0
+        word_needs_fixup = False
+        pending: Optional[int] = None
+        
+        # A trailing None flushes the held back token
+        for tid in chain(self._expand_sequences(token_ids, sequences), (None,)):
+            if pending is None:
+                pending = tid
+                continue
+            
+            # The held back token swaps with the next one, or is final
+            targets = swap_targets[pending]
+            if targets is None or tid not in targets:
+                tid, pending = pending, tid
+            
+            position = len(out)
+            if tid == TokenTable.SPACE or tid == TokenTable.LF:
+                last_triggers = [None] * class_count
+                if word_needs_fixup:
+                    fixups.append((word_start, position))
+                    word_needs_fixup = False
+                word_start = position + 1
+                out.append(tid)
+                continue
+            
+            vi = virtual_index[tid]
+            if vi >= 0:
+                if virtual_reversed[vi]:
+                    word_needs_fixup = True
+                else:
+                    resolved = last_triggers[vi]
+                    if resolved is not None and resolved >= 0:
+                        if has_reversed:
+                            originals[position] = tid
+                        tid = resolved  # Cascading virtuals
+            
+            triggers = forward_triggers[tid]
+            if triggers is not None:
+                for ci, resolved in triggers:
+                    last_triggers[ci] = resolved
+            out.append(tid)
+        
+        if word_needs_fixup:
+            fixups.append((word_start, len(out)))
+        
+        for start, end in fixups:
+            self._fix_reversed(out, start, end, tables, originals)
+        
+        return out
+    
+    def is_boundary_local(self, tables: CharsetTokenTables) -> bool:
+        """Virtual triggers reset on separators; only a swap could cross one."""
+        separators = (TokenTable.SPACE, TokenTable.LF)
+        for tid in separators:
+            if tables.swap_targets[tid] is not None:
+                return False
+        return not any(targets is not None and not targets.isdisjoint(separators)
+                       for targets in tables.swap_targets)
+    
+    @staticmethod
+    def _expand_sequences(token_ids: List[int], sequences) -> Iterator[int]:
+        """Yield token IDs with the sequence tokens expanded."""
+        for tid in token_ids:
+            sequence = sequences[tid]
+            if sequence is None:
+                yield tid
+            else:
+                yield from sequence
+    
+    @staticmethod
+    def _fix_reversed(out: List[int], start: int, end: int, tables: CharsetTokenTables,
+                      originals: Dict[int, int]):
+        """Resolve the right-to-left virtuals of one word in place."""
+        virtual_index = tables.virtual_index
+        virtual_reversed = tables.virtual_reversed
+        backward_triggers = tables.virtual_triggers[True]
+        last_triggers: List[Optional[int]] = [None] * len(virtual_reversed)
+        
+        for idx in range(end - 1, start - 1, -1):
+            tid = originals.get(idx, out[idx])
+            vi = virtual_index[tid]
+            if vi >= 0 and virtual_reversed[vi]:
+                resolved = last_triggers[vi]
+                if resolved is not None and resolved >= 0:
+                    out[idx] = resolved
+                    tid = resolved  # Cascading virtuals
+            
+            triggers = backward_triggers[tid]
+            if triggers is not None:
+                for ci, resolved in triggers:
+                    last_triggers[ci] = resolved
+    
     def apply_sequences(self, charset: Charset, tokens: List[str]) -> List[str]:
         """Expand sequence tokens into their component tokens.
         Matches Ruby's apply_sequences behavior.
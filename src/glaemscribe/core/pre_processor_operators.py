@@ -5,10 +5,18 @@ following the JavaScript implementation exactly.
 """
 
 import re
-from typing import Any
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Tuple
 from .post_processor.base import PrePostProcessorOperator
 from ..parsers.glaeml import Node
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+# Largest character class expanded when looking for required characters
+MAX_REQUIRED_CLASS_SIZE = 256
+
 
 class SubstitutePreProcessorOperator(PrePostProcessorOperator):
     """Simple string substitution operator.
@@ -16,18 +24,28 @@ class SubstitutePreProcessorOperator(PrePostProcessorOperator):
     Matches JavaScript's SubstitutePreProcessorOperator exactly.
     """
     
+    def substitution(self) -> Tuple[str, str]:
+        """Return the (string to replace, replacement) pair."""
+        # Use finalized element if available, otherwise fall back to original
+        element = self.finalized_glaeml_element or self.glaeml_element
+        return element.args[0], element.args[1]
+    
+    def required_chars(self) -> Optional[FrozenSet[str]]:
+        """The source can only occur in a text containing its first character."""
+        source = self.substitution()[0]
+        return frozenset(source[0]) if source else None
+    
+    def is_line_safe(self) -> bool:
+        """Whether applying to a whole document equals applying per line."""
+        source, replacement = self.substitution()
+        return bool(source) and "\n" not in source and "\n" not in replacement
+    
     def apply(self, text: str) -> str:
         """Apply simple string substitution.
         
         Uses indexOf loop instead of regex to handle special characters.
         """
-        # Use finalized element if available, otherwise fall back to original
-        if self.finalized_glaeml_element:
-            in_to_replace = self.finalized_glaeml_element.args[0]
-            in_replace_with = self.finalized_glaeml_element.args[1]
-        else:
-            in_to_replace = self.glaeml_element.args[0]
-            in_replace_with = self.glaeml_element.args[1]
+        in_to_replace, in_replace_with = self.substitution()
         
         in_source = text
         out_string = []
@@ -47,37 +65,344 @@ class SubstitutePreProcessorOperator(PrePostProcessorOperator):
 class RxSubstitutePreProcessorOperator(PrePostProcessorOperator):
     """Regex substitution operator.
     
-    Matches JavaScript's RxSubstitutePreProcessorOperator exactly.
+    Matches JavaScript's RxSubstitutePreProcessorOperator exactly. The
+    pattern is compiled once (at finalize, or on first use), and the
+    Ruby-style replacement is turned into a Python expansion template so
+    that re.sub() expands it without calling back into Python.
     """
     
+    def __init__(self, mode, glaeml_element: Node):
+        """Initialize the operator.
+        
+        Args:
+            mode: The mode instance
+            glaeml_element: The GLAEML element for this operator
+        """
+        super().__init__(mode, glaeml_element)
+        self._compiled_element: Optional[Node] = None
+        self._regex: Optional[Pattern] = None
+        self._template: str = ""
+        self._required_chars: Optional[FrozenSet[str]] = None
+        self._line_safe: bool = False
+    
     def finalize(self, trans_options: dict):
-        """Finalize the operator, converting Ruby-style backrefs to Python-style."""
+        """Finalize the operator and compile its pattern and template."""
         super().finalize(trans_options)
+        self._compile()
+    
+    def _compile(self):
+        """Compile the pattern and replacement of the current element."""
+        element = self.finalized_glaeml_element or self.glaeml_element
+        self._regex = re.compile(element.args[0])
+        self._template = self.expansion_template(element.args[1], self._regex.groups)
+        self._required_chars = pattern_required_chars(self._regex)
+        self._line_safe = "\n" not in element.args[1] and pattern_is_line_safe(self._regex)
+        self._compiled_element = element
+    
+    def required_chars(self) -> Optional[FrozenSet[str]]:
+        """Characters of which every match of the pattern contains one."""
+        if self._compiled_element is not (self.finalized_glaeml_element or self.glaeml_element):
+            self._compile()
+        return self._required_chars
+    
+    def is_line_safe(self) -> bool:
+        """Whether applying to a whole document equals applying per line."""
+        if self._compiled_element is not (self.finalized_glaeml_element or self.glaeml_element):
+            self._compile()
+        return self._line_safe
+    
+    @staticmethod
+    def expansion_template(replacement: str, group_count: int) -> str:
+        """Convert a Ruby-style replacement to a Python re.sub() template.
+        
+        Ruby uses \\1, \\2, etc for captured expressions; they become
+        \\g<1>, \\g<2>. Any other backslash is literal, as are references
+        to groups the pattern does not have. Unmatched groups expand to
+        an empty string.
+        
+        Args:
+            replacement: Ruby-style replacement string
+            group_count: Number of groups in the pattern
+        
+        Returns:
+            Template for re.sub()
+        """
+        def convert(match) -> str:
+            digit = match.group(1)
+            if digit and 1 <= int(digit) <= group_count:
+                return f"\\g<{digit}>"
+            return match.group(0).replace("\\", "\\\\")
         
-        # Ruby uses \1, \2, etc for captured expressions.
-        # Convert to Python style (we'll handle this in apply() using a custom replacement function)
-        if self.finalized_glaeml_element and len(self.finalized_glaeml_element.args) > 1:
-            replacement = self.finalized_glaeml_element.args[1]
-            # Store the replacement pattern for use in apply()
-            self._replacement_pattern = replacement
+        return re.sub(r"\\(\d)?", convert, replacement)
     
     def apply(self, text: str) -> str:
         """Apply regex substitution."""
-        # Use finalized element if available, otherwise fall back to original
-        if self.finalized_glaeml_element:
-            pattern = self.finalized_glaeml_element.args[0]
-            replacement = self._replacement_pattern
-        else:
-            pattern = self.glaeml_element.args[0]
-            replacement = self.glaeml_element.args[1]
+        if self._compiled_element is not (self.finalized_glaeml_element or self.glaeml_element):
+            self._compile()
+        return self._regex.sub(self._template, text)
+
+
+class FusedSubstitutePreProcessorOperator:
+    """Consecutive literal substitutions applied in a single pass.
+    
+    Built by fuse_substitutions() only from substitutions that cannot
+    interact, so replacing all of them at once gives the same result as
+    applying them one after the other. Single-character substitutions use
+    a str.translate table, anything else one combined alternation.
+    """
+    
+    def __init__(self, substitutions: List[Tuple[str, str]]):
+        """Compile the substitutions.
         
-        def replace_func(match):
-            """Handle backreferences in replacement."""
-            result = replacement
-            # Replace backreferences \1, \2 with actual groups
-            for i, group in enumerate(match.groups(), 1):
-                result = result.replace(f'\\{i}', group)
-            return result
+        Args:
+            substitutions: (string to replace, replacement) pairs, in order
+        """
+        self.substitutions = substitutions
+        self._table = None
+        self._regex = None
+        self._replacements: Dict[str, str] = dict(substitutions)
         
-        regex = re.compile(pattern)
-        return regex.sub(replace_func, text)
+        if all(len(source) == 1 for source, _ in substitutions):
+            self._table = {ord(source): target for source, target in substitutions}
+        else:
+            self._regex = re.compile("|".join(re.escape(source) for source, _ in substitutions))
+    
+    def required_chars(self) -> FrozenSet[str]:
+        """Any source can only occur in a text containing its first character."""
+        return frozenset(source[0] for source, _ in self.substitutions)
+    
+    def is_line_safe(self) -> bool:
+        """Whether applying to a whole document equals applying per line."""
+        return all("\n" not in source and "\n" not in target for source, target in self.substitutions)
+    
+    def apply(self, text: str) -> str:
+        """Apply all the substitutions in one pass."""
+        if self._table is not None:
+            return text.translate(self._table)
+        replacements = self._replacements
+        return self._regex.sub(lambda match: replacements[match.group()], text)
+    
+    def __str__(self) -> str:
+        """String representation of the operator."""
+        return f"<FusedSubstitutePreProcessorOperator: {len(self.substitutions)} substitutions>"
+
+
+def _substitutions_commute(earlier: Tuple[str, str], later_source: str) -> bool:
+    """Check that a later substitution is unaffected by an earlier one.
+    
+    The later source must share no character with the earlier source (so
+    their matches can never overlap) nor with the earlier replacement (so
+    the earlier pass can never create a match). A deletion can join its
+    neighbours, so only single characters may follow it.
+    """
+    source, replacement = earlier
+    if set(later_source) & (set(source) | set(replacement)):
+        return False
+    if not replacement and len(later_source) > 1:
+        return False
+    return True
+
+
+def fuse_substitutions(operators: List[Any]) -> List[Any]:
+    """Merge runs of independent literal substitutions into fused operators.
+    
+    Operators are kept in order. A literal substitution joins the current
+    fused group only if it commutes with every substitution already in it;
+    otherwise (and at any other operator) the group is closed, so that
+    interacting operators still run sequentially.
+    
+    Args:
+        operators: Pre-processor operators, in order
+    
+    Returns:
+        Operators to apply in order, with FusedSubstitutePreProcessorOperator
+        replacing each group of more than one substitution
+    """
+    steps: List[Any] = []
+    group: List[Any] = []
+    
+    def close_group():
+        if len(group) == 1:
+            steps.append(group[0])
+        elif group:
+            steps.append(FusedSubstitutePreProcessorOperator([op.substitution() for op in group]))
+        group.clear()
+    
+    for operator in operators:
+        if isinstance(operator, SubstitutePreProcessorOperator) and operator.substitution()[0]:
+            source = operator.substitution()[0]
+            if not all(_substitutions_commute(member.substitution(), source) for member in group):
+                close_group()
+            group.append(operator)
+        else:
+            close_group()
+            steps.append(operator)
+    close_group()
+    
+    return steps
+
+
+def pattern_required_chars(regex: Pattern) -> Optional[FrozenSet[str]]:
+    """Find characters of which every match of a regex contains one.
+    
+    A text containing none of them cannot match, so the substitution can
+    be skipped. The parsed pattern is walked conservatively: literals,
+    (small) character classes, groups, alternations and repeats are
+    understood; anything else (negated classes, ".", categories such as
+    \\s, backreferences, case-insensitive matching) gives no constraint.
+    
+    Args:
+        regex: Compiled pattern
+    
+    Returns:
+        The smallest such set found, or None if any text may match
+    """
+    if regex.flags & re.IGNORECASE:
+        return None
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return None
+    return _sequence_required_chars(list(parsed))
+
+
+def _sequence_required_chars(items: List[Any]) -> Optional[FrozenSet[str]]:
+    """Required characters of a sequence: the best of its mandatory items."""
+    best = None
+    for op, av in items:
+        required = _item_required_chars(op, av)
+        if required is not None and (best is None or len(required) < len(best)):
+            best = required
+    return best
+
+
+def _item_required_chars(op: Any, av: Any) -> Optional[FrozenSet[str]]:
+    """Required characters of one parsed item, None if it needs none."""
+    if op is sre_parse.LITERAL:
+        return frozenset(chr(av))
+    if op is sre_parse.IN:
+        chars = set()
+        for class_op, class_av in av:
+            if class_op is sre_parse.LITERAL:
+                chars.add(chr(class_av))
+            elif class_op is sre_parse.RANGE and class_av[1] - class_av[0] < MAX_REQUIRED_CLASS_SIZE:
+                chars.update(chr(code) for code in range(class_av[0], class_av[1] + 1))
+            else:
+                return None
+        return frozenset(chars)
+    if op is sre_parse.SUBPATTERN:
+        _, add_flags, _, sub = av
+        if add_flags & re.IGNORECASE:
+            return None
+        return _sequence_required_chars(list(sub))
+    if op is sre_parse.BRANCH:
+        chars = set()
+        for branch in av[1]:
+            required = _sequence_required_chars(list(branch))
+            if required is None:
+                return None
+            chars.update(required)
+        return frozenset(chars)
+    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+        minimum, _, sub = av
+        return _sequence_required_chars(list(sub)) if minimum > 0 else None
+    return None
+
+
+# Character categories that include "\n"
+_NEWLINE_CATEGORIES = frozenset(
+    getattr(sre_parse, name) for name in (
+        'CATEGORY_SPACE', 'CATEGORY_UNI_SPACE', 'CATEGORY_NOT_WORD', 'CATEGORY_UNI_NOT_WORD',
+        'CATEGORY_LOC_NOT_WORD', 'CATEGORY_NOT_DIGIT', 'CATEGORY_UNI_NOT_DIGIT',
+        'CATEGORY_LINEBREAK', 'CATEGORY_UNI_LINEBREAK',
+    )
+)
+
+# Zero-width assertions that see "\n" the same way as a line start or end
+_LINE_SAFE_ANCHORS = frozenset(
+    getattr(sre_parse, name) for name in (
+        'AT_BOUNDARY', 'AT_NON_BOUNDARY', 'AT_UNI_BOUNDARY', 'AT_UNI_NON_BOUNDARY',
+        'AT_LOC_BOUNDARY', 'AT_LOC_NON_BOUNDARY',
+    )
+)
+
+
+def pattern_is_line_safe(regex: Pattern) -> bool:
+    """Prove that substituting a regex over a whole document gives the same
+    result as substituting it on each line separately.
+    
+    This holds when no match can include "\\n" and nothing in the pattern
+    depends on where the string starts or ends: no ^, $, \\A or \\Z, no
+    lookaround, and no empty match. Word boundaries are fine, since "\\n"
+    is a non-word character just like the start or end of a line. Any
+    construct not understood makes the pattern unsafe.
+    
+    Args:
+        regex: Compiled pattern
+    
+    Returns:
+        True if the pattern is proven line-safe
+    """
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return False
+    if parsed.getwidth()[0] == 0:
+        return False
+    return _sequence_is_line_safe(list(parsed), bool(regex.flags & re.DOTALL))
+
+
+def _sequence_is_line_safe(items: List[Any], dotall: bool) -> bool:
+    """Check every item of a parsed sequence (see pattern_is_line_safe)."""
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            if av == ord("\n"):
+                return False
+        elif op is sre_parse.NOT_LITERAL:
+            if av != ord("\n"):
+                return False
+        elif op is sre_parse.ANY:
+            if dotall:
+                return False
+        elif op is sre_parse.IN:
+            if _class_matches_newline(av):
+                return False
+        elif op is sre_parse.AT:
+            if av not in _LINE_SAFE_ANCHORS:
+                return False
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            sub_dotall = (dotall or bool(add_flags & re.DOTALL)) and not del_flags & re.DOTALL
+            if not _sequence_is_line_safe(list(sub), sub_dotall):
+                return False
+        elif op is sre_parse.BRANCH:
+            if not all(_sequence_is_line_safe(list(branch), dotall) for branch in av[1]):
+                return False
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            if not _sequence_is_line_safe(list(av[2]), dotall):
+                return False
+        elif op is sre_parse.GROUPREF:
+            # The group itself cannot have captured a line feed
+            continue
+        else:
+            return False
+    return True
+
+
+def _class_matches_newline(items: List[Any]) -> bool:
+    """Whether a parsed character class matches "\\n"."""
+    newline = ord("\n")
+    negate = False
+    matches = False
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negate = True
+        elif op is sre_parse.LITERAL:
+            matches = matches or av == newline
+        elif op is sre_parse.RANGE:
+            matches = matches or av[0] <= newline <= av[1]
+        elif op is sre_parse.CATEGORY:
+            matches = matches or av in _NEWLINE_CATEGORIES
+        else:
+            return True
+    return matches != negate
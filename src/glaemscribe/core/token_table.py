@@ -0,0 +1,244 @@
+"""Token vocabulary interning for Glaemscribe.
+
+Transcription tokens ("TINCO", "A_TEHTA", "*SPACE", ...) are interned into
+dense integer IDs when a processor is finalized. The processor and the
+post-processor then pass ID lists around, and everything that depends on
+a token (charset output, virtual triggers, sequences, swaps) is looked up
+in arrays indexed by ID. Token names only reappear at the edges: debug
+output and the public string-token API.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple, Iterable, FrozenSet, Any
+
+
+UNKNOWN_CHAR_OUTPUT = "?"
+
+# Virtual trigger state for a result character that has no name to emit
+UNNAMED_RESOLUTION = -1
+
+
+class TokenTable:
+    """Bidirectional mapping between token names and dense integer IDs.
+
+    The structural tokens have fixed IDs so that hot loops can compare
+    against constants.
+    """
+
+    EMPTY = 0
+    UNKNOWN = 1
+    SPACE = 2
+    LF = 3
+    BACKSLASH = 4
+    UNKNOWN_RUN = 5  # Stands for a whole untranscribable run (output given aside)
+
+    RESERVED = ("", "*UNKNOWN", "*SPACE", "*LF", "\\", "*UNKNOWN_RUN")
+
+    def __init__(self):
+        """Initialize a table holding only the reserved tokens."""
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for name in self.RESERVED:
+            self.intern(name)
+
+    @classmethod
+    def from_names(cls, names: Sequence[str]) -> TokenTable:
+        """Rebuild a table from its names, in ID order.
+
+        Raises:
+            ValueError: If the names do not start with the reserved tokens
+        """
+        if tuple(names[:len(cls.RESERVED)]) != cls.RESERVED:
+            raise ValueError("Token names do not start with the reserved tokens")
+        table = cls()
+        for name in names[len(cls.RESERVED):]:
+            table.intern(name)
+        return table
+
+    def intern(self, name: str) -> int:
+        """Get the ID of a token name, assigning a new one if needed."""
+        token_id = self.ids.get(name)
+        if token_id is None:
+            token_id = len(self.names)
+            self.ids[name] = token_id
+            self.names.append(name)
+        return token_id
+
+    def intern_all(self, names: Iterable[str]) -> Tuple[int, ...]:
+        """Intern a sequence of token names."""
+        return tuple(self.intern(name) for name in names)
+
+    def get(self, name: str) -> Optional[int]:
+        """Get the ID of a token name without interning it."""
+        return self.ids.get(name)
+
+    def name(self, token_id: int) -> str:
+        """Get the name of a token ID."""
+        return self.names[token_id]
+
+    def names_of(self, token_ids: Iterable[int]) -> List[str]:
+        """Convert token IDs back to names."""
+        names = self.names
+        return [names[token_id] for token_id in token_ids]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __str__(self) -> str:
+        """String representation of the table."""
+        return f"<TokenTable: {len(self.names)} tokens>"
+
+
+class OutputTable(dict):
+    """Token name -> output string of a charset.
+
+    Names the charset does not define map to "?", so that a token list can
+    be converted with a single ''.join(map(table.__getitem__, tokens)).
+
+    Attributes:
+        charset: The charset the table was built from
+    """
+
+    charset: Any = None
+
+    def __missing__(self, name: str) -> str:
+        return UNKNOWN_CHAR_OUTPUT
+
+
+def charset_outputs(charset: Any, out_space: Optional[List[str]] = None) -> OutputTable:
+    """Build the output table of a charset.
+
+    Args:
+        charset: The output charset
+        out_space: Optional tokens to output for spaces
+
+    Returns:
+        Output for every character name, and for the structural tokens
+    """
+    table = OutputTable()
+    table.charset = charset
+    for name in getattr(charset, 'characters', {}):
+        table[name] = charset.get_character(name)
+    table[""] = ""
+    table["*UNKNOWN"] = UNKNOWN_CHAR_OUTPUT
+    table["*LF"] = "\n"
+    out_space_str = " "
+    if out_space and charset:
+        out_space_str = "".join([
+            charset.get_character(token) if charset.has_character(token) else UNKNOWN_CHAR_OUTPUT
+            for token in out_space
+        ])
+    table["*SPACE"] = out_space_str
+    return table
+
+
+class CharsetTokenTables:
+    """ID-indexed views of a charset for one token table.
+
+    Built once per (token table, charset) pair and rebuilt only when the
+    token table has grown past the arrays. Every charset name is interned,
+    so that tokens produced by the post-processor (virtual resolutions,
+    sequence expansions) always have an ID.
+
+    Attributes:
+        name_outputs: Output string for each token name (see charset_outputs)
+        outputs: Output string for each ID ("?" for unmapped tokens)
+        sequences: Expansion of each sequence token ID, None otherwise
+        swap_targets: IDs each token swaps with when they follow it
+        virtual_index: Index into the virtual lists for virtual token IDs, -1 otherwise
+        virtual_reversed: Whether each virtual class resolves right-to-left
+        virtual_lookups: For each virtual class, trigger ID -> resolved ID
+            (UNNAMED_RESOLUTION if the resolved character has no name)
+        virtual_triggers: Indexed by direction (reversed or not), then by
+            trigger ID: the (virtual class, resolved ID) pairs it triggers
+            among the classes resolved in that direction, None if none
+    """
+
+    def __init__(self, token_table: TokenTable, charset: Any, out_space: Optional[List[str]] = None):
+        """Build the tables.
+
+        Args:
+            token_table: The mode's token table (extended with charset names)
+            charset: The output charset
+            out_space: Optional tokens to output for spaces
+        """
+        self.token_table = token_table
+        self.charset = charset
+        self.out_space = out_space
+
+        characters = getattr(charset, 'characters', {})
+        sequences = getattr(charset, 'sequences', {})
+        swaps = getattr(charset, 'swaps', {})
+        virtual_chars = getattr(charset, 'virtual_chars', {})
+
+        # Intern the whole charset vocabulary first so the arrays cover it
+        intern = token_table.intern
+        for name in characters:
+            intern(name)
+        for name, expansion in sequences.items():
+            intern(name)
+            token_table.intern_all(expansion)
+        for trigger, targets in swaps.items():
+            intern(trigger)
+            token_table.intern_all(targets)
+
+        virtuals = []
+        seen = set()
+        for name, vc in virtual_chars.items():
+            intern(name)
+            if id(vc) not in seen:
+                seen.add(id(vc))
+                virtuals.append(vc)
+
+        self.virtual_reversed: List[bool] = []
+        self.virtual_lookups: List[Dict[int, int]] = []
+        for vc in virtuals:
+            lookup = {}
+            for trigger_name, result_char in getattr(vc, 'lookup_table', {}).items():
+                if getattr(result_char, 'names', None):
+                    lookup[intern(trigger_name)] = intern(result_char.names[0])
+                else:
+                    lookup[intern(trigger_name)] = UNNAMED_RESOLUTION
+            self.virtual_reversed.append(bool(getattr(vc, 'reversed', False)))
+            self.virtual_lookups.append(lookup)
+
+        size = len(token_table)
+        self.size: int = size
+
+        self.virtual_index: List[int] = [-1] * size
+        virtual_positions = {id(vc): index for index, vc in enumerate(virtuals)}
+        for name, vc in virtual_chars.items():
+            if vc.is_virtual():
+                self.virtual_index[token_table.ids[name]] = virtual_positions[id(vc)]
+
+        # Inverted index per direction: trigger ID -> (class, resolved ID) pairs
+        # of the virtual classes resolved in that direction
+        self.virtual_triggers: Tuple[List[Optional[Tuple[Tuple[int, int], ...]]], ...] = ([None] * size, [None] * size)
+        for class_index, lookup in enumerate(self.virtual_lookups):
+            triggers = self.virtual_triggers[self.virtual_reversed[class_index]]
+            for trigger_id, resolved in lookup.items():
+                triggers[trigger_id] = (triggers[trigger_id] or ()) + ((class_index, resolved),)
+
+        self.sequences: List[Optional[Tuple[int, ...]]] = [None] * size
+        for name, expansion in sequences.items():
+            self.sequences[token_table.ids[name]] = token_table.intern_all(expansion)
+
+        self.swap_targets: List[Optional[FrozenSet[int]]] = [None] * size
+        for trigger, targets in swaps.items():
+            if targets:
+                self.swap_targets[token_table.ids[trigger]] = frozenset(token_table.intern_all(targets))
+
+        self.name_outputs: OutputTable = charset_outputs(charset, out_space)
+        self.outputs: List[str] = [self.name_outputs[name] for name in token_table.names]
+        self.outputs[TokenTable.UNKNOWN_RUN] = ""
+
+    def is_current(self) -> bool:
+        """Check whether the arrays still cover every interned token."""
+        return self.size == len(self.token_table)
+
+    def __str__(self) -> str:
+        """String representation of the tables."""
+        return f"<CharsetTokenTables {getattr(self.charset, 'name', '?')}: {self.size} tokens>"
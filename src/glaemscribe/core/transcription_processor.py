@@ -5,9 +5,13 @@ rule groups and applies transcription rules using a tree-based algorithm.
 """
 
 from __future__ import annotations
-from typing import Dict, List, Optional, Any
+import re
+from typing import Dict, List, Optional, Pattern, Any, Tuple, Union
 
+from .token_table import TokenTable, UNKNOWN_CHAR_OUTPUT
 from .transcription_tree_node import TranscriptionTreeNode
+from .transcription_regex_engine import RegexTranscriptionEngine
+from .compiled_tree import CompiledTranscriptionTree, write_compiled_tree
 from .rule_group import RuleGroup
 from .mode_enhanced import Mode
 from .mode_debug_context import ModeDebugContext
@@ -17,7 +21,9 @@ class TranscriptionProcessor:
     """Processes text using transcription rules.
     
     This class manages rule groups and applies them to input text
-    using a tree-based pattern matching algorithm.
+    using a tree-based pattern matching algorithm. Tokens are interned in
+    the processor's token table when it is finalized; transcribe_ids()
+    works on token IDs, transcribe() returns token names.
     """
     
     # Constants for word boundaries (match Ruby exactly)
@@ -25,16 +31,87 @@ class TranscriptionProcessor:
     WORD_BOUNDARY_LANG = "_"      # Language boundary  
     WORD_BOUNDARY_TREE = "\u0000" # Tree boundary (null character)
     
-    def __init__(self, mode: Mode):
+    # Input characters handled by the segmenter itself
+    SPACE_CHARS = " \t"          # Become *SPACE
+    LINE_FEED = "\n"             # Becomes *LF
+    IGNORED_CHARS = "\r"         # Dropped without ending the word
+    
+    # Available matching engines
+    ENGINE_TREE = "tree"
+    ENGINE_REGEX = "regex"
+    ENGINES = (ENGINE_TREE, ENGINE_REGEX)
+    
+    # Output policies for words made only of untranscribable characters
+    UNKNOWN_RUN_REPLACE = "replace"          # One "?" per character
+    UNKNOWN_RUN_PASSTHROUGH = "passthrough"  # The characters themselves
+    UNKNOWN_RUN_DROP = "drop"                # Nothing
+    UNKNOWN_RUN_POLICIES = (UNKNOWN_RUN_REPLACE, UNKNOWN_RUN_PASSTHROUGH, UNKNOWN_RUN_DROP)
+    
+    def __init__(self, mode: Mode, engine: str = ENGINE_TREE,
+                 unknown_run_policy: str = UNKNOWN_RUN_REPLACE):
         """Initialize the processor for a specific mode.
         
         Args:
             mode: The mode containing the transcription rules
+            engine: Matching engine, "tree" (default) or "regex"
+            unknown_run_policy: Output of untranscribable runs, "replace"
+                (default), "passthrough" or "drop"
         """
         self.mode: Mode = mode
         self.rule_groups: Dict[str, RuleGroup] = {}
         self.in_charset: Dict[str, RuleGroup] = {}  # Maps characters to rule groups
-        self.transcription_tree: Optional[TranscriptionTreeNode] = None
+        self.transcription_tree: Optional[Union[TranscriptionTreeNode, CompiledTranscriptionTree]] = None
+        self.regex_engine: Optional[RegexTranscriptionEngine] = None
+        self.token_table: TokenTable = TokenTable()
+        self._segmenter: Optional[Pattern] = None
+        self._segment_groups: List[Optional[RuleGroup]] = []
+        self._unknown_run_index: int = -1
+        self._boundary_tokens: Tuple[int, ...] = ()
+        self.paths: Dict[str, Tuple[int, ...]] = {}  # Rule sources -> replacement token IDs
+        self.engine: str = self.ENGINE_TREE
+        self.set_engine(engine)
+        self.unknown_run_policy: str = self.UNKNOWN_RUN_REPLACE
+        self.set_unknown_run_policy(unknown_run_policy)
+    
+    def set_engine(self, engine: str):
+        """Select the matching engine used by transcribe().
+        
+        Both engines produce identical tokens; the regex engine moves the
+        per-character matching into Python's C regex engine.
+        
+        Args:
+            engine: "tree" or "regex"
+        
+        Raises:
+            ValueError: If the engine name is unknown
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown matching engine '{engine}'. Available engines: {', '.join(self.ENGINES)}")
+        if engine == self.ENGINE_REGEX and isinstance(self.transcription_tree, CompiledTranscriptionTree):
+            raise ValueError("The regex engine needs the rule sources; finalize() the processor instead of loading a compiled tree")
+        self.engine = engine
+        
+        # Compile lazily if the processor is already finalized
+        if engine == self.ENGINE_REGEX and self.transcription_tree and not self.regex_engine:
+            self._build_regex_engine()
+    
+    def set_unknown_run_policy(self, policy: str):
+        """Select what untranscribable runs are output as.
+        
+        An untranscribable run is a word made only of characters that no
+        rule group handles and no rule source contains. It is emitted as a
+        single *UNKNOWN_RUN token by transcribe_ids() when the caller
+        collects runs, instead of one *UNKNOWN token per character.
+        
+        Args:
+            policy: "replace", "passthrough" or "drop"
+        
+        Raises:
+            ValueError: If the policy name is unknown
+        """
+        if policy not in self.UNKNOWN_RUN_POLICIES:
+            raise ValueError(f"Unknown run policy '{policy}'. Available policies: {', '.join(self.UNKNOWN_RUN_POLICIES)}")
+        self.unknown_run_policy = policy
     
     def add_rule_group(self, name: str, rule_group: RuleGroup):
         """Add a rule group to the processor.
@@ -63,6 +140,11 @@ class TranscriptionProcessor:
         
         # Build the transcription tree
         self._build_transcription_tree()
+        
+        # Build the regex engine if selected
+        self.regex_engine = None
+        if self.engine == self.ENGINE_REGEX:
+            self._build_regex_engine()
     
     def _build_input_charset(self):
         """Build mapping of input characters to rule groups.
@@ -92,13 +174,77 @@ class TranscriptionProcessor:
                 else:
                     self.in_charset[char] = group
     
+    def _build_segmenter(self):
+        """Compile the run splitter used to segment input into words.
+        
+        This is the character -> group table of in_charset turned into one
+        regex: an alternative matching a single separator, one character
+        class run per rule group, and a run of characters belonging to no
+        group. Each match is a whole word of a single group, with exactly
+        the boundaries of a character-by-character scan. The index of the
+        matching alternative gives the group.
+        
+        Before the "no group" alternative, a word made only of characters
+        that no rule source contains either is matched as an untranscribable
+        run: the tree could only turn each of its characters into *UNKNOWN.
+        """
+        group_chars: Dict[int, List[str]] = {}
+        groups: List[RuleGroup] = []
+        special = self.SPACE_CHARS + self.LINE_FEED + self.IGNORED_CHARS
+        
+        for char, group in self.in_charset.items():
+            # Only single characters are ever looked up while segmenting
+            if len(char) != 1 or char in special:
+                continue
+            if id(group) not in group_chars:
+                group_chars[id(group)] = []
+                groups.append(group)
+            group_chars[id(group)].append(char)
+        
+        def char_class(chars) -> str:
+            return "".join(re.escape(char) for char in chars)
+        
+        alternatives = ["([" + char_class(self.SPACE_CHARS + self.LINE_FEED) + "])"]
+        for group in groups:
+            alternatives.append("([" + char_class(group_chars[id(group)]) + "]+)")
+        all_chars = [char for chars in group_chars.values() for char in chars]
+        
+        # The lookahead/backreference pair matches the run atomically, and
+        # the run must end the word (no "no group" character follows)
+        known_chars = set(all_chars) | self._source_chars() | set(special)
+        word_end = "[" + char_class(all_chars) + char_class(self.SPACE_CHARS + self.LINE_FEED) + "]"
+        unknown_run_index = len(alternatives) + 1
+        alternatives.append(f"(?=([^{char_class(sorted(known_chars))}]+))\\{unknown_run_index}(?={word_end}|\\Z)")
+        alternatives.append("([^" + char_class(all_chars) + char_class(special) + "]+)")
+        
+        self._segmenter = re.compile("|".join(alternatives))
+        # Indexed by match.lastindex: separator, groups, untranscribable, then "no group"
+        self._segment_groups = [None, None] + groups + [None, None]
+        self._unknown_run_index = unknown_run_index
+        
+        # What the tree makes of the word boundaries around such a run
+        tokens, _ = self.transcription_tree.transcribe(self.WORD_BOUNDARY_TREE, unknown=(TokenTable.UNKNOWN,))
+        self._boundary_tokens = tuple(tokens)
+    
+    def _source_chars(self) -> set:
+        """Characters appearing in at least one rule source."""
+        if isinstance(self.transcription_tree, CompiledTranscriptionTree):
+            return self.transcription_tree.source_chars()
+        return {char for source in self.paths for char in source}
+    
     def _build_transcription_tree(self):
-        """Build the transcription tree from all rules."""
+        """Build the transcription tree from all rules.
+        
+        The replacement tokens are interned into a new token table, and the
+        tree stores token ID tuples.
+        """
         self.transcription_tree = TranscriptionTreeNode()
+        self.token_table = TokenTable()
+        self.paths = {}
         
         # Add word boundaries (match Ruby exactly)
-        self.transcription_tree.add_subpath(self.WORD_BOUNDARY_TREE, [""])
-        self.transcription_tree.add_subpath(self.WORD_BREAKER, [""])
+        self.paths[self.WORD_BOUNDARY_TREE] = (TokenTable.EMPTY,)
+        self.paths[self.WORD_BREAKER] = (TokenTable.EMPTY,)
         
         # Add all rules from all rule groups
         for rule_group in self.rule_groups.values():
@@ -107,7 +253,70 @@ class TranscriptionProcessor:
                 for sub_rule in rule.sub_rules:
                     # Create path from source combination
                     path = "".join(sub_rule.src_combination)
-                    self.transcription_tree.add_subpath(path, sub_rule.dst_combination)
+                    # Later rules override earlier ones, like in the tree
+                    self.paths[path] = self.token_table.intern_all(sub_rule.dst_combination)
+        
+        for path, replacement in self.paths.items():
+            self.transcription_tree.add_subpath(path, replacement)
+        
+        self._build_segmenter()
+    
+    def _build_regex_engine(self):
+        """Compile the rule sources into the regex matching engine."""
+        self.regex_engine = RegexTranscriptionEngine(self.WORD_BREAKER + self.WORD_BOUNDARY_TREE,
+                                                     unknown=(TokenTable.UNKNOWN,))
+        self.regex_engine.build(self.paths, self.in_charset)
+    
+    def save_compiled_tree(self, path: str, source_key: bytes):
+        """Write the finalized tree and input charset to a compiled file.
+        
+        Args:
+            path: Destination file
+            source_key: Key from compiled_tree_key() for the mode source and
+                the options this processor was finalized with
+        """
+        if not isinstance(self.transcription_tree, TranscriptionTreeNode):
+            raise ValueError("Processor must be finalized before its tree can be compiled")
+        # Only single characters are ever looked up while segmenting
+        in_charset = {char: group.name for char, group in self.in_charset.items() if len(char) == 1}
+        write_compiled_tree(self.transcription_tree, path, source_key, in_charset, self.token_table)
+    
+    def load_compiled_tree(self, path: str, source_key: Optional[bytes] = None):
+        """Use a memory-mapped compiled tree instead of finalizing.
+        
+        The rule groups are not finalized: the tree and the input charset
+        both come from the file, which processes can share through the page
+        cache. Only the tree engine is available afterwards.
+        
+        Args:
+            path: File written by save_compiled_tree()
+            source_key: Expected key; a file built from another mode source
+                or other options is rejected
+        
+        Raises:
+            ValueError: If the file is invalid, stale, or references a rule
+                group this processor does not have
+        """
+        tree = CompiledTranscriptionTree.open(path, expected_key=source_key)
+        try:
+            token_table = TokenTable.from_names(tree.token_names())
+            in_charset = {}
+            for char, group_name in tree.in_charset().items():
+                group = self.rule_groups.get(group_name)
+                if group is None:
+                    raise ValueError(f"Compiled tree {path} references unknown rule group {group_name}")
+                in_charset[char] = group
+        except ValueError:
+            tree.close()
+            raise
+        
+        self.in_charset = in_charset
+        self.token_table = token_table
+        self.transcription_tree = tree
+        self.paths = {}
+        self.regex_engine = None
+        self.engine = self.ENGINE_TREE
+        self._build_segmenter()
     
     def transcribe(self, text: str, debug_context: Optional[Any] = None) -> List[str]:
         """Transcribe text using the rule tree.
@@ -119,53 +328,74 @@ class TranscriptionProcessor:
         Returns:
             List of transcription tokens
         """
+        return self.token_table.names_of(self.transcribe_ids(text, debug_context))
+    
+    def transcribe_ids(self, text: str, debug_context: Optional[Any] = None,
+                       runs: Optional[List[str]] = None) -> List[int]:
+        """Transcribe text to token IDs of the processor's token table.
+        
+        Args:
+            text: The input text to transcribe
+            debug_context: Optional debug context for tracing
+            runs: If given, each untranscribable run is emitted as a single
+                *UNKNOWN_RUN token and its output (according to the unknown
+                run policy) is appended to this list, in order. Otherwise
+                the run gives the same tokens as the tree.
+        
+        Returns:
+            List of transcription token IDs
+        """
         if not self.transcription_tree:
             # Tree not built yet - return unknown for everything
-            return ["*UNKNOWN"] * len(text)
+            return [TokenTable.UNKNOWN] * len(text)
+        
+        # Carriage returns are ignored without breaking the word they are in
+        if self.IGNORED_CHARS in text:
+            text = text.replace(self.IGNORED_CHARS, "")
         
         result = []
-        current_group = None
-        accumulated_word = ""
-        
-        for char in text:
-            if char in (" ", "\t"):
-                # Word boundary - transcribe accumulated word
-                result.extend(self._transcribe_word(accumulated_word, debug_context))
-                result.append("*SPACE")
-                accumulated_word = ""
-            elif char == "\r":
-                # Ignore carriage return
-                continue
-            elif char == "\n":
-                # Line feed boundary
-                result.extend(self._transcribe_word(accumulated_word, debug_context))
-                result.append("*LF")
-                accumulated_word = ""
-            else:
-                # Regular character
-                char_group = self.in_charset.get(char)
-                if char_group == current_group:
-                    accumulated_word += char
-                else:
-                    # Group changed - transcribe previous word
-                    result.extend(self._transcribe_word(accumulated_word, debug_context))
-                    current_group = char_group
-                    accumulated_word = char
+        segment_groups = self._segment_groups
+        transcribe_word = self._transcribe_word
+        unknown_run_index = self._unknown_run_index
         
-        # Transcribe any remaining word
-        result.extend(self._transcribe_word(accumulated_word, debug_context))
+        # Each match is a separator, or a whole word of a single group
+        for match in self._segmenter.finditer(text):
+            index = match.lastindex
+            if index == 1:
+                result.append(TokenTable.LF if match.group(1) == self.LINE_FEED else TokenTable.SPACE)
+            elif index == unknown_run_index:
+                run = match.group(index)
+                if runs is not None:
+                    result.append(TokenTable.UNKNOWN_RUN)
+                    runs.append(self._unknown_run_output(run))
+                else:
+                    result.extend(self._boundary_tokens)
+                    result.extend([TokenTable.UNKNOWN] * len(run))
+                    result.extend(self._boundary_tokens)
+            else:
+                result.extend(transcribe_word(match.group(index), debug_context, segment_groups[index]))
         
         return result
     
-    def _transcribe_word(self, word: str, debug_context: Optional[ModeDebugContext] = None) -> List[str]:
+    def _unknown_run_output(self, run: str) -> str:
+        """Output string of an untranscribable run under the current policy."""
+        if self.unknown_run_policy == self.UNKNOWN_RUN_PASSTHROUGH:
+            return run
+        if self.unknown_run_policy == self.UNKNOWN_RUN_DROP:
+            return ""
+        return UNKNOWN_CHAR_OUTPUT * len(run)
+    
+    def _transcribe_word(self, word: str, debug_context: Optional[ModeDebugContext] = None,
+                         group: Optional[RuleGroup] = None) -> List[int]:
         """Transcribe a single word.
         
         Args:
             word: The word to transcribe
             debug_context: Optional debug context for tracing
+            group: The rule group owning the word's characters
         
         Returns:
-            List of transcription tokens
+            List of transcription token IDs
         """
         if not word:
             return []
@@ -173,13 +403,17 @@ class TranscriptionProcessor:
         # Add word boundaries for matching (match Ruby exactly)
         word_with_boundaries = self.WORD_BOUNDARY_TREE + word + self.WORD_BOUNDARY_TREE
         
+        if self.regex_engine is not None and self.engine == self.ENGINE_REGEX:
+            return self.regex_engine.transcribe_word(word_with_boundaries, group)
+        
         result = []
         remaining = word_with_boundaries
         original_word = word_with_boundaries
+        unknown = (TokenTable.UNKNOWN,)
         
         while remaining:
             # Find longest match
-            tokens, consumed = self.transcription_tree.transcribe(remaining)
+            tokens, consumed = self.transcription_tree.transcribe(remaining, unknown=unknown)
             
             # Get the actual characters that were matched
             eaten = original_word[:consumed]
@@ -0,0 +1,134 @@
+"""Regex-compiled matching engine for transcription rules.
+
+This is an alternative to the TranscriptionTreeNode walk. The finalized
+rule sources are compiled into one longest-first alternation regex per
+rule group, so that a whole word is segmented by Python's C regex engine
+in a single findall() call instead of one tree step per character.
+
+The engine must agree exactly with TranscriptionTreeNode: at every
+position the longest source that matches wins, and a character that
+starts no source is emitted as a single "*UNKNOWN" token.
+"""
+
+from __future__ import annotations
+import re
+from typing import Dict, List, Optional, Pattern, Sequence, Any
+
+
+UNKNOWN_TOKEN = "*UNKNOWN"
+
+
+class RegexTranscriptionEngine:
+    """Matches words against rule sources with compiled regexes.
+
+    Sources are partitioned by the rule group owning their characters. A
+    word only ever contains characters of a single group (the processor
+    splits on group changes), so a source mixing characters of several
+    groups can never match and is dropped, and a source made only of
+    boundary characters (word breaker / tree boundary) is shared by every
+    group, including the "no group" used for untranscribable characters.
+    """
+
+    # Marker for "a source ends here" in the prefix trie (never a char key)
+    _END = ""
+
+    def __init__(self, boundary_chars: str = "|\u0000", unknown: Sequence = (UNKNOWN_TOKEN,)):
+        """Initialize an empty engine.
+
+        Args:
+            boundary_chars: Characters that belong to no rule group but may
+                appear in sources (word breaker and tree boundary)
+            unknown: Replacement for an unmatched character (the processor
+                passes the interned ID of "*UNKNOWN")
+        """
+        self.boundary_chars: str = boundary_chars
+        self.unknown: Sequence = unknown
+        self.replacements: Dict[str, Sequence] = {}
+        self.patterns: Dict[Any, Pattern] = {}
+        self._default_pattern: Optional[Pattern] = None
+
+    def build(self, paths: Dict[str, Sequence], in_charset: Dict[str, Any]):
+        """Compile the regexes for a set of rule sources.
+
+        Args:
+            paths: Mapping of source string to replacement tokens, as fed
+                to TranscriptionTreeNode.add_subpath (later entries win)
+            in_charset: Mapping of input character to its rule group
+        """
+        self.replacements = {src: dst for src, dst in paths.items() if src}
+
+        shared: List[str] = []
+        by_group: Dict[Any, List[str]] = {None: []}
+
+        for src in self.replacements:
+            groups = {in_charset.get(c) for c in src if c not in self.boundary_chars}
+            if not groups:
+                shared.append(src)
+            elif len(groups) == 1:
+                by_group.setdefault(groups.pop(), []).append(src)
+            # Sources spanning several groups cannot match a single-group word
+
+        self.patterns = {}
+        for group, sources in by_group.items():
+            self.patterns[group] = self._compile(sources + shared)
+        self._default_pattern = self.patterns[None]
+
+    @classmethod
+    def _compile(cls, sources: List[str]) -> Pattern:
+        """Compile sources into a longest-first alternation.
+
+        The sources are factored by common prefix, and every source that is
+        also the prefix of a longer one becomes a greedy optional group, so
+        the regex always tries the longest source first and backtracks to
+        shorter ones exactly like the tree does. The trailing catch-all
+        consumes a single unmatched character.
+        """
+        trie: Dict[str, Any] = {}
+        for src in sources:
+            node = trie
+            for char in src:
+                node = node.setdefault(char, {})
+            node[cls._END] = True
+
+        alternatives = cls._alternatives(trie)
+        alternatives.append(".")
+        return re.compile("|".join(alternatives), re.DOTALL)
+
+    @classmethod
+    def _alternatives(cls, node: Dict[str, Any]) -> List[str]:
+        """Build the regex alternatives for the children of a trie node."""
+        alternatives = []
+        for char in sorted(k for k in node if k != cls._END):
+            child = node[char]
+            sub = cls._alternatives(child)
+            if not sub:
+                alternatives.append(re.escape(char))
+                continue
+            body = sub[0] if len(sub) == 1 else "(?:" + "|".join(sub) + ")"
+            if cls._END in child:
+                # Longest first: try to extend, fall back to this source
+                body = ("(?:" + body + ")?") if len(sub) == 1 else body + "?"
+            alternatives.append(re.escape(char) + body)
+        return alternatives
+
+    def transcribe_word(self, word: str, group: Any = None) -> List:
+        """Transcribe a word (boundaries included) to tokens.
+
+        Args:
+            word: The word to transcribe, with tree boundaries around it
+            group: The rule group owning the word's characters
+
+        Returns:
+            List of transcription tokens
+        """
+        pattern = self.patterns.get(group, self._default_pattern)
+        replacements = self.replacements
+        unknown = self.unknown
+        result: List = []
+        for eaten in pattern.findall(word):
+            result.extend(replacements.get(eaten, unknown))
+        return result
+
+    def __str__(self) -> str:
+        """String representation of the engine."""
+        return f"<RegexTranscriptionEngine: {len(self.replacements)} sources, {len(self.patterns)} groups>"
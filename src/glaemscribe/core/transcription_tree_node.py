@@ -5,7 +5,10 @@ a tree-based pattern matching algorithm for efficient rule application.
 """
 
 from __future__ import annotations
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+UNKNOWN_REPLACEMENT = ("*UNKNOWN",)
 
 
 class TranscriptionTreeNode:
@@ -16,22 +19,23 @@ class TranscriptionTreeNode:
     and paths through the tree represent complete patterns.
     """
     
-    def __init__(self, character: Optional[str] = None, replacement: Optional[List[str]] = None):
+    def __init__(self, character: Optional[str] = None, replacement: Optional[Sequence] = None):
         """Initialize a tree node.
         
         Args:
             character: The character this node represents
-            replacement: The replacement tokens if this is a terminal node
+            replacement: The replacement tokens (names or interned IDs) if
+                this is a terminal node
         """
         self.character: Optional[str] = character
-        self.replacement: Optional[List[str]] = replacement
+        self.replacement: Optional[Sequence] = replacement
         self.siblings: Dict[str, TranscriptionTreeNode] = {}
     
     def is_effective(self) -> bool:
         """Check if this node has a replacement (is a terminal node)."""
         return self.replacement is not None
     
-    def add_subpath(self, source: str, replacement: List[str]):
+    def add_subpath(self, source: str, replacement: Sequence):
         """Add a pattern and its replacement to the tree.
         
         Args:
@@ -57,7 +61,8 @@ class TranscriptionTreeNode:
             # Continue building the path
             sibling.add_subpath(source[1:], replacement)
     
-    def transcribe(self, string: str, chain: Optional[List[TranscriptionTreeNode]] = None) -> Tuple[List[str], int]:
+    def transcribe(self, string: str, chain: Optional[List[TranscriptionTreeNode]] = None,
+                   unknown: Sequence = UNKNOWN_REPLACEMENT) -> Tuple[Sequence, int]:
         """Transcribe a string using the tree.
         
         This method walks the tree trying to match the longest possible
@@ -66,6 +71,8 @@ class TranscriptionTreeNode:
         Args:
             string: The input string to transcribe
             chain: The chain of nodes visited (for backtracking)
+            unknown: Replacement returned when nothing matches (the
+                processor passes the interned ID of "*UNKNOWN")
         
         Returns:
             A tuple of (replacement_tokens, characters_consumed)
@@ -82,7 +89,7 @@ class TranscriptionTreeNode:
             
             if sibling:
                 # Continue down the tree
-                return sibling.transcribe(string[1:], chain)
+                return sibling.transcribe(string[1:], chain, unknown)
         
         # We've reached the end of matching - backtrack to find effective node
         while len(chain) > 1:
@@ -92,7 +99,7 @@ class TranscriptionTreeNode:
                 return last_node.replacement, len(chain)
         
         # No match found - return unknown character marker
-        return ["*UNKNOWN"], 1
+        return unknown, 1
     
     def __str__(self) -> str:
         """String representation of the node."""
@@ -30,7 +30,8 @@ Example:
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
+import hashlib
 import os
 
 from .glaeml import Parser, Document, Node, Error
@@ -265,7 +266,8 @@ class CharsetParser:
     Attributes:
         charset: The Charset object being constructed (None until parse() is called)
         chars: List of character objects (Char and VirtualChar)
-        errors: List of parsing errors encountered
+        errors: List of parsing errors encountered (including names defined
+            by more than one character)
     
     Examples:
         >>> # Parse a charset file
@@ -292,6 +294,7 @@ class CharsetParser:
         self.charset: Optional[CoreCharset] = None
         self.chars: List[Union[Char, VirtualChar]] = []
         self.errors: List[Error] = []
+        self._chars_by_name: Dict[str, Union[Char, VirtualChar]] = {}
     
     def parse(self, file_path: str) -> CoreCharset:
         """Parse a .cst charset file and return a Charset object.
@@ -336,15 +339,6 @@ class CharsetParser:
             >>> from glaemscribe.resources import get_charset_path
             >>> charset = parser.parse(str(get_charset_path('tengwar_freemono')))
         """
-        self.errors = []
-        self.chars = []
-        
-        # Extract charset name from filename
-        charset_name = os.path.splitext(os.path.basename(file_path))[0]
-        
-        # Create the core charset object
-        self.charset = CoreCharset(name=charset_name, version="1.0.0")
-        
         # Read and parse the file
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -352,6 +346,25 @@ class CharsetParser:
         except IOError as e:
             raise FileNotFoundError(f"Could not read file {file_path}: {e}") from e
         
+        return self.parse_content(content, os.path.splitext(os.path.basename(file_path))[0])
+    
+    def parse_content(self, content: str, charset_name: str) -> CoreCharset:
+        """Parse the text of a .cst charset file and return a Charset object.
+        
+        Args:
+            content: The charset source
+            charset_name: Name to give the charset
+            
+        Returns:
+            Charset object containing all parsed character definitions
+        """
+        self.errors = []
+        self.chars = []
+        self._chars_by_name = {}
+        
+        # Create the core charset object
+        self.charset = CoreCharset(name=charset_name, version="1.0.0")
+        
         # Parse with Glaeml parser
         glaeml_parser = Parser()
         doc = glaeml_parser.parse(content)
@@ -427,7 +440,7 @@ class CharsetParser:
                 charset=self
             )
             
-            self.chars.append(char)
+            self._add_char(char)
             
             # Add to core charset's character dictionary
             for name in names:
@@ -495,7 +508,7 @@ class CharsetParser:
             default=default
         )
         
-        self.chars.append(virtual_char)
+        self._add_char(virtual_char)
         
         # Add to core charset's virtual characters
         for name in names:
@@ -546,12 +559,21 @@ class CharsetParser:
             return
         self.charset.sequences[name] = tokens
     
+    def _add_char(self, char: Union[Char, VirtualChar]):
+        """Add a character and index it by each of its names.
+        
+        A name already taken by another character is reported as an error;
+        lookups keep returning the first character defining it.
+        """
+        self.chars.append(char)
+        for name in char.names:
+            existing = self._chars_by_name.setdefault(name, char)
+            if existing is not char:
+                self.errors.append(Error(char.line, f"Character {name} is already defined at line {existing.line}"))
+    
     def _get_character_by_name(self, name: str) -> Optional[Char]:
         """Get a character object by name."""
-        for char in self.chars:
-            if name in char.names:
-                return char
-        return None
+        return self._chars_by_name.get(name)
     
     def _finalize(self):
         """Finalize the charset by building lookup tables."""
@@ -559,3 +581,53 @@ class CharsetParser:
         for char in self.chars:
             if isinstance(char, VirtualChar):
                 char.finalize()
+
+
+# Process-wide registry of parsed charsets, keyed by (resolved path, content hash)
+_charset_registry: Dict[Tuple[str, str], CoreCharset] = {}
+
+
+def load_charset(file_path: str) -> CoreCharset:
+    """Load a shared, read-only charset from a .cst file.
+    
+    Each charset file is parsed once per process: later loads of the same
+    file with the same content return the same frozen Charset object (see
+    Charset.freeze), virtual lookup tables included. Editing the file gives
+    a new content hash, hence a fresh parse.
+    
+    Args:
+        file_path: Path to the .cst charset file
+        
+    Returns:
+        The shared Charset
+        
+    Raises:
+        FileNotFoundError: If the file cannot be read
+        
+    Examples:
+        >>> from glaemscribe.resources import get_charset_path
+        >>> path = str(get_charset_path('tengwar_freemono'))
+        >>> load_charset(path) is load_charset(path)
+        True
+    """
+    resolved = os.path.realpath(file_path)
+    try:
+        with open(resolved, 'rb') as f:
+            data = f.read()
+    except IOError as e:
+        raise FileNotFoundError(f"Could not read file {file_path}: {e}") from e
+    
+    key = (resolved, hashlib.sha256(data).hexdigest())
+    charset = _charset_registry.get(key)
+    if charset is None:
+        charset_name = os.path.splitext(os.path.basename(file_path))[0]
+        # Universal newlines, as when parse() reads the file in text mode
+        content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        charset = CharsetParser().parse_content(content, charset_name).freeze()
+        _charset_registry[key] = charset
+    return charset
+
+
+def clear_charset_registry():
+    """Forget all shared charsets (they are parsed again on next load)."""
+    _charset_registry.clear()
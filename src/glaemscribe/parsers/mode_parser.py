@@ -31,7 +31,7 @@ import re
 from .glaeml import Parser, Document, Node, Error
 from ..core.mode_enhanced import Mode, Option
 from ..core.charset import Charset
-from .charset_parser import CharsetParser
+from .charset_parser import load_charset
 from ..core.rule_group import RuleGroup, CodeLine, CodeBlock, CodeLinesTerm
 from ..core.transcription_processor import TranscriptionProcessor
 from ..core.post_processor.base import TranscriptionPreProcessor
@@ -332,8 +332,8 @@ class ModeParser:
                 from ..resources import get_charset_path
                 charset_file = get_charset_path(charset_name)
                 
-                charset_parser = CharsetParser()
-                loaded_charset = charset_parser.parse(str(charset_file))
+                # Charsets are shared by every mode referencing them
+                loaded_charset = load_charset(str(charset_file))
                 self.mode.add_charset(loaded_charset, is_default)
                     
             except FileNotFoundError:
@@ -13,5 +13,31 @@ Planned features:
 """
 
 from .renderer import TengwarRenderer
+from .font_cache import FontCache, FontCacheStats, get_font, font_cache_stats, set_font_cache_limits, clear_font_cache
+from .glyph_atlas import GlyphAtlas, get_glyph_atlas
+from .layout import LayoutLine, TextLayout, LineMeasurer, layout_text, get_line_measurer, paginate
+from .batch import iter_render_batch
+from .render_cache import RenderCache, RenderCacheStats, render_cache_key, font_file_digest
 
-__all__ = ['TengwarRenderer']
+__all__ = [
+    'TengwarRenderer',
+    'FontCache',
+    'FontCacheStats',
+    'get_font',
+    'font_cache_stats',
+    'set_font_cache_limits',
+    'clear_font_cache',
+    'GlyphAtlas',
+    'get_glyph_atlas',
+    'LayoutLine',
+    'TextLayout',
+    'LineMeasurer',
+    'layout_text',
+    'get_line_measurer',
+    'paginate',
+    'RenderCache',
+    'RenderCacheStats',
+    'render_cache_key',
+    'font_file_digest',
+    'iter_render_batch',
+]
@@ -0,0 +1,147 @@
+"""Parallel batch rendering.
+
+Renders many (text, options) items across a pool of threads or processes
+and streams the results back in input order, as encoded bytes or as the
+paths of the written files.
+
+Thread workers share the renderer, its font and its render cache. Process
+workers each build one renderer from the renderer's configuration when
+they start, so fonts load once per worker, and write their files
+themselves so that only paths travel back. A render cache reaches process
+workers as its settings: each worker has its own memory tier and shares
+the directory tier, if any.
+
+Examples:
+    >>> renderer = TengwarRenderer(font_size=32)
+    >>> items = [(transcribe(name), {"filename": f"{name}.png"}) for name in names]
+    >>> for index, path in renderer.render_many(items, output_dir="gallery", workers=8):
+    ...     print(path)
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+
+# Key of the item options naming the output file
+FILENAME_OPTION = "filename"
+
+# Jobs kept in flight per worker, bounding memory on huge batches
+JOBS_PER_WORKER = 4
+
+BatchItem = Union[str, Tuple[str, Dict[str, Any]]]
+
+# The renderer of a process worker (see _init_process_worker)
+_worker_renderer = None
+
+
+def _normalize_item(index: int, item: BatchItem, output_dir: Optional[str],
+                    format: str) -> Tuple[int, str, Dict[str, Any], Optional[str]]:
+    """Turn an item into a job (index, text, render options, output path).
+
+    The render options always hold the image format: the item's own
+    "format" option, or the batch format.
+    """
+    if isinstance(item, str):
+        text, options = item, {}
+    else:
+        text, options = item
+        options = dict(options)
+    filename = options.pop(FILENAME_OPTION, None)
+    options["format"] = options.get("format", format)
+    path = None
+    if output_dir is not None:
+        if filename is None:
+            filename = f"{index:06d}.{options['format'].lower()}"
+        path = os.path.join(output_dir, filename)
+    return index, text, options, path
+
+
+def _render_job(renderer, job: Tuple[int, str, Dict[str, Any], Optional[str]]) -> Union[bytes, str]:
+    """Render a job, returning its bytes or the path of the written file."""
+    _, text, options, path = job
+    data = renderer.render_to_bytes(text, **options)
+    if path is None:
+        return data
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def _init_process_worker(renderer_options: Dict[str, Any]):
+    """Build the renderer of a process worker (loading its font once)."""
+    global _worker_renderer
+    from .renderer import TengwarRenderer
+    _worker_renderer = TengwarRenderer(**renderer_options)
+
+
+def _render_process_job(job: Tuple[int, str, Dict[str, Any], Optional[str]]) -> Union[bytes, str]:
+    """Render a job with the renderer of the current process worker."""
+    return _render_job(_worker_renderer, job)
+
+
+def _ordered_results(executor: Executor, submit: Callable, jobs: Iterable, window: int) -> Iterator[Tuple[int, Any]]:
+    """Yield (index, result) in job order, keeping at most window jobs in flight."""
+    pending: Deque = deque()
+    for job in jobs:
+        pending.append((job[0], submit(job)))
+        if len(pending) >= window:
+            index, future = pending.popleft()
+            yield index, future.result()
+    while pending:
+        index, future = pending.popleft()
+        yield index, future.result()
+
+
+def iter_render_batch(renderer, items: Iterable[BatchItem], output_dir: Optional[str] = None,
+                      workers: Optional[int] = None, use_processes: bool = False,
+                      format: str = "PNG") -> Iterator[Tuple[int, Union[bytes, str]]]:
+    """Render items in parallel, yielding the results in input order.
+
+    The arguments are checked and output_dir is created before returning;
+    rendering starts when the results are iterated.
+
+    Args:
+        renderer: The TengwarRenderer to render with (or whose configuration
+            process workers copy, see TengwarRenderer.worker_options())
+        items: Texts, or (text, options) pairs where options are
+            render_to_bytes() arguments (including "format", which
+            overrides the batch format) plus an optional "filename"
+        output_dir: Directory to write the images to (created if needed);
+            None to yield encoded bytes
+        workers: Number of workers. Default: the number of CPUs
+        use_processes: Use a process pool instead of a thread pool
+        format: Image format of items without their own. Default: "PNG"
+
+    Returns:
+        Iterator of (index, result): the item index and its bytes or file path
+
+    Raises:
+        ValueError: If workers is not positive
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    return _iter_results(renderer, items, output_dir, workers, use_processes, format)
+
+
+def _iter_results(renderer, items: Iterable[BatchItem], output_dir: Optional[str], workers: int,
+                  use_processes: bool, format: str) -> Iterator[Tuple[int, Union[bytes, str]]]:
+    """Run the pool and yield its results (see iter_render_batch)."""
+    jobs = (_normalize_item(index, item, output_dir, format) for index, item in enumerate(items))
+    window = workers * JOBS_PER_WORKER
+
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_process_worker,
+                                       initargs=(renderer.worker_options(),))
+        submit = lambda job: executor.submit(_render_process_job, job)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        submit = lambda job: executor.submit(_render_job, renderer, job)
+
+    with executor:
+        yield from _ordered_results(executor, submit, jobs, window)
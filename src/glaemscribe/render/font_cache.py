@@ -0,0 +1,185 @@
+"""Process-wide cache of loaded fonts.
+
+Loading a TrueType font reads and parses the whole font file, which costs
+far more than rendering a short snippet with it. Renderers therefore get
+their FreeTypeFont objects from a shared LRU cache keyed by
+(resolved font path, size, layout engine), so that an application creating
+a renderer per request loads each font once.
+
+Examples:
+    >>> from glaemscribe.render.font_cache import get_font, font_cache_stats
+    >>> font = get_font("fonts/FreeMonoTengwar.ttf", 24)
+    >>> get_font("fonts/FreeMonoTengwar.ttf", 24) is font
+    True
+    >>> font_cache_stats().hits
+    1
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PIL import ImageFont
+
+
+# Default limits of the shared cache
+DEFAULT_MAX_FONTS = 32
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class FontCacheStats:
+    """Snapshot of the font cache counters.
+
+    Attributes:
+        hits: Lookups served from the cache
+        misses: Lookups that loaded a font
+        evictions: Fonts dropped to stay within the limits
+        fonts: Fonts currently cached
+        bytes: Estimated memory held by the cached fonts
+        max_fonts: Maximum number of cached fonts
+        max_bytes: Maximum estimated memory of the cached fonts
+    """
+    hits: int
+    misses: int
+    evictions: int
+    fonts: int
+    bytes: int
+    max_fonts: int
+    max_bytes: int
+
+
+class FontCache:
+    """Thread-safe LRU cache of FreeTypeFont objects.
+
+    The memory held by a font is estimated by the size of its file, which
+    FreeType keeps loaded. The least recently used fonts are evicted when
+    either limit is exceeded; the font just loaded is always kept, even if
+    it alone exceeds max_bytes.
+    """
+
+    def __init__(self, max_fonts: int = DEFAULT_MAX_FONTS, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize an empty cache.
+
+        Args:
+            max_fonts: Maximum number of cached fonts
+            max_bytes: Maximum estimated memory of the cached fonts
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        self._fonts: "OrderedDict[Tuple[str, int, Optional[int]], Tuple[ImageFont.FreeTypeFont, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.max_fonts = DEFAULT_MAX_FONTS
+        self.max_bytes = DEFAULT_MAX_BYTES
+        self.set_limits(max_fonts, max_bytes)
+
+    def set_limits(self, max_fonts: Optional[int] = None, max_bytes: Optional[int] = None):
+        """Change the limits, evicting fonts if needed.
+
+        Args:
+            max_fonts: New maximum number of fonts (unchanged if None)
+            max_bytes: New maximum estimated memory (unchanged if None)
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if max_fonts is not None and max_fonts < 1:
+            raise ValueError(f"Font cache must hold at least one font, got max_fonts={max_fonts}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"Font cache memory limit must be positive, got max_bytes={max_bytes}")
+        with self._lock:
+            if max_fonts is not None:
+                self.max_fonts = max_fonts
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def get(self, font_path: str, size: int, layout_engine: Optional[int] = None) -> ImageFont.FreeTypeFont:
+        """Get a loaded font, loading it on a miss.
+
+        Args:
+            font_path: Path to the font file
+            size: Font size in points
+            layout_engine: PIL layout engine (ImageFont.Layout.BASIC or
+                RAQM), None for PIL's default
+
+        Returns:
+            The shared font object
+
+        Raises:
+            OSError: If the font cannot be loaded (failures are not cached)
+        """
+        key = (os.path.realpath(font_path), size, layout_engine)
+        with self._lock:
+            entry = self._fonts.get(key)
+            if entry is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Load outside the lock; a concurrent miss on the same key only
+        # costs a duplicate load
+        font = ImageFont.truetype(key[0], size, layout_engine=layout_engine)
+        font_bytes = os.path.getsize(key[0])
+
+        with self._lock:
+            entry = self._fonts.get(key)
+            if entry is not None:
+                self._fonts.move_to_end(key)
+                return entry[0]
+            self._fonts[key] = (font, font_bytes)
+            self._bytes += font_bytes
+            self._evict()
+        return font
+
+    def _evict(self):
+        """Drop least recently used fonts until within the limits (lock held)."""
+        while len(self._fonts) > 1 and (len(self._fonts) > self.max_fonts or self._bytes > self.max_bytes):
+            _, (_, font_bytes) = self._fonts.popitem(last=False)
+            self._bytes -= font_bytes
+            self.evictions += 1
+
+    def stats(self) -> FontCacheStats:
+        """Get a snapshot of the counters."""
+        with self._lock:
+            return FontCacheStats(self.hits, self.misses, self.evictions, len(self._fonts), self._bytes,
+                                  self.max_fonts, self.max_bytes)
+
+    def clear(self):
+        """Drop every cached font and reset the counters."""
+        with self._lock:
+            self._fonts.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+# The cache shared by every renderer of the process
+_font_cache = FontCache()
+
+
+def get_font(font_path: str, size: int, layout_engine: Optional[int] = None) -> ImageFont.FreeTypeFont:
+    """Get a font from the shared cache (see FontCache.get)."""
+    return _font_cache.get(font_path, size, layout_engine)
+
+
+def font_cache_stats() -> FontCacheStats:
+    """Get a snapshot of the shared cache counters."""
+    return _font_cache.stats()
+
+
+def set_font_cache_limits(max_fonts: Optional[int] = None, max_bytes: Optional[int] = None):
+    """Change the limits of the shared cache (see FontCache.set_limits)."""
+    _font_cache.set_limits(max_fonts, max_bytes)
+
+
+def clear_font_cache():
+    """Empty the shared cache."""
+    _font_cache.clear()
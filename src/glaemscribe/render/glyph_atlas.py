@@ -0,0 +1,166 @@
+"""Glyph atlas rendering.
+
+Rasterizing a string through FreeType costs the same for the hundredth
+label as for the first. A GlyphAtlas rasterizes each character of a font
+once into an 8-bit coverage mask and builds the text mask of a string by
+placing those masks at their pen positions, so that rendering many short
+labels mostly costs image copies.
+
+The text mask combines overlapping glyphs (tehtas over their carriers)
+like PIL's FreeType rendering does (coverage a + b - ab, ImageChops.screen),
+and the pen advances include the font's pair kerning. The result matches
+direct rendering up to a few levels of rounding where glyphs overlap.
+Atlases only reproduce the basic layout engine: complex shaping (Raqm) can
+move marks in ways that per-character masks cannot follow, so such fonts
+are rendered directly.
+"""
+
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+
+class GlyphAtlas:
+    """Cache of glyph masks and advances for one font.
+
+    Glyphs are rasterized on first use. Masks hold coverage only, so one
+    atlas serves every text colour.
+
+    Attributes:
+        font: The FreeType font the glyphs come from
+    """
+
+    def __init__(self, font: ImageFont.FreeTypeFont):
+        """Initialize an empty atlas.
+
+        Args:
+            font: A font using the basic layout engine
+
+        Raises:
+            ValueError: If the font uses another layout engine
+        """
+        if not supports_atlas(font):
+            raise ValueError("Glyph atlases need a FreeType font with the basic layout engine")
+        self.font = font
+        self._lock = threading.Lock()
+        # char -> (mask or None if no ink, bbox relative to the pen, advance)
+        self._glyphs: Dict[str, Tuple[Optional[Image.Image], Tuple[int, int, int, int], float]] = {}
+        self._kerning: Dict[Tuple[str, str], float] = {}
+
+    def glyph(self, char: str) -> Tuple[Optional[Image.Image], Tuple[int, int, int, int], float]:
+        """Get the mask, bounding box and advance of a character.
+
+        The bounding box is relative to the pen position on the line's
+        ascender, like FreeTypeFont.getbbox().
+        """
+        entry = self._glyphs.get(char)
+        if entry is None:
+            font = self.font
+            bbox = font.getbbox(char)
+            width, height = bbox[2] - bbox[0], bbox[3] - bbox[1]
+            mask = None
+            if width > 0 and height > 0:
+                mask = Image.new("L", (width, height), 0)
+                ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), char, font=font, fill=255)
+            entry = (mask, bbox, font.getlength(char))
+            with self._lock:
+                self._glyphs.setdefault(char, entry)
+        return entry
+
+    def kerning(self, left: str, right: str) -> float:
+        """Get the pen adjustment between two characters."""
+        pair = (left, right)
+        adjustment = self._kerning.get(pair)
+        if adjustment is None:
+            font = self.font
+            adjustment = font.getlength(left + right) - font.getlength(left) - font.getlength(right)
+            with self._lock:
+                self._kerning.setdefault(pair, adjustment)
+        return adjustment
+
+    def layout(self, text: str) -> Tuple[List[Tuple[str, int]], Tuple[int, int, int, int]]:
+        """Place the characters of a line of text.
+
+        Args:
+            text: Text to place (no line breaks)
+
+        Returns:
+            The (character, pen x) pairs, and the bounding box of the
+            whole text (same as FreeTypeFont.getbbox(text))
+        """
+        placements = []
+        x = 0.0
+        x0 = y0 = x1 = y1 = None
+        previous = None
+        for char in text:
+            if previous is not None:
+                x += self.kerning(previous, char)
+            pen = int(x + 0.5)
+            _, bbox, advance = self.glyph(char)
+            placements.append((char, pen))
+            if x0 is None:
+                x0, y0, x1, y1 = bbox[0] + pen, bbox[1], bbox[2] + pen, bbox[3]
+            else:
+                x0, y0 = min(x0, bbox[0] + pen), min(y0, bbox[1])
+                x1, y1 = max(x1, bbox[2] + pen), max(y1, bbox[3])
+            x += advance
+            previous = char
+        if x0 is None:
+            return placements, (0, 0, 0, 0)
+        return placements, (x0, y0, x1, y1)
+
+    def mask(self, text: str) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+        """Build the coverage mask of a line of text.
+
+        Args:
+            text: Text to render (no line breaks)
+
+        Returns:
+            The mask covering the text's bounding box, and that bounding box
+        """
+        placements, bbox = self.layout(text)
+        canvas = Image.new("L", (max(bbox[2] - bbox[0], 0), max(bbox[3] - bbox[1], 0)), 0)
+        ink_right = 0
+        for char, pen in placements:
+            glyph_mask, glyph_bbox, _ = self.glyph(char)
+            if glyph_mask is None:
+                continue
+            box = (pen + glyph_bbox[0] - bbox[0], glyph_bbox[1] - bbox[1],
+                   pen + glyph_bbox[2] - bbox[0], glyph_bbox[3] - bbox[1])
+            if box[0] >= ink_right:
+                # Nothing drawn there yet
+                canvas.paste(glyph_mask, box)
+            else:
+                canvas.paste(ImageChops.screen(canvas.crop(box), glyph_mask), box)
+            ink_right = max(ink_right, box[2])
+        return canvas, bbox
+
+    def __len__(self) -> int:
+        """Number of rasterized glyphs."""
+        return len(self._glyphs)
+
+
+def supports_atlas(font) -> bool:
+    """Check whether a font can be rendered through a glyph atlas."""
+    return (isinstance(font, ImageFont.FreeTypeFont)
+            and font.layout_engine == ImageFont.Layout.BASIC)
+
+
+# One atlas per font object; atlases go away with their font
+_atlases: "weakref.WeakKeyDictionary[ImageFont.FreeTypeFont, GlyphAtlas]" = weakref.WeakKeyDictionary()
+_atlases_lock = threading.Lock()
+
+
+def get_glyph_atlas(font: ImageFont.FreeTypeFont) -> GlyphAtlas:
+    """Get the shared atlas of a font, creating it if needed.
+
+    Raises:
+        ValueError: If the font cannot use an atlas (see supports_atlas)
+    """
+    with _atlases_lock:
+        atlas = _atlases.get(font)
+        if atlas is None:
+            atlas = _atlases[font] = GlyphAtlas(font)
+        return atlas
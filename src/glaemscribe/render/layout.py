@@ -0,0 +1,290 @@
+"""Multi-line text layout.
+
+Lays a document out into lines: explicit newlines start a new line, long
+lines are wrapped on word boundaries (spaces; a word too long for a line
+is cut between characters, never between a tehta and its carrier), and
+lines are spaced and aligned.
+
+Line measurements are cached per font, so laying a document out again
+after editing a few lines only measures the lines that changed.
+
+Examples:
+    >>> from glaemscribe.render.font_cache import get_font
+    >>> from glaemscribe.render.layout import layout_text
+    >>> font = get_font("fonts/FreeMonoTengwar.ttf", 24)
+    >>> layout = layout_text(font, tengwar, max_width=400, align="center")
+    >>> for line in layout.lines:
+    ...     draw.text((10 + line.x, 10 + line.y), line.text, font=font)
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+
+ALIGNMENTS = ("left", "center", "right")
+
+# Word separator of transcribed text
+WORD_SEPARATOR = " "
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+@dataclass(frozen=True)
+class LayoutLine:
+    """A laid out line.
+
+    Attributes:
+        text: Text of the line
+        x: Horizontal position of the line origin in the layout box
+        y: Vertical position of the line origin (top of the line) in the layout box
+        bbox: Ink box of the line relative to its origin
+    """
+    text: str
+    x: int
+    y: int
+    bbox: Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class TextLayout:
+    """Lines of a document placed in a box.
+
+    Attributes:
+        lines: The lines, top to bottom
+        width: Width of the box holding every line
+        height: Height of the box holding every line
+        line_height: Height of a line of the font (ascent + descent)
+    """
+    lines: Tuple[LayoutLine, ...]
+    width: int
+    height: int
+    line_height: int = 0
+
+
+class LineMeasurer:
+    """LRU cache of line bounding boxes for one font.
+
+    Attributes:
+        font: The measured font
+        max_entries: Maximum number of cached lines
+        hits: Measurements served from the cache
+        misses: Measurements computed
+    """
+
+    def __init__(self, font, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize an empty cache.
+
+        Args:
+            font: A PIL font
+            max_entries: Maximum number of cached lines
+        """
+        self.font = font
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._boxes: "OrderedDict[str, Tuple[int, int, int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._draw = ImageDraw.Draw(Image.new("L", (1, 1)))
+        ascent, descent = font.getmetrics() if hasattr(font, 'getmetrics') else (0, 0)
+        self.line_height = ascent + descent
+
+    def bbox(self, line: str) -> Tuple[int, int, int, int]:
+        """Get the ink box of a line relative to its origin (as ImageDraw.textbbox)."""
+        with self._lock:
+            box = self._boxes.get(line)
+            if box is not None:
+                self._boxes.move_to_end(line)
+                self.hits += 1
+                return box
+            self.misses += 1
+        box = tuple(int(value) for value in self._draw.textbbox((0, 0), line, font=self.font))
+        with self._lock:
+            self._boxes[line] = box
+            while len(self._boxes) > self.max_entries:
+                self._boxes.popitem(last=False)
+        return box
+
+    def width(self, line: str) -> int:
+        """Get the width a line takes from its origin to the right of its ink."""
+        box = self.bbox(line)
+        return box[2] - min(box[0], 0)
+
+    def clear(self):
+        """Drop every cached measurement."""
+        with self._lock:
+            self._boxes.clear()
+
+
+# One measurer per font object; measurers go away with their font
+_measurers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_measurers_lock = threading.Lock()
+
+
+def get_line_measurer(font) -> LineMeasurer:
+    """Get the shared line measurer of a font, creating it if needed."""
+    with _measurers_lock:
+        measurer = _measurers.get(font)
+        if measurer is None:
+            measurer = _measurers[font] = LineMeasurer(font)
+        return measurer
+
+
+def _clusters(measurer: LineMeasurer, word: str) -> List[str]:
+    """Split a word into characters, keeping zero-advance marks (tehtas) with their carrier."""
+    font = measurer.font
+    clusters: List[str] = []
+    for char in word:
+        if clusters and hasattr(font, 'getlength') and font.getlength(char) == 0:
+            clusters[-1] += char
+        else:
+            clusters.append(char)
+    return clusters
+
+
+def wrap_line(measurer: LineMeasurer, line: str, max_width: int) -> List[str]:
+    """Wrap a line (without newlines) to a maximum width.
+
+    Words are separated by spaces. A word wider than max_width on its own
+    is cut between characters.
+
+    Args:
+        measurer: Measurer of the font
+        line: Line to wrap
+        max_width: Maximum width in pixels
+
+    Returns:
+        The wrapped lines (at least one)
+    """
+    if measurer.width(line) <= max_width:
+        return [line]
+
+    lines: List[str] = []
+    current = None
+    for word in line.split(WORD_SEPARATOR):
+        candidate = word if current is None else current + WORD_SEPARATOR + word
+        if measurer.width(candidate) <= max_width:
+            current = candidate
+            continue
+        if current is not None:
+            lines.append(current)
+        if measurer.width(word) <= max_width:
+            current = word
+            continue
+        # Cut the word itself
+        current = ""
+        for cluster in _clusters(measurer, word):
+            if current and measurer.width(current + cluster) > max_width:
+                lines.append(current)
+                current = cluster
+            else:
+                current += cluster
+    if current is not None:
+        lines.append(current)
+    return lines
+
+
+def layout_text(font, text: str, max_width: Optional[int] = None, line_spacing: float = 1.2,
+                align: str = "left") -> TextLayout:
+    """Lay a document out into lines.
+
+    Args:
+        font: A PIL font
+        text: The text, with newlines between lines
+        max_width: Wrap lines wider than this many pixels (no wrapping if None)
+        line_spacing: Distance between line tops, as a multiple of the
+            font's line height (ascent + descent)
+        align: "left", "center" or "right"
+
+    Returns:
+        The placed lines
+
+    Raises:
+        ValueError: On an unknown alignment, or a max_width or line_spacing
+            that is not positive
+    """
+    if align not in ALIGNMENTS:
+        raise ValueError(f"Unknown alignment '{align}', expected one of {', '.join(ALIGNMENTS)}")
+    if max_width is not None and max_width <= 0:
+        raise ValueError(f"max_width must be positive, got {max_width}")
+    if line_spacing <= 0:
+        raise ValueError(f"line_spacing must be positive, got {line_spacing}")
+
+    measurer = get_line_measurer(font)
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        if max_width is None:
+            lines.append(paragraph)
+        else:
+            lines.extend(wrap_line(measurer, paragraph, max_width))
+
+    line_height = measurer.line_height
+    pitch = int(round(line_height * line_spacing))
+    boxes = [measurer.bbox(line) for line in lines]
+    widths = [box[2] - min(box[0], 0) for box in boxes]
+    width = max(widths)
+
+    # Ink reaching above the first line top pushes everything down
+    top = min(min(index * pitch + box[1] for index, box in enumerate(boxes)), 0)
+    placed = []
+    bottom = (len(lines) - 1) * pitch + line_height - top
+    for index, (line, box, line_width) in enumerate(zip(lines, boxes, widths)):
+        if align == "center":
+            offset = (width - line_width) // 2
+        elif align == "right":
+            offset = width - line_width
+        else:
+            offset = 0
+        y = index * pitch - top
+        placed.append(LayoutLine(line, offset - min(box[0], 0), y, box))
+        bottom = max(bottom, y + box[3])
+
+    return TextLayout(tuple(placed), width, bottom, line_height)
+
+
+def paginate(layout: TextLayout, page_height: int) -> List[TextLayout]:
+    """Split a layout into pages, breaking between lines.
+
+    Each page holds as many consecutive lines as fit in page_height, moved
+    up so that the page starts at its first line. A line taller than a
+    page gets a page of its own.
+
+    Args:
+        layout: The laid out document
+        page_height: Height available for lines on a page
+
+    Returns:
+        One layout per page (a single empty page for an empty layout)
+
+    Raises:
+        ValueError: If page_height is not positive
+    """
+    if page_height <= 0:
+        raise ValueError(f"page_height must be positive, got {page_height}")
+
+    pages: List[TextLayout] = []
+    page_lines: List[LayoutLine] = []
+    page_top = 0
+    for line in layout.lines:
+        top = line.y + min(line.bbox[1], 0)
+        bottom = line.y + max(line.bbox[3], layout.line_height)
+        if page_lines and bottom - page_top > page_height:
+            pages.append(_page(layout, page_lines, page_top))
+            page_lines = []
+        if not page_lines:
+            page_top = top
+        page_lines.append(line)
+    if page_lines or not pages:
+        pages.append(_page(layout, page_lines, page_top))
+    return pages
+
+
+def _page(layout: TextLayout, lines: List[LayoutLine], top: int) -> TextLayout:
+    """Build the layout of a page from its lines."""
+    moved = tuple(LayoutLine(line.text, line.x, line.y - top, line.bbox) for line in lines)
+    height = max((line.y + max(line.bbox[3], layout.line_height) for line in moved), default=0)
+    return TextLayout(moved, layout.width, height, layout.line_height)
@@ -0,0 +1,262 @@
+"""Content-addressed cache of encoded renders.
+
+Sites tend to render the same quotes in the same fonts over and over. A
+RenderCache keeps encoded images (PNG bytes and the like) under a key
+hashed from everything that determines them: the text, the digest of the
+font file, the font size and layout engine, and the rendering options.
+Hits skip both rasterizing and encoding.
+
+The cache has an in-memory LRU tier and an optional directory tier, whose
+files survive restarts and can be shared by worker processes. Both tiers
+have a size cap and evict the least recently used entries.
+
+Examples:
+    >>> from glaemscribe.render import TengwarRenderer
+    >>> from glaemscribe.render.render_cache import RenderCache
+    >>> cache = RenderCache(directory="/var/cache/tengwar", max_disk_bytes=512 * 1024 * 1024)
+    >>> renderer = TengwarRenderer(font_size=32, render_cache=cache)
+    >>> png = renderer.render_to_bytes(tengwar)  # Rendered and stored
+    >>> png = renderer.render_to_bytes(tengwar)  # Served from memory
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+# Suffix of the entry files of the directory tier
+ENTRY_SUFFIX = ".render"
+
+# Font file digests, keyed by (resolved path, size, modification time)
+_font_digests: Dict[Tuple[str, int, int], str] = {}
+_font_digests_lock = threading.Lock()
+
+
+def font_file_digest(font_path: str) -> str:
+    """Get the SHA-256 digest of a font file (computed once per file version)."""
+    resolved = os.path.realpath(font_path)
+    stat = os.stat(resolved)
+    version = (resolved, stat.st_size, stat.st_mtime_ns)
+    with _font_digests_lock:
+        digest = _font_digests.get(version)
+    if digest is None:
+        with open(resolved, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with _font_digests_lock:
+            _font_digests[version] = digest
+    return digest
+
+
+def render_cache_key(text: str, font_digest: str, font_size: int, options: Dict[str, Any]) -> str:
+    """Hash everything that determines an encoded render.
+
+    Args:
+        text: The rendered text
+        font_digest: Digest of the font file (see font_file_digest)
+        font_size: Font size in points
+        options: Other rendering options (layout engine, colours, padding,
+            format, ...); values must be JSON-serializable
+
+    Returns:
+        Hex digest usable as a file name
+    """
+    payload = json.dumps([text, font_digest, font_size, options], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass(frozen=True)
+class RenderCacheStats:
+    """Snapshot of the render cache counters.
+
+    Attributes:
+        memory_hits: Lookups served from memory
+        disk_hits: Lookups served from the directory tier
+        misses: Lookups that found nothing
+        memory_entries: Entries held in memory
+        memory_bytes: Bytes held in memory
+        disk_bytes: Bytes held in the directory tier (as seen by this process)
+    """
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    memory_entries: int
+    memory_bytes: int
+    disk_bytes: int
+
+
+class RenderCache:
+    """Two-tier LRU cache of encoded renders.
+
+    Entries larger than a tier's cap are not stored in that tier. The
+    directory tier orders entries by file modification time, which is
+    refreshed on every hit. Pickling keeps the settings only, so a cache
+    sent to another process starts with an empty memory tier and shares
+    the directory tier.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: Optional[str] = None,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Cap of the in-memory tier
+            directory: Directory of the disk tier (created if needed), None
+                for memory only
+            max_disk_bytes: Cap of the disk tier
+
+        Raises:
+            ValueError: If a cap is not positive
+        """
+        if max_bytes < 1 or max_disk_bytes < 1:
+            raise ValueError("Render cache caps must be positive")
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    def __getstate__(self):
+        """Pickle the settings only, e.g. to hand the cache to process workers."""
+        return {"max_bytes": self.max_bytes, "directory": self.directory, "max_disk_bytes": self.max_disk_bytes}
+
+    def __setstate__(self, state):
+        """Rebuild an unpickled cache: empty memory tier, same directory tier."""
+        self.__init__(**state)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get the encoded render stored under a key, or None."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                os.utime(path)
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._store_in_memory(key, data)
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes):
+        """Store an encoded render under a key."""
+        with self._lock:
+            self._store_in_memory(key, data)
+
+        if self.directory is None or len(data) > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        # Write atomically, so that readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        with self._lock:
+            self._disk_bytes += len(data)
+            over_cap = self._disk_bytes > self.max_disk_bytes
+        if over_cap:
+            self._evict_disk()
+
+    def stats(self) -> RenderCacheStats:
+        """Get a snapshot of the counters."""
+        with self._lock:
+            return RenderCacheStats(self.memory_hits, self.disk_hits, self.misses,
+                                    len(self._entries), self._bytes, self._disk_bytes)
+
+    def clear(self):
+        """Drop every entry of both tiers and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.memory_hits = self.disk_hits = self.misses = 0
+        if self.directory is not None:
+            for path, _, _ in self._disk_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            with self._lock:
+                self._disk_bytes = 0
+
+    def _store_in_memory(self, key: str, data: bytes):
+        """Add an entry to the memory tier and evict (lock held)."""
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def _path(self, key: str) -> str:
+        """Path of the directory tier entry of a key."""
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def _disk_entries(self):
+        """List the directory tier entries as (path, size, mtime)."""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def _evict_disk(self):
+        """Remove the least recently used files until under the disk cap.
+
+        The directory is rescanned, since other processes may share it.
+        """
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
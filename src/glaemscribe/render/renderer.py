@@ -33,11 +33,45 @@ Available Bundled Fonts:
     - 'alcarin-bold': AlcarinTengwar-Bold
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 import io
 import base64
+import html
 import os
-from typing import Optional, Tuple, Union
+import weakref
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .batch import BatchItem, iter_render_batch
+from .font_cache import get_font
+from .glyph_atlas import get_glyph_atlas, supports_atlas
+from .layout import TextLayout, layout_text, paginate
+from .render_cache import RenderCache, font_file_digest, render_cache_key
+
+
+# Outputs of render_html()
+HTML_OUTPUTS = ("text", "image")
+
+# CSS @font-face formats of font file extensions
+FONT_FORMATS = {".ttf": "truetype", ".otf": "opentype", ".woff": "woff", ".woff2": "woff2"}
+
+# A code point no font maps, whose glyph is the font's missing glyph box
+MISSING_CODE_POINT = "\U0010fffd"
+
+# Glyph coverage of each font object (char -> has a glyph)
+_glyph_coverage: "weakref.WeakKeyDictionary[ImageFont.FreeTypeFont, Dict[str, bool]]" = weakref.WeakKeyDictionary()
+
+
+def _glyph_signature(font: ImageFont.FreeTypeFont, char: str) -> Tuple:
+    """Identify the glyph a font draws for a character (mask and advance)."""
+    mask = font.getmask(char)
+    return mask.size, bytes(mask), font.getlength(char)
+
+
+# Image modes of render_text()
+OUTPUT_MODES = ("RGB", "RGBA", "L", "1", "P")
+
+# Shared drawing context for measuring text (measuring does not draw)
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
 
 
 class TengwarRenderer:
@@ -51,7 +85,13 @@ class TengwarRenderer:
         BUNDLED_FONTS (dict): Available bundled fonts (OFL licensed)
         font_size (int): Current font size in points
         font_path (str): Path to the loaded font file
-        font (ImageFont): Loaded PIL font object
+        layout_engine (int): PIL layout engine, None for PIL's default
+        use_atlas (bool): Whether single lines are composited from a glyph
+            atlas (see glaemscribe.render.glyph_atlas)
+        render_cache (RenderCache): Cache of encoded renders used by
+            render_to_bytes(), None for no caching
+        font (ImageFont): Loaded PIL font object, shared through the
+            process-wide font cache (see glaemscribe.render.font_cache)
     
     Examples:
         Basic usage with bundled font:
@@ -92,7 +132,9 @@ class TengwarRenderer:
         'alcarin-bold': 'AlcarinTengwar-Bold.ttf',
     }
     
-    def __init__(self, font_name: str = 'freemono', font_path: Optional[str] = None, font_size: int = 24):
+    def __init__(self, font_name: str = 'freemono', font_path: Optional[str] = None, font_size: int = 24,
+                 layout_engine: Optional[int] = None, use_atlas: bool = False,
+                 render_cache: Optional[RenderCache] = None):
         """Initialize the renderer.
         
         Args:
@@ -103,6 +145,16 @@ class TengwarRenderer:
             font_path (str, optional): Path to custom Tengwar font file.
                 If provided, overrides font_name. Can be absolute or relative.
             font_size (int): Font size in points. Default is 24.
+            layout_engine (int, optional): PIL layout engine
+                (ImageFont.Layout.BASIC or ImageFont.Layout.RAQM).
+                Default is PIL's choice.
+            use_atlas (bool): Composite single-line text from pre-rasterized
+                glyphs, which is much faster for many short texts and matches
+                direct rendering within antialiasing rounding. Only used with
+                the basic layout engine; other fonts render directly.
+            render_cache (RenderCache, optional): Cache serving repeated
+                render_to_bytes() and render_to_base64() calls without
+                rasterizing or encoding again. May be shared by renderers.
         
         Raises:
             Warning: If font cannot be loaded, falls back to default font
@@ -118,6 +170,9 @@ class TengwarRenderer:
             >>> renderer = TengwarRenderer(font_path="fonts/MyTengwar.ttf")
         """
         self.font_size = font_size
+        self.layout_engine = layout_engine
+        self.use_atlas = use_atlas
+        self.render_cache = render_cache
         self.font = None
         
         # Determine font path
@@ -130,9 +185,9 @@ class TengwarRenderer:
             fonts_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fonts')
             self.font_path = os.path.join(fonts_dir, font_filename)
         
-        # Load the font
+        # Load the font (once per process for a given path, size and engine)
         try:
-            self.font = ImageFont.truetype(self.font_path, font_size)
+            self.font = get_font(self.font_path, font_size, layout_engine)
         except Exception as e:
             print(f"Warning: Could not load font {self.font_path}: {e}")
             print("Falling back to default font (will show tofu)")
@@ -143,7 +198,9 @@ class TengwarRenderer:
                    size: Optional[Tuple[int, int]] = None,
                    padding: int = 10,
                    background_color: str = "white",
-                   text_color: str = "black") -> Image.Image:
+                   text_color: str = "black",
+                   mode: str = "RGB",
+                   palette_colors: int = 2) -> Image.Image:
         """Render Tengwar text as an image.
         
         Args:
@@ -154,10 +211,25 @@ class TengwarRenderer:
             padding (int): Padding around the text in pixels. Default: 10
             background_color (str): Background color name or hex code. Default: "white"
             text_color (str): Text color name or hex code. Default: "black"
+            mode (str): Image mode (see OUTPUT_MODES). Default: "RGB"
+                - "RGB": 24-bit color
+                - "RGBA": text color over a transparent background (alpha
+                  is the text coverage; background_color is ignored)
+                - "L": 8-bit grayscale
+                - "1": 1-bit, text and background thresholded at half
+                  coverage (no antialiasing)
+                - "P": palette of palette_colors colors running from the
+                  background to the text color
+            palette_colors (int): Palette size of mode "P", 2 to 256. Two
+                colors give the smallest files, a few more keep some
+                antialiasing. Default: 2
             
         Returns:
             Image.Image: PIL Image object containing the rendered text
         
+        Raises:
+            ValueError: On an unknown mode or a palette size out of range
+        
         Examples:
             >>> renderer = TengwarRenderer()
             >>> img = renderer.render_text(tengwar_text)
@@ -171,13 +243,33 @@ class TengwarRenderer:
             ...     text_color="#ecf0f1"
             ... )
         """
+        if mode not in OUTPUT_MODES:
+            raise ValueError(f"Unknown output mode '{mode}', expected one of {', '.join(OUTPUT_MODES)}")
+        if mode == "P" and not 2 <= palette_colors <= 256:
+            raise ValueError(f"palette_colors must be between 2 and 256, got {palette_colors}")
+        text_mask, bbox = self._measure_text(text)
+        return self._draw_text(text, text_mask, bbox, size, padding, background_color, text_color, mode,
+                               palette_colors)
+    
+    def _measure_text(self, text: str) -> Tuple[Optional[Image.Image], Tuple[int, int, int, int]]:
+        """Measure text for render_text().
+        
+        Returns:
+            The coverage mask of the text from the glyph atlas (None when
+            drawing directly), and the bounding box of the text
+        """
         if not self.font:
             # Fallback to default font (will show tofu, but at least works)
             self.font = ImageFont.load_default()
         
-        # Create a temporary image to measure text
-        temp_draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
-        bbox = temp_draw.textbbox((0, 0), text, font=self.font)
+        if self.use_atlas and "\n" not in text and supports_atlas(self.font):
+            return get_glyph_atlas(self.font).mask(text)
+        return None, _MEASURE_DRAW.textbbox((0, 0), text, font=self.font)
+    
+    def _draw_text(self, text: str, text_mask: Optional[Image.Image], bbox: Tuple[int, int, int, int],
+                   size: Optional[Tuple[int, int]], padding: int, background_color: str, text_color: str,
+                   mode: str, palette_colors: int) -> Image.Image:
+        """Draw measured text into a new image (see render_text())."""
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
         
@@ -188,21 +280,200 @@ class TengwarRenderer:
             img_width = text_width + (padding * 2)
             img_height = text_height + (padding * 2)
         
-        # Create the actual image
-        image = Image.new("RGB", (img_width, img_height), background_color)
-        draw = ImageDraw.Draw(image)
-        
         # Calculate text position (centered)
         text_x = (img_width - text_width) // 2
         text_y = (img_height - text_height) // 2
         
-        # Draw the text
-        draw.text((text_x, text_y), text, font=self.font, fill=text_color)
+        if mode in ("RGB", "L"):
+            # Draw the text in color directly
+            image = Image.new(mode, (img_width, img_height), background_color)
+            if text_mask is not None:
+                left, top = text_x + bbox[0], text_y + bbox[1]
+                image.paste(text_color, (left, top, left + text_mask.width, top + text_mask.height), text_mask)
+            else:
+                draw = ImageDraw.Draw(image)
+                draw.text((text_x, text_y), text, font=self.font, fill=text_color)
+            return image
+        
+        # The other modes are built from the coverage of the text
+        coverage = Image.new("L", (img_width, img_height), 0)
+        if text_mask is not None:
+            left, top = text_x + bbox[0], text_y + bbox[1]
+            coverage.paste(text_mask, (left, top, left + text_mask.width, top + text_mask.height))
+        else:
+            ImageDraw.Draw(coverage).text((text_x, text_y), text, font=self.font, fill=255)
+        
+        if mode == "RGBA":
+            image = Image.new("RGBA", (img_width, img_height), ImageColor.getrgb(text_color)[:3] + (0,))
+            image.putalpha(coverage)
+            return image
+        
+        if mode == "1":
+            image = Image.new("L", (img_width, img_height), background_color)
+            image.paste(text_color, (0, 0), coverage.point(lambda value: 255 if value >= 128 else 0))
+            return image.convert("1", dither=Image.Dither.NONE)
         
+        # "P": coverage quantized to palette indexes, colors interpolated
+        # from the background to the text color
+        steps = palette_colors - 1
+        background = ImageColor.getrgb(background_color)[:3]
+        foreground = ImageColor.getrgb(text_color)[:3]
+        palette = []
+        for index in range(palette_colors):
+            palette.extend(round(b + (f - b) * index / steps) for b, f in zip(background, foreground))
+        image = coverage.point([round(value * steps / 255) for value in range(256)])
+        image.putpalette(palette)
         return image
     
+    def layout(self, text: str,
+               max_width: Optional[int] = None,
+               line_spacing: float = 1.2,
+               align: str = "left") -> TextLayout:
+        """Lay multi-line Tengwar text out with this renderer's font.
+        
+        Line measurements are cached per font, so laying out an edited
+        document again only measures the lines that changed.
+        
+        Args:
+            text (str): The Tengwar Unicode text, with newlines between lines
+            max_width (int, optional): Wrap lines wider than this many pixels
+                on word boundaries. Default: no wrapping
+            line_spacing (float): Distance between line tops as a multiple of
+                the font's line height. Default: 1.2
+            align (str): "left", "center" or "right". Default: "left"
+            
+        Returns:
+            TextLayout: The placed lines (see glaemscribe.render.layout)
+        
+        Raises:
+            ValueError: On an unknown alignment or invalid sizes
+        """
+        if not self.font:
+            self.font = ImageFont.load_default()
+        return layout_text(self.font, text, max_width=max_width, line_spacing=line_spacing, align=align)
+    
+    def render_document(self, text: str,
+                        max_width: Optional[int] = None,
+                        line_spacing: float = 1.2,
+                        align: str = "left",
+                        size: Optional[Tuple[int, int]] = None,
+                        padding: int = 10,
+                        background_color: str = "white",
+                        text_color: str = "black") -> Image.Image:
+        """Render multi-line Tengwar text with wrapping and alignment.
+        
+        Args:
+            text (str): The Tengwar Unicode text, with newlines between lines
+            max_width (int, optional): Wrap lines wider than this many pixels
+                (padding excluded). Default: no wrapping
+            line_spacing (float): Distance between line tops as a multiple of
+                the font's line height. Default: 1.2
+            align (str): "left", "center" or "right". Default: "left"
+            size (tuple, optional): Fixed image size (width, height). If None,
+                the image fits the laid out text.
+            padding (int): Padding around the text in pixels. Default: 10
+            background_color (str): Background color name or hex code. Default: "white"
+            text_color (str): Text color name or hex code. Default: "black"
+            
+        Returns:
+            Image.Image: PIL Image object containing the rendered text
+        
+        Examples:
+            >>> renderer = TengwarRenderer(font_size=32)
+            >>> img = renderer.render_document(poem, max_width=600, align="center")
+        """
+        layout = self.layout(text, max_width=max_width, line_spacing=line_spacing, align=align)
+        if size:
+            img_width, img_height = size
+        else:
+            img_width = layout.width + (padding * 2)
+            img_height = layout.height + (padding * 2)
+        
+        image = Image.new("RGB", (img_width, img_height), background_color)
+        for line in layout.lines:
+            self._draw_line(image, padding + line.x, padding + line.y, line.text, text_color)
+        return image
+    
+    def render_pages(self, text: str,
+                     page_size: Tuple[int, int] = (800, 1000),
+                     pages: Optional[Iterable[int]] = None,
+                     max_width: Optional[int] = None,
+                     line_spacing: float = 1.2,
+                     align: str = "left",
+                     padding: int = 10,
+                     background_color: str = "white",
+                     text_color: str = "black",
+                     format: str = "PNG") -> Iterator[bytes]:
+        """Render a long document as a sequence of encoded pages.
+        
+        The text is laid out once, then each page is drawn, encoded and
+        yielded in turn, so only one page image is in memory at a time
+        however long the document is.
+        
+        Args:
+            text (str): The Tengwar Unicode text, with newlines between lines
+            page_size (tuple): Size of each page (width, height) in pixels.
+                Default: (800, 1000)
+            pages (iterable of int, optional): Indexes (from 0) of the pages
+                to render, e.g. range(10, 20). Indexes past the last page are
+                ignored. Default: every page
+            max_width (int, optional): Wrap width in pixels. Default: the
+                page width minus padding
+            line_spacing (float): Distance between line tops as a multiple of
+                the font's line height. Default: 1.2
+            align (str): "left", "center" or "right". Default: "left"
+            padding (int): Margin of each page in pixels. Default: 10
+            background_color (str): Background color name or hex code. Default: "white"
+            text_color (str): Text color name or hex code. Default: "black"
+            format (str): Image format of the pages. Default: "PNG"
+            
+        Yields:
+            bytes: The encoded pages, in the requested order
+        
+        Raises:
+            ValueError: If the page is too small for its padding
+        
+        Examples:
+            >>> renderer = TengwarRenderer(font_size=20)
+            >>> for number, page in enumerate(renderer.render_pages(book, pages=range(3))):
+            ...     Path(f"page_{number}.png").write_bytes(page)
+        """
+        page_width, page_height = page_size
+        if page_width <= 2 * padding or page_height <= 2 * padding:
+            raise ValueError(f"Page size {page_size} leaves no room inside a padding of {padding}")
+        if max_width is None:
+            max_width = page_width - 2 * padding
+        
+        layout = self.layout(text, max_width=max_width, line_spacing=line_spacing, align=align)
+        page_layouts = paginate(layout, page_height - 2 * padding)
+        indexes = range(len(page_layouts)) if pages is None else pages
+        
+        for index in indexes:
+            if not 0 <= index < len(page_layouts):
+                continue
+            image = Image.new("RGB", page_size, background_color)
+            for line in page_layouts[index].lines:
+                self._draw_line(image, padding + line.x, padding + line.y, line.text, text_color)
+            buffer = io.BytesIO()
+            image.save(buffer, format=format)
+            del image
+            yield buffer.getvalue()
+    
+    def _draw_line(self, image: Image.Image, x: int, y: int, text: str, color: str):
+        """Draw a single line with its origin at (x, y)."""
+        if not text:
+            return
+        if self.use_atlas and supports_atlas(self.font):
+            mask, bbox = get_glyph_atlas(self.font).mask(text)
+            if mask.width and mask.height:
+                left, top = x + bbox[0], y + bbox[1]
+                image.paste(color, (left, top, left + mask.width, top + mask.height), mask)
+        else:
+            ImageDraw.Draw(image).text((x, y), text, font=self.font, fill=color)
+    
     def render_to_file(self, text: str, 
                       output_path: str,
+                      encoder_options: Optional[Dict[str, Any]] = None,
                       **kwargs) -> None:
         """Render Tengwar text directly to a file.
         
@@ -212,11 +483,14 @@ class TengwarRenderer:
         Args:
             text (str): The Tengwar Unicode text to render
             output_path (str): Path to save the image (e.g., "output.png")
+            encoder_options (dict, optional): Encoder settings passed to
+                Image.save() (see render_to_bytes())
             **kwargs: Additional arguments passed to render_text():
                 - padding (int): Padding in pixels
                 - background_color (str): Background color
                 - text_color (str): Text color
                 - size (tuple): Fixed image size
+                - mode (str): Image mode ("RGB", "RGBA", "L", "1", "P")
         
         Examples:
             >>> from glaemscribe import transcribe
@@ -236,10 +510,11 @@ class TengwarRenderer:
             ... )
         """
         image = self.render_text(text, **kwargs)
-        image.save(output_path)
+        image.save(output_path, **(encoder_options or {}))
     
     def render_to_bytes(self, text: str, 
                        format: str = "PNG",
+                       encoder_options: Optional[Dict[str, Any]] = None,
                        **kwargs) -> bytes:
         """Render Tengwar text to bytes.
         
@@ -248,7 +523,12 @@ class TengwarRenderer:
         Args:
             text (str): The Tengwar Unicode text to render
             format (str): Image format (PNG, JPEG, etc.). Default: "PNG"
-            **kwargs: Additional arguments passed to render_text()
+            encoder_options (dict, optional): Encoder settings passed to
+                Image.save(), e.g. {"compress_level": 9, "optimize": True}
+                for PNG or {"lossless": True, "method": 6} for WebP.
+                Default: Pillow's defaults
+            **kwargs: Additional arguments passed to render_text(); a
+                compact mode ("1", "L" or "P") makes much smaller files
             
         Returns:
             bytes: Image data as bytes
@@ -258,11 +538,106 @@ class TengwarRenderer:
             >>> image_bytes = renderer.render_to_bytes(tengwar_text)
             >>> # Send via HTTP response
             >>> return Response(image_bytes, mimetype='image/png')
+            
+            >>> # Smallest PNG for black-on-white text
+            >>> image_bytes = renderer.render_to_bytes(
+            ...     tengwar_text, mode="P", encoder_options={"optimize": True})
         """
+        key = self._render_key(text, format, dict(kwargs, encoder_options=encoder_options))
+        if key is not None:
+            data = self.render_cache.get(key)
+            if data is not None:
+                return data
+        
         image = self.render_text(text, **kwargs)
         buffer = io.BytesIO()
-        image.save(buffer, format=format)
-        return buffer.getvalue()
+        image.save(buffer, format=format, **(encoder_options or {}))
+        data = buffer.getvalue()
+        
+        if key is not None:
+            self.render_cache.put(key, data)
+        return data
+    
+    def _render_key(self, text: str, format: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Get the render cache key of an encoded render, None if not cacheable.
+        
+        Renders with the fallback font (no font file) are not cached.
+        """
+        if self.render_cache is None or self.font is None:
+            return None
+        options = dict(_RENDER_DEFAULTS)
+        options.update(kwargs)
+        options.pop("output_format", None)
+        options.update(format=format.upper(), layout_engine=self.layout_engine, use_atlas=self.use_atlas)
+        try:
+            digest = font_file_digest(self.font_path)
+        except OSError:
+            return None
+        return render_cache_key(text, digest, self.font_size, options)
+    
+    def render_many(self, items: Iterable[BatchItem],
+                    output_dir: Optional[str] = None,
+                    callback: Optional[Callable[[int, Union[bytes, str]], Any]] = None,
+                    workers: Optional[int] = None,
+                    use_processes: bool = False,
+                    format: str = "PNG") -> Optional[Iterator[Tuple[int, Union[bytes, str]]]]:
+        """Render many texts in parallel.
+        
+        Items are rendered across a pool of threads (sharing this renderer
+        and its render cache) or processes (each building one renderer with
+        this configuration, so fonts load once per worker). Results come
+        back in input order while later items are still rendering.
+        
+        Args:
+            items (iterable): Texts, or (text, options) pairs where options
+                are render_to_bytes() arguments (padding, colors, format,
+                ...) plus an optional "filename" for the output file
+            output_dir (str, optional): Directory to write the images to,
+                as "filename" or "<index>.<format>". Default: return bytes
+            callback (callable, optional): Called with (index, result) for
+                each item; render_many() then returns when all are done
+            workers (int, optional): Number of workers. Default: CPU count
+            use_processes (bool): Use processes instead of threads, which
+                also parallelizes rasterizing. Default: False
+            format (str): Image format of items without their own "format"
+                option. Default: "PNG"
+            
+        Returns:
+            Without a callback, an iterator of (index, result) pairs, where
+            result is the encoded image or the path of the written file;
+            with a callback, None
+        
+        Raises:
+            ValueError: If workers is not positive
+        
+        Examples:
+            >>> renderer = TengwarRenderer(font_size=32)
+            >>> names = ["Elendil", "Isildur", "Anárion"]
+            >>> items = [(transcribe(n), {"filename": f"{n}.png"}) for n in names]
+            >>> for index, path in renderer.render_many(items, output_dir="gallery"):
+            ...     print(names[index], path)
+        """
+        results = iter_render_batch(self, items, output_dir=output_dir, workers=workers,
+                                    use_processes=use_processes, format=format)
+        if callback is None:
+            return results
+        for index, result in results:
+            callback(index, result)
+        return None
+    
+    def worker_options(self) -> Dict[str, Any]:
+        """Get the options building an equivalent renderer in another process.
+        
+        The render cache travels as its settings (see RenderCache): the
+        other process gets its own memory tier and shares the directory tier.
+        """
+        return {
+            "font_path": self.font_path,
+            "font_size": self.font_size,
+            "layout_engine": self.layout_engine,
+            "use_atlas": self.use_atlas,
+            "render_cache": self.render_cache,
+        }
     
     def render_to_base64(self, text: str,
                         format: str = "PNG", 
@@ -272,7 +647,8 @@ class TengwarRenderer:
         Args:
             text (str): The Tengwar Unicode text to render
             format (str): Image format (PNG, JPEG, etc.). Default: "PNG"
-            **kwargs: Additional arguments passed to render_text()
+            **kwargs: Additional arguments passed to render_to_bytes()
+                (encoder_options) and render_text()
             
         Returns:
             str: Base64-encoded image string (without data URI prefix)
@@ -314,6 +690,119 @@ class TengwarRenderer:
         b64_data = self.render_to_base64(text, **kwargs)
         format = kwargs.get('format', 'PNG')
         return f'<img src="data:image/{format.lower()};base64,{b64_data}" alt="{alt_text}" />'
+    
+    def font_family(self) -> str:
+        """Get the CSS font family name of the renderer's font (the font file name)."""
+        return os.path.splitext(os.path.basename(self.font_path))[0]
+    
+    def font_face_css(self, font_url: str, css_class: str = "tengwar") -> str:
+        """Build the stylesheet declaring the renderer's font as a web font.
+        
+        Serve the font file (font_path) at font_url with long-lived caching
+        headers and include this CSS once per page, or in a shared
+        stylesheet; every snippet from render_html() then only costs its
+        text.
+        
+        Args:
+            font_url (str): URL the font file is served at
+            css_class (str): Class of the snippets (see render_html()).
+                Default: "tengwar"
+            
+        Returns:
+            str: An @font-face rule and the rule of the snippet class
+        
+        Examples:
+            >>> renderer = TengwarRenderer(font_name='alcarin-reg')
+            >>> css = renderer.font_face_css("/static/fonts/AlcarinTengwar-Regular.ttf")
+            >>> # and serve renderer.font_path at that URL
+        """
+        extension = os.path.splitext(self.font_path)[1].lower()
+        font_format = FONT_FORMATS.get(extension, "truetype")
+        family = self.font_family()
+        return (
+            f'@font-face {{ font-family: "{family}"; src: url("{font_url}") format("{font_format}"); '
+            f'font-display: block; }}\n'
+            f'.{css_class} {{ font-family: "{family}"; white-space: pre; }}\n'
+        )
+    
+    def covers(self, text: str) -> bool:
+        """Check whether the renderer's font has a glyph for every character of text.
+        
+        Characters without a glyph render as the font's missing glyph box,
+        which is detected by comparing against a never-assigned code point.
+        Whitespace is always covered.
+        """
+        if not isinstance(self.font, ImageFont.FreeTypeFont):
+            return False
+        coverage = _glyph_coverage.setdefault(self.font, {})
+        for char in set(text):
+            if char.isspace():
+                continue
+            covered = coverage.get(char)
+            if covered is None:
+                covered = coverage[char] = _glyph_signature(self.font, char) != _glyph_signature(self.font, MISSING_CODE_POINT)
+            if not covered:
+                return False
+        return True
+    
+    def render_html(self, text: str,
+                    output: str = "text",
+                    css_class: str = "tengwar",
+                    alt_text: str = "Tengwar text",
+                    **kwargs) -> str:
+        """Render Tengwar text as an HTML snippet.
+        
+        In "text" output the snippet is the transcribed text itself in a
+        span, styled by the web font declared by font_face_css(): no
+        rasterizing or encoding, and pages stay small and selectable. Text
+        the font cannot show (see covers()) falls back to a raster image,
+        as does "image" output.
+        
+        Args:
+            text (str): The Tengwar Unicode text to render
+            output (str): "text" for a web font span, "image" for a base64
+                raster image (see render_html_embed()). Default: "text"
+            css_class (str): Class of the span, matching font_face_css().
+                Default: "tengwar"
+            alt_text (str): Accessible label of the snippet. Default: "Tengwar text"
+            **kwargs: Arguments of render_html_embed() for the raster path
+            
+        Returns:
+            str: HTML span or img tag
+        
+        Raises:
+            ValueError: On an unknown output
+        
+        Examples:
+            >>> renderer = TengwarRenderer(font_size=36)
+            >>> head = f"<style>{renderer.font_face_css('/fonts/FreeMonoTengwar.ttf')}</style>"
+            >>> body = renderer.render_html(tengwar_text, alt_text="Elen síla lúmenn' omentielvo")
+            >>> print(body)
+            <span class="tengwar" style="font-size: 36px" role="img" aria-label="...">...</span>
+        """
+        if output not in HTML_OUTPUTS:
+            raise ValueError(f"Unknown HTML output '{output}', expected one of {', '.join(HTML_OUTPUTS)}")
+        if output == "image" or not self.covers(text):
+            return self.render_html_embed(text, alt_text=html.escape(alt_text), **kwargs)
+        return (f'<span class="{html.escape(css_class)}" style="font-size: {self.font_size}px" role="img" '
+                f'aria-label="{html.escape(alt_text)}">{html.escape(text, quote=False)}</span>')
+
+
+# Defaults of the render_text() options, which are part of render cache keys
+_RENDER_DEFAULTS = {"size": None, "padding": 10, "background_color": "white", "text_color": "black",
+                    "mode": "RGB", "palette_colors": 2}
+
+# Options of the convenience functions that configure the renderer
+RENDERER_OPTIONS = ('font_name', 'font_path', 'font_size', 'layout_engine', 'use_atlas', 'render_cache')
+
+
+def _renderer_from_options(kwargs: Dict[str, Any]) -> TengwarRenderer:
+    """Build a renderer from the renderer options in kwargs, removing them.
+    
+    Renderers are cheap to build: the font comes from the shared font cache.
+    """
+    options = {name: kwargs.pop(name) for name in RENDERER_OPTIONS if name in kwargs}
+    return TengwarRenderer(**options)
 
 
 # Convenience functions for quick usage
@@ -326,7 +815,9 @@ def render_tengwar(text: str, output_path: str, **kwargs) -> None:
     Args:
         text (str): The Tengwar Unicode text to render
         output_path (str): Path to save the image
-        **kwargs: Additional rendering options (font_size, padding, colors, etc.)
+        **kwargs: Renderer options (font_name, font_path, font_size,
+            layout_engine, use_atlas, render_cache) and rendering options (padding,
+            colors, etc.)
     
     Examples:
         >>> from glaemscribe import transcribe
@@ -335,7 +826,7 @@ def render_tengwar(text: str, output_path: str, **kwargs) -> None:
         >>> tengwar = transcribe("aiya", mode="quenya")
         >>> render_tengwar(tengwar, "output.png", font_size=48)
     """
-    renderer = TengwarRenderer()
+    renderer = _renderer_from_options(kwargs)
     renderer.render_to_file(text, output_path, **kwargs)
 
 
@@ -356,7 +847,7 @@ def tengwar_to_image(text: str, **kwargs) -> Image.Image:
         >>> img = tengwar_to_image(tengwar_text, font_size=36)
         >>> img.show()
     """
-    renderer = TengwarRenderer()
+    renderer = _renderer_from_options(kwargs)
     return renderer.render_text(text, **kwargs)
 
 
@@ -377,5 +868,5 @@ def tengwar_to_base64(text: str, **kwargs) -> str:
         >>> b64 = tengwar_to_base64(tengwar_text)
         >>> html = f'<img src="data:image/png;base64,{b64}" />'
     """
-    renderer = TengwarRenderer()
+    renderer = _renderer_from_options(kwargs)
     return renderer.render_to_base64(text, **kwargs)
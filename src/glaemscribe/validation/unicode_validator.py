@@ -3,11 +3,32 @@
 This module provides validation for Unicode characters in Tengwar transcriptions,
 ensuring that output contains only valid character ranges and identifying
 potential issues.
+
+Long texts are validated in bulk: characters are classified through a
+table of code point segments (with NumPy when it is installed, otherwise
+per distinct character) rather than one at a time.
 """
 
-from typing import List, Tuple, Optional
+import re
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+
+# Texts shorter than this are validated character by character
+BULK_THRESHOLD = 64
+
+# Code points where get_character_type() changes (besides allowed_chars)
+TYPE_BOUNDARIES = (0x0020, 0x0021, 0x0080, 0x2000, 0x2070, 0xE000, 0xF900, 0x10000, 0xE0000, 0xF0000)
+
+CHARACTER_TYPES = ('tengwar', 'space', 'punctuation', 'control', 'unknown')
+
 
 @dataclass
 class ValidationResult:
@@ -150,6 +171,10 @@ class UnicodeValidator:
             0x2029,  # Paragraph separator
             0x2E31,  # Word separator (used in some transcriptions)
         }
+        
+        # Segment table of the bulk path, rebuilt when the ranges change
+        self._segments_key = None
+        self._segments = None
     
     def is_in_range(self, char_code: int) -> bool:
         """Check if a character code is in any valid Unicode range.
@@ -212,7 +237,8 @@ class UnicodeValidator:
         
         Checks each character in the text to ensure it's in a valid Unicode
         range for Tengwar transcriptions. Counts character types and identifies
-        potential issues.
+        potential issues. Texts of BULK_THRESHOLD characters or more are
+        classified in bulk, with the same result.
         
         Args:
             text: The transcribed text to validate
@@ -248,14 +274,19 @@ class UnicodeValidator:
             >>> len(result.errors) > 0
             True
         """
+        if not text:
+            return ValidationResult.success(0, 0, 0)
+        if len(text) < BULK_THRESHOLD:
+            return self._validate_characters(text)
+        return self._validate_bulk(text)
+    
+    def _validate_characters(self, text: str) -> ValidationResult:
+        """Validate text one character at a time."""
         errors = []
         warnings = []
         tengwar_count = 0
         punctuation_count = 0
         
-        if not text:
-            return ValidationResult.success(0, 0, 0)
-        
         for i, char in enumerate(text):
             char_code = ord(char)
             char_type = self.get_character_type(char_code)
@@ -295,6 +326,89 @@ class UnicodeValidator:
         
         return ValidationResult.success(len(text), tengwar_count, punctuation_count)
     
+    def _segment_table(self) -> Tuple[List[int], List[Tuple[str, bool]]]:
+        """Get the code point segments and their (character type, valid) classes.
+        
+        Segments start at every boundary of the valid ranges, the allowed
+        characters and the character types, so both are constant over a
+        segment and can be read from its first code point.
+        """
+        key = (tuple(self.valid_ranges.values()), frozenset(self.allowed_chars))
+        if key != self._segments_key:
+            starts = {0}
+            starts.update(TYPE_BOUNDARIES)
+            for start, end in self.valid_ranges.values():
+                starts.update((start, end + 1))
+            for char_code in self.allowed_chars:
+                starts.update((char_code, char_code + 1))
+            starts = sorted(start for start in starts if start <= 0x10FFFF)
+            classes = [(self.get_character_type(start), self.is_in_range(start)) for start in starts]
+            self._segments_key = key
+            self._segments = (starts, classes)
+        return self._segments
+    
+    def _validate_bulk(self, text: str) -> ValidationResult:
+        """Validate text by counting characters per segment class.
+        
+        Gives the same result as _validate_characters(); only characters
+        that produce errors or warnings are located individually.
+        """
+        starts, classes = self._segment_table()
+        type_counts: Dict[str, int] = dict.fromkeys(CHARACTER_TYPES, 0)
+        
+        if numpy is not None:
+            codes = numpy.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+            segment_ids = numpy.searchsorted(numpy.asarray(starts, dtype='<u4'), codes, side='right') - 1
+            counts = numpy.bincount(segment_ids, minlength=len(starts))
+            for segment, count in zip(numpy.flatnonzero(counts).tolist(), counts[counts > 0].tolist()):
+                type_counts[classes[segment][0]] += count
+            reported = numpy.asarray([not valid or (char_type == 'unknown' and start < 0x10000)
+                                      for start, (char_type, valid) in zip(starts, classes)])
+            positions = numpy.flatnonzero(reported[segment_ids]).tolist()
+        else:
+            reported_chars = []
+            for char, count in Counter(text).items():
+                char_code = ord(char)
+                char_type, valid = classes[bisect_right(starts, char_code) - 1]
+                type_counts[char_type] += count
+                if not valid or (char_type == 'unknown' and char_code < 0x10000):
+                    reported_chars.append(char)
+            positions = []
+            if reported_chars:
+                pattern = re.compile('[' + ''.join(re.escape(char) for char in reported_chars) + ']')
+                positions = [match.start() for match in pattern.finditer(text)]
+        
+        errors = []
+        warnings = []
+        for i in positions:
+            char = text[i]
+            char_code = ord(char)
+            char_type, valid = classes[bisect_right(starts, char_code) - 1]
+            if not valid:
+                errors.append(
+                    f"Invalid character at position {i}: "
+                    f"U+{char_code:04X} ({repr(char)}) - {char_type}"
+                )
+            if char_type == 'unknown' and char_code < 0x10000:
+                warnings.append(
+                    f"Unusual character at position {i}: "
+                    f"U+{char_code:04X} ({repr(char)})"
+                )
+        
+        tengwar_count = type_counts['tengwar']
+        punctuation_count = type_counts['punctuation']
+        if tengwar_count == 0 and len(text.strip()) > 0:
+            warnings.append("No Tengwar characters found in output")
+        if '?' in text:
+            warnings.append("Contains fallback '?' characters - possible missing mappings")
+        
+        if errors:
+            return ValidationResult.failure(
+                errors, warnings, len(text), tengwar_count, punctuation_count
+            )
+        
+        return ValidationResult.success(len(text), tengwar_count, punctuation_count)
+    
     def get_validation_summary(self, result: ValidationResult) -> str:
         """Get a human-readable summary of validation results.
         
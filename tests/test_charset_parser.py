@@ -207,3 +207,53 @@ def test_process_sequence_registers_sequence_tokens():
     tokens = parser.charset.sequences["SEQ_NAME"]
     # Tokens from args and text, '?' filtered
     assert tokens == ["A", "B", "C", "D"]
+
+
+def test_duplicate_character_names_are_reported(tmp_path):
+    path = tmp_path / "dupes.cst"
+    path.write_text("\\char e000 TINCO T\n\\char e001 PARMA T\n\\char e002 CALMA CALMA\n", encoding="utf-8")
+    parser = CharsetParser()
+
+    parser.parse(str(path))
+
+    duplicates = [error for error in parser.errors if "already defined" in error.message]
+    assert [(error.line, error.message) for error in duplicates] == [(2, "Character T is already defined at line 1")]
+    # Lookups keep the first definition
+    assert parser._get_character_by_name("T").names == ["TINCO", "T"]
+    assert parser._get_character_by_name("PARMA").code == 0xE001
+    assert parser._get_character_by_name("MISSING") is None
+
+
+def test_load_charset_shares_one_frozen_charset(tmp_path):
+    import pytest
+    from glaemscribe.parsers.charset_parser import load_charset
+
+    path = tmp_path / "shared.cst"
+    path.write_text("\\char e000 TINCO T\n\\char e001 PARMA\n", encoding="utf-8")
+    alias = tmp_path / "alias.cst"
+    alias.symlink_to(path)
+
+    charset = load_charset(str(path))
+    assert load_charset(str(alias)) is charset
+    assert charset.is_frozen()
+    assert charset.get_character("T") == "\ue000"
+    with pytest.raises(TypeError):
+        charset.characters["NEW"] = "x"
+    with pytest.raises(ValueError, match="frozen"):
+        charset.add_swap("TINCO", ["PARMA"])
+
+    # New content, new charset
+    path.write_text("\\char e000 TINCO\n", encoding="utf-8")
+    reloaded = load_charset(str(path))
+    assert reloaded is not charset
+    assert not reloaded.has_character("T")
+
+
+def test_modes_share_their_charsets(mode_parser):
+    from glaemscribe.resources import get_mode_path
+
+    quenya = mode_parser.parse(str(get_mode_path("quenya-tengwar-classical")))
+    sindarin = mode_parser.parse(str(get_mode_path("sindarin-tengwar-general_use")))
+
+    assert quenya.default_charset is sindarin.default_charset
+    assert quenya.default_charset.is_frozen()
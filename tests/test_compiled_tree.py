@@ -0,0 +1,118 @@
+"""Tests for the memory-mapped compiled transcription tree."""
+
+import json
+import os
+
+import pytest
+from glaemscribe.parsers.mode_parser import ModeParser
+from glaemscribe.resources import get_mode_path
+from glaemscribe.core.compiled_tree import (
+    CompiledTranscriptionTree,
+    compiled_tree_key,
+    write_compiled_tree,
+)
+from glaemscribe.core.transcription_tree_node import TranscriptionTreeNode
+
+
+def load_poem_cases():
+    fixture_path = os.path.join(os.path.dirname(__file__), "fixtures", "poem_transcription_canonical.json")
+    with open(fixture_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+QUENYA_PATH = str(get_mode_path("quenya-tengwar-classical"))
+
+
+@pytest.fixture
+def compiled_quenya(tmp_path, quenya_classical_mode):
+    """Compile the shared Quenya tree to a temporary file."""
+    key = compiled_tree_key(QUENYA_PATH, {})
+    path = str(tmp_path / "quenya.gltr")
+    quenya_classical_mode.processor.save_compiled_tree(path, key)
+    return path, key
+
+
+def test_compiled_tree_matches_node_tree_walk(tmp_path):
+    tree = TranscriptionTreeNode()
+    for source, replacement in [("a", ["A"]), ("abc", ["ABC"]), ("b", []), ("ñw", ["NW", "W"])]:
+        tree.add_subpath(source, replacement)
+
+    key = compiled_tree_key(b"synthetic", {})
+    path = str(tmp_path / "synthetic.gltr")
+    write_compiled_tree(tree, path, key)
+
+    with CompiledTranscriptionTree.open(path, expected_key=key) as compiled:
+        token_names = compiled.token_names()
+        for string in ["a", "ab", "abc", "abcd", "b", "c", "", "ñw", "ñ", "xa"]:
+            ids, consumed = compiled.transcribe(string)
+            tokens, expected_consumed = tree.transcribe(string)
+            assert [token_names[i] for i in ids] == list(tokens), string
+            assert consumed == expected_consumed, string
+
+
+def test_processor_transcribes_fixtures_from_compiled_tree(compiled_quenya):
+    path, key = compiled_quenya
+
+    mode = ModeParser().parse(QUENYA_PATH)
+    mode.processor.load_compiled_tree(path, source_key=key)
+    try:
+        for case in load_poem_cases():
+            success, result, _ = mode.transcribe(case["line"])
+            assert success
+            assert result == case["output"], case["line"]
+    finally:
+        mode.processor.transcription_tree.close()
+
+
+def test_compiled_tree_key_depends_on_source_and_options():
+    key = compiled_tree_key(QUENYA_PATH, {})
+
+    assert key == compiled_tree_key(QUENYA_PATH, {})
+    assert key != compiled_tree_key(QUENYA_PATH, {"reverse_numbers": "false"})
+    assert key != compiled_tree_key(str(get_mode_path("sindarin-tengwar-general_use")), {})
+
+
+def test_stale_or_foreign_files_are_rejected(compiled_quenya, tmp_path):
+    path, _ = compiled_quenya
+
+    with pytest.raises(ValueError, match="different mode source"):
+        CompiledTranscriptionTree.open(path, expected_key=compiled_tree_key(QUENYA_PATH, {"x": "y"}))
+
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    data[4] += 1  # Bump the format version
+    bumped = tmp_path / "bumped.gltr"
+    bumped.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="format version"):
+        CompiledTranscriptionTree.open(str(bumped))
+
+    # Damaged payloads: truncated then padded back, extended, overwritten
+    header_size = 4 + 2 + 2 + 32 + 9 * 4
+    original = bytes(data[:4]) + bytes([data[4] - 1]) + bytes(data[5:])
+    for name, damaged, message in [
+        ("padded", original[:-64] + b"\0" * 64, "checksum"),
+        ("extended", original + b"\0" * 4, "truncated or padded"),
+        ("truncated", original[:-4], "truncated or padded"),
+        ("overwritten", original[:header_size + 8] + b"\xff\xff" + original[header_size + 10:], "checksum"),
+    ]:
+        damaged_path = tmp_path / f"{name}.gltr"
+        damaged_path.write_bytes(damaged)
+        with pytest.raises(ValueError, match=message):
+            CompiledTranscriptionTree.open(str(damaged_path))
+
+    garbage = tmp_path / "garbage.gltr"
+    garbage.write_bytes(b"not a tree at all" * 10)
+    with pytest.raises(ValueError, match="not a compiled transcription tree"):
+        CompiledTranscriptionTree.open(str(garbage))
+
+
+def test_regex_engine_is_unavailable_with_compiled_tree(compiled_quenya):
+    path, key = compiled_quenya
+
+    mode = ModeParser().parse(QUENYA_PATH)
+    mode.processor.load_compiled_tree(path, source_key=key)
+    try:
+        with pytest.raises(ValueError, match="regex engine"):
+            mode.processor.set_engine("regex")
+    finally:
+        mode.processor.transcription_tree.close()
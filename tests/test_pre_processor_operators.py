@@ -0,0 +1,217 @@
+"""Tests for the pre-processor operators of parsed modes."""
+
+import json
+import os
+import random
+import re
+
+import pytest
+from glaemscribe.parsers.glaeml import Node
+from glaemscribe.parsers.mode_parser import ModeParser
+from glaemscribe.resources import get_mode_path
+from glaemscribe.core.pre_processor_operators import (
+    FusedSubstitutePreProcessorOperator,
+    RxSubstitutePreProcessorOperator,
+    SubstitutePreProcessorOperator,
+    fuse_substitutions,
+    pattern_is_line_safe,
+    pattern_required_chars,
+)
+
+
+MODE_NAMES = [
+    "quenya-tengwar-classical",
+    "sindarin-tengwar-general_use",
+    "sindarin-tengwar-beleriand",
+    "english-tengwar-espeak",
+]
+
+
+def load_fixture_lines():
+    """All canonical fixture lines."""
+    fixtures_dir = os.path.join(os.path.dirname(__file__), "fixtures")
+    lines = []
+    for name in ("poem_transcription_canonical.json", "sindarin_transcription_canonical.json"):
+        with open(os.path.join(fixtures_dir, name), "r", encoding="utf-8") as f:
+            lines.extend(case["line"] for case in json.load(f))
+    return lines
+
+
+def sequential_apply(pre_processor, text):
+    """Apply every operator in turn, without any fusion."""
+    for operator in pre_processor.operators:
+        text = operator.apply(text)
+    return text
+
+
+def substitute(source, target):
+    node = Node(0, "substitute", "substitute")
+    node.args = [source, target]
+    return SubstitutePreProcessorOperator(None, node)
+
+
+def operator_chars(pre_processor):
+    """Characters appearing in the operator arguments (to build hard inputs)."""
+    chars = set()
+    for operator in pre_processor.operators:
+        for arg in operator.glaeml_element.args:
+            chars.update(arg)
+    return sorted(chars)
+
+
+@pytest.mark.parametrize("mode_name", MODE_NAMES)
+def test_fused_pre_processor_matches_sequential_operators(mode_name):
+    pre_processor = ModeParser().parse(str(get_mode_path(mode_name))).pre_processor
+
+    alphabet = operator_chars(pre_processor) + list("abc -·\n")
+    rng = random.Random(31)
+    lines = [line.lower() for line in load_fixture_lines()]
+    lines += ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(500)]
+
+    for line in lines:
+        assert pre_processor.apply(line) == sequential_apply(pre_processor, line), repr(line)
+
+
+def test_interacting_substitutions_are_not_fused():
+    operators = [
+        substitute("-", "·"),
+        substitute("-", "|"),   # Shares its source with the previous one
+        substitute("ä", "a"),
+        substitute("ë", "e"),
+        substitute("ae", "æ"),  # Can match the output of the previous ones
+        substitute("·", ""),
+        substitute("xy", "z"),  # Can be joined by the deletion before it
+    ]
+
+    steps = fuse_substitutions(operators)
+
+    assert steps[0] is operators[0]
+    assert isinstance(steps[1], FusedSubstitutePreProcessorOperator)
+    assert [source for source, _ in steps[1].substitutions] == ["-", "ä", "ë"]
+    assert isinstance(steps[2], FusedSubstitutePreProcessorOperator)
+    assert [source for source, _ in steps[2].substitutions] == ["ae", "·"]
+    assert steps[3] is operators[6]
+
+    for text in ["ä-ë", "x·y", "aë-", "-x-·-y-"]:
+        expected = text
+        for operator in operators:
+            expected = operator.apply(expected)
+        result = text
+        for step in steps:
+            result = step.apply(result)
+        assert result == expected, text
+
+
+def ruby_style_rx_substitute(pattern, replacement, text):
+    """The original per-call implementation of rxsubstitute."""
+    def replace_func(match):
+        result = replacement
+        for i, group in enumerate(match.groups(), 1):
+            result = result.replace(f"\\{i}", group)
+        return result
+
+    return re.compile(pattern).sub(replace_func, text)
+
+
+@pytest.mark.parametrize("mode_name", MODE_NAMES)
+def test_compiled_rx_substitutions_match_per_call_expansion(mode_name):
+    pre_processor = ModeParser().parse(str(get_mode_path(mode_name))).pre_processor
+    rx_operators = [op for op in pre_processor.operators if isinstance(op, RxSubstitutePreProcessorOperator)]
+    assert rx_operators
+
+    alphabet = operator_chars(pre_processor) + list("abc .,!\n")
+    rng = random.Random(32)
+    lines = [line.lower() for line in load_fixture_lines()]
+    lines += ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(300)]
+
+    for operator in rx_operators:
+        pattern, replacement = operator.glaeml_element.args
+        for line in lines:
+            assert operator.apply(line) == ruby_style_rx_substitute(pattern, replacement, line), (pattern, line)
+
+
+def test_expansion_template_keeps_literal_backslashes():
+    template = RxSubstitutePreProcessorOperator.expansion_template
+
+    assert template("j\\1", 1) == "j\\g<1>"
+    assert template("\\1 \\2\\3", 2) == "\\g<1> \\g<2>\\\\3"
+    assert template("a\\b", 0) == "a\\\\b"
+    assert re.sub("(x)", template("[\\1\\n]", 1), "x") == "[x\\n]"
+
+
+@pytest.mark.parametrize("pattern,expected", [
+    ("(ā|â|aa)", "aâā"),
+    ("\\bi([aeo])", "i"),
+    ("[ɜɚ]ː?", "ɚɜ"),
+    ("(^|[^a-z])(ð[aæ]t)(ð[əɪ])($|[^a-z])", "ð"),
+    ("([^\\s])([.,;:!?])", "!,.:;?"),
+    ("a{0,2}b", "b"),
+    ("[a-c]+", "abc"),
+    ("x?", None),
+    ("[^x]", None),
+    ("(?i)ab", None),
+])
+def test_pattern_required_chars(pattern, expected):
+    required = pattern_required_chars(re.compile(pattern))
+
+    if expected is None:
+        assert required is None
+    else:
+        assert "".join(sorted(required)) == expected
+
+
+def test_operators_without_required_chars_are_skipped():
+    pre_processor = ModeParser().parse(str(get_mode_path("quenya-tengwar-classical"))).pre_processor
+    applied = []
+    for operator in pre_processor.plan():
+        original_apply = operator.apply
+        operator.apply = lambda text, original_apply=original_apply, operator=operator: (
+            applied.append(operator) or original_apply(text))
+
+    assert pre_processor.apply("hello world") == "hello world"
+    plan = pre_processor.plan()
+    assert applied == [plan[2], plan[4]]  # Only the "e" and "o" vowel operators can fire
+
+    applied.clear()
+    assert pre_processor.apply("quë") == "qe"
+    assert len(applied) == 4  # Diaereses, "e" and "u" vowels, "qu"
+
+
+@pytest.mark.parametrize("pattern,expected", [
+    ("(ā|â|aa)", True),
+    ("\\bi([aeo])", True),
+    ("([^\\s])([.,;:!?])", True),
+    ("a.b", True),
+    ("(a)\\1", True),
+    ("(^|[^a-z])(ð[aæ]t)", False),  # Anchor and negated class
+    ("a$", False),
+    ("[^a]", False),
+    ("\\s", False),
+    ("(?s)a.b", False),
+    ("(?<=a)b", False),
+    ("x*", False),  # Empty matches happen at each line start
+])
+def test_pattern_is_line_safe(pattern, expected):
+    assert pattern_is_line_safe(re.compile(pattern)) is expected
+
+
+@pytest.mark.parametrize("mode_name", MODE_NAMES)
+def test_whole_document_pre_processing_matches_per_line(mode_name):
+    pre_processor = ModeParser().parse(str(get_mode_path(mode_name))).pre_processor
+
+    alphabet = operator_chars(pre_processor) + list("abc .,!\n\n")
+    rng = random.Random(34)
+    fixture_lines = [line.lower() for line in load_fixture_lines()]
+    documents = ["\n".join(fixture_lines), "", "\n", "\n\na\n"]
+    documents += ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80))) for _ in range(300)]
+
+    for document in documents:
+        expected = [pre_processor.apply(line) for line in document.split("\n")]
+        assert pre_processor.apply_lines(document) == expected, repr(document)
+
+
+def test_multiline_transcription_matches_line_by_line(quenya_classical_mode):
+    lines = load_fixture_lines()[:20]
+    expected = "\n".join(quenya_classical_mode.transcribe(line)[1] for line in lines)
+
+    assert quenya_classical_mode.transcribe("\n".join(lines))[1] == expected
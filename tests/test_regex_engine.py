@@ -0,0 +1,124 @@
+"""Differential tests for the regex-compiled matching engine.
+
+The regex engine must produce exactly the same tokens as the
+TranscriptionTreeNode walk. Both engines are run on the canonical poem
+and Sindarin fixtures, and on every rule source of the modes.
+"""
+
+import json
+import os
+
+import pytest
+from glaemscribe.parsers.mode_parser import ModeParser
+from glaemscribe.resources import get_mode_path
+from glaemscribe.core.transcription_processor import TranscriptionProcessor
+from glaemscribe.core.transcription_regex_engine import RegexTranscriptionEngine
+from glaemscribe.core.transcription_tree_node import TranscriptionTreeNode
+
+
+def load_fixture(name):
+    """Load a canonical fixture JSON file."""
+    fixture_path = os.path.join(os.path.dirname(__file__), "fixtures", name)
+    with open(fixture_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+CANONICAL_CASES = [
+    ("quenya-tengwar-classical", case["line"], case["output"])
+    for case in load_fixture("poem_transcription_canonical.json")
+] + [
+    (case["mode"], case["line"], case["output"])
+    for case in load_fixture("sindarin_transcription_canonical.json")
+]
+
+_modes = {}
+
+
+def load_mode(mode_name):
+    """Parse and finalize a private mode instance (engines are switched on it)."""
+    if mode_name not in _modes:
+        mode = ModeParser().parse(str(get_mode_path(mode_name)))
+        mode.processor.finalize({})
+        _modes[mode_name] = mode
+    return _modes[mode_name]
+
+
+def transcribe_tokens(processor, text, engine):
+    """Run the processor alone with the given engine."""
+    processor.set_engine(engine)
+    try:
+        return processor.transcribe(text)
+    finally:
+        processor.set_engine("tree")
+
+
+@pytest.mark.parametrize("mode_name,line,expected", CANONICAL_CASES)
+def test_regex_engine_matches_tree_on_fixtures(mode_name, line, expected):
+    mode = load_mode(mode_name)
+
+    text = mode.pre_processor.apply(line.lower())
+    tree_tokens = transcribe_tokens(mode.processor, text, "tree")
+    regex_tokens = transcribe_tokens(mode.processor, text, "regex")
+    assert regex_tokens == tree_tokens
+
+    mode.processor.set_engine("regex")
+    try:
+        success, result, _ = mode.transcribe(line)
+    finally:
+        mode.processor.set_engine("tree")
+    assert success
+    assert result == expected
+
+
+@pytest.mark.parametrize("mode_name", [
+    "quenya-tengwar-classical",
+    "sindarin-tengwar-general_use",
+    "sindarin-tengwar-beleriand",
+])
+def test_regex_engine_matches_tree_on_rule_sources(mode_name):
+    mode = load_mode(mode_name)
+    processor = mode.processor
+
+    # Every source, plus truncated and mangled variants to exercise backtracking
+    words = set()
+    for source in processor.paths:
+        word = source.strip(TranscriptionProcessor.WORD_BOUNDARY_TREE)
+        if word:
+            words.add(word)
+            words.add(word[:-1] + "#")
+            words.add(word + word[:1])
+
+    for word in sorted(words):
+        assert transcribe_tokens(processor, word, "regex") == transcribe_tokens(processor, word, "tree"), word
+
+
+def test_regex_engine_handles_sources_outside_every_group():
+    # "ñ" only appears inside a multi-character source, so words made of it
+    # belong to no group but can still match that source in the tree
+    paths = {"\u0000": [""], "|": [""], "a": ["A"], "ab": ["AB"], "abc": ["ABC"], "ññ": ["N"]}
+    in_charset = {"a": "g", "b": "g", "c": "g", "ññ": "g"}
+
+    tree = TranscriptionTreeNode()
+    for source, replacement in paths.items():
+        tree.add_subpath(source, replacement)
+    engine = RegexTranscriptionEngine()
+    engine.build(paths, in_charset)
+
+    def tree_word(word):
+        tokens = []
+        while word:
+            replacement, consumed = tree.transcribe(word)
+            tokens.extend(replacement)
+            word = word[consumed:]
+        return tokens
+
+    for word, group in [("abab", "g"), ("abcab", "g"), ("bca", "g"), ("ññ", None), ("ñ?ñ", None)]:
+        bounded = "\u0000" + word + "\u0000"
+        assert engine.transcribe_word(bounded, group) == tree_word(bounded), word
+
+
+def test_unknown_engine_raises_value_error():
+    mode = load_mode("quenya-tengwar-classical")
+
+    with pytest.raises(ValueError, match="Unknown matching engine"):
+        mode.processor.set_engine("dfa")
@@ -1,6 +1,7 @@
 """Tests for glaemscribe.render.renderer."""
 
 import base64
+import os
 
 from glaemscribe.render.renderer import (
     TengwarRenderer,
@@ -53,3 +54,333 @@ def test_convenience_wrappers(tmp_path):
     b64_string = tengwar_to_base64("vala")
     assert isinstance(b64_string, str)
     assert len(b64_string) > 0
+
+
+def test_renderers_share_cached_fonts():
+    from glaemscribe.render.font_cache import clear_font_cache, font_cache_stats
+
+    clear_font_cache()
+    first = TengwarRenderer(font_size=21)
+    second = TengwarRenderer(font_size=21)
+    other_size = TengwarRenderer(font_size=22)
+
+    assert first.font is second.font
+    assert other_size.font is not first.font
+    stats = font_cache_stats()
+    assert (stats.hits, stats.misses, stats.fonts) == (1, 2, 2)
+
+    # Convenience functions take renderer options and reuse the cache
+    tengwar_to_image("aiya", font_size=21, padding=2)
+    assert font_cache_stats().hits == 2
+
+
+def test_font_cache_evicts_least_recently_used():
+    import os
+    import pytest
+    from glaemscribe.render.font_cache import FontCache
+
+    path = TengwarRenderer().font_path
+    cache = FontCache(max_fonts=2)
+    small = cache.get(path, 10)
+    cache.get(path, 11)
+    assert cache.get(path, 10) is small
+    cache.get(path, 12)  # Evicts size 11
+
+    stats = cache.stats()
+    assert (stats.fonts, stats.evictions) == (2, 1)
+    assert stats.bytes == 2 * os.path.getsize(path)
+    assert cache.get(path, 10) is small
+    assert cache.stats().misses == 3
+
+    # The memory cap keeps at least the latest font
+    cache.set_limits(max_bytes=1)
+    assert cache.stats().fonts == 1
+    with pytest.raises(ValueError, match="at least one font"):
+        cache.set_limits(max_fonts=0)
+    with pytest.raises(OSError):
+        cache.get("missing.ttf", 10)
+
+
+def test_atlas_rendering_matches_direct_rendering():
+    import random
+    from PIL import ImageChops
+    from glaemscribe import transcribe
+    from glaemscribe.render.glyph_atlas import get_glyph_atlas
+
+    tengwar = transcribe("elen síla lúmenn omentielvo ai laurië lantar lassi súrinen yéni únótimë")
+    alphabet = sorted(set(tengwar)) + ["a", "c"]
+    rng = random.Random(42)
+
+    for font_name in ("freemono", "alcarin-bold"):
+        direct = TengwarRenderer(font_name=font_name, font_size=24)
+        atlas = TengwarRenderer(font_name=font_name, font_size=24, use_atlas=True)
+        texts = [tengwar, ""] + ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 15))) for _ in range(40)]
+        for text in texts:
+            options = {"padding": 4, "text_color": "#203040"}
+            expected = direct.render_text(text, **options)
+            image = atlas.render_text(text, **options)
+            assert image.size == expected.size
+            # Only antialiasing rounding where glyphs overlap
+            assert max(high for _, high in ImageChops.difference(image, expected).getextrema()) <= 4, text
+
+        assert len(get_glyph_atlas(atlas.font)) <= len(alphabet)
+
+    # Multi-line text is always rendered directly
+    atlas = TengwarRenderer(font_size=24, use_atlas=True)
+    assert atlas.render_text(tengwar + "\n" + tengwar) == TengwarRenderer(font_size=24).render_text(tengwar + "\n" + tengwar)
+
+
+def test_layout_wraps_aligns_and_caches_lines():
+    import pytest
+    from glaemscribe import transcribe
+    from glaemscribe.render.layout import get_line_measurer
+
+    renderer = TengwarRenderer(font_size=24)
+    text = transcribe("ai laurië lantar lassi súrinen\nyéni únótimë ve rámar aldaron")
+
+    layout = renderer.layout(text, max_width=150, align="right")
+    texts = [line.text for line in layout.lines]
+    # Wrapped on spaces only, and nothing is lost
+    assert " ".join(texts) == text.replace("\n", " ")
+    assert len(texts) > 2
+    measurer = get_line_measurer(renderer.font)
+    for line in layout.lines:
+        assert measurer.width(line.text) <= 150
+        assert line.x + line.bbox[2] == layout.width  # Right aligned
+    assert [line.y for line in layout.lines] == sorted(line.y for line in layout.lines)
+
+    # Laying out again measures nothing, and an edit only the changed line
+    misses = measurer.misses
+    renderer.layout(text, max_width=150, align="right")
+    assert measurer.misses == misses
+    renderer.layout(text)
+    misses = measurer.misses
+    renderer.layout(text.split("\n")[0] + "\n" + transcribe("namárië"))
+    assert measurer.misses == misses + 1
+
+    # A word wider than a line is cut, keeping tehtas with their carrier
+    long_word = transcribe("únótimë" * 4)
+    cut = renderer.layout(long_word, max_width=60).lines
+    assert "".join(line.text for line in cut) == long_word
+    for line in cut:
+        assert renderer.font.getlength(line.text[0]) > 0
+
+    image = renderer.render_document(text, max_width=150, align="center", padding=5)
+    assert image.size == (layout.width + 10, layout.height + 10)
+
+    with pytest.raises(ValueError, match="Unknown alignment"):
+        renderer.layout(text, align="justify")
+
+
+def test_render_pages_streams_requested_pages():
+    import io
+    import pytest
+    from PIL import Image
+    from glaemscribe import transcribe
+    from glaemscribe.render.layout import paginate
+
+    renderer = TengwarRenderer(font_size=16)
+    text = "\n".join([transcribe("ai laurië lantar lassi súrinen yéni únótimë ve rámar aldaron")] * 30)
+
+    layout = renderer.layout(text, max_width=200 - 20)
+    page_layouts = paginate(layout, 120 - 20)
+    assert len(page_layouts) > 3
+    assert sum(len(page.lines) for page in page_layouts) == len(layout.lines)
+    assert all(page.height <= 100 for page in page_layouts)
+
+    all_pages = list(renderer.render_pages(text, page_size=(200, 120)))
+    assert len(all_pages) == len(page_layouts)
+    assert Image.open(io.BytesIO(all_pages[0])).size == (200, 120)
+
+    # A page range renders the same bytes as the full run
+    requested = list(renderer.render_pages(text, page_size=(200, 120), pages=[2, 1, 999]))
+    assert requested == [all_pages[2], all_pages[1]]
+
+    assert len(list(renderer.render_pages("", page_size=(200, 120)))) == 1
+    with pytest.raises(ValueError, match="no room"):
+        next(renderer.render_pages(text, page_size=(15, 120)))
+
+
+def test_render_cache_serves_repeated_renders(tmp_path):
+    from glaemscribe.render.render_cache import RenderCache
+
+    cache = RenderCache(directory=str(tmp_path / "renders"))
+    renderer = TengwarRenderer(font_size=18, render_cache=cache)
+    text = "elen sila"
+
+    first = renderer.render_to_bytes(text, padding=5)
+    renderer.render_text = None  # A hit must not rasterize again
+    assert renderer.render_to_bytes(text, padding=5) == first
+    assert base64.b64decode(renderer.render_to_base64(text, padding=5)) == first
+    assert cache.stats().memory_hits == 2
+
+    # Options are part of the key
+    other = TengwarRenderer(font_size=18, render_cache=cache)
+    assert other.render_to_bytes(text, padding=6) != first
+    assert TengwarRenderer(font_size=20, render_cache=cache).render_to_bytes(text, padding=5) != first
+
+    # The directory tier outlives the memory tier
+    restarted = RenderCache(directory=str(tmp_path / "renders"))
+    fresh = TengwarRenderer(font_size=18, render_cache=restarted)
+    fresh.render_text = None
+    assert fresh.render_to_bytes(text, padding=5) == first
+    assert restarted.stats().disk_hits == 1
+
+
+def test_render_cache_tiers_stay_within_their_caps(tmp_path):
+    import os
+    import time
+    from glaemscribe.render.render_cache import RenderCache
+
+    cache = RenderCache(max_bytes=25, directory=str(tmp_path), max_disk_bytes=25)
+    for index in range(4):
+        cache.put(f"key{index}", bytes(10))
+        # Distinct modification times, so that eviction order is well defined
+        os.utime(cache._path(f"key{index}"), ns=(time.time_ns(), index * 10**9))
+
+    stats = cache.stats()
+    assert stats.memory_entries == 2 and stats.memory_bytes == 20
+    assert stats.disk_bytes == 20
+    assert sorted(os.listdir(tmp_path)) == ["key2.render", "key3.render"]
+    assert cache.get("key0") is None
+    assert cache.get("key3") == bytes(10)
+
+    cache.put("huge", bytes(100))  # Larger than both caps: not stored
+    assert cache.get("huge") is None
+
+
+def test_render_many_streams_results_in_order(tmp_path):
+    import pytest
+
+    renderer = TengwarRenderer(font_size=16)
+    texts = ["aiya", "elen sila", "namárië", "lumenn", "omentielvo"] * 3
+    items = [text if index % 2 else (text, {"padding": 4}) for index, text in enumerate(texts)]
+    expected = [renderer.render_to_bytes(text, padding=10 if index % 2 else 4) for index, text in enumerate(texts)]
+
+    results = list(renderer.render_many(items, workers=3))
+    assert results == list(enumerate(expected))
+
+    received = {}
+    assert renderer.render_many([("aiya", {"filename": "aiya.png"}), "sila"], output_dir=str(tmp_path / "out"),
+                                callback=received.__setitem__, workers=2) is None
+    assert received == {0: str(tmp_path / "out" / "aiya.png"), 1: str(tmp_path / "out" / "000001.png")}
+    assert (tmp_path / "out" / "aiya.png").read_bytes() == renderer.render_to_bytes("aiya")
+
+    # Arguments are checked and the directory created before iterating
+    with pytest.raises(ValueError, match="workers"):
+        renderer.render_many(texts, workers=0)
+    renderer.render_many(texts, output_dir=str(tmp_path / "eager"), workers=1)
+    assert (tmp_path / "eager").is_dir()
+
+
+def test_render_many_accepts_per_item_formats(tmp_path):
+    import io
+    from PIL import Image
+
+    renderer = TengwarRenderer(font_size=16)
+    items = ["aiya", ("elen sila", {"format": "JPEG"}), ("namárië", {"format": "WEBP", "padding": 4})]
+
+    results = list(renderer.render_many(items, workers=2))
+    assert [Image.open(io.BytesIO(data)).format for _, data in results] == ["PNG", "JPEG", "WEBP"]
+    assert results[1][1] == renderer.render_to_bytes("elen sila", format="JPEG")
+
+    paths = [path for _, path in renderer.render_many(items, output_dir=str(tmp_path), workers=2, format="GIF")]
+    assert [os.path.basename(path) for path in paths] == ["000000.gif", "000001.jpeg", "000002.webp"]
+    assert [Image.open(path).format for path in paths] == ["GIF", "JPEG", "WEBP"]
+
+
+def test_render_many_with_processes(tmp_path):
+    from glaemscribe.render.render_cache import RenderCache
+
+    cache = RenderCache(directory=str(tmp_path / "cache"))
+    renderer = TengwarRenderer(font_size=16, render_cache=cache)
+    texts = ["aiya", "elen sila", "namárië"]
+
+    results = list(renderer.render_many(texts, output_dir=str(tmp_path / "out"), workers=2, use_processes=True))
+
+    assert [index for index, _ in results] == [0, 1, 2]
+    # The workers filled the shared directory tier of the cache
+    assert len(list((tmp_path / "cache").iterdir())) == len(texts)
+    for (_, path), text in zip(results, texts):
+        with open(path, "rb") as f:
+            assert f.read() == renderer.render_to_bytes(text)
+    assert cache.stats().disk_hits == len(texts)
+
+
+def test_compact_output_modes():
+    import io
+    import pytest
+    from PIL import Image
+
+    renderer = TengwarRenderer(font_size=24)
+    text = "elen sila lumenn omentielvo"
+    rgb = renderer.render_text(text)
+
+    gray = renderer.render_text(text, mode="L")
+    assert gray.mode == "L" and gray.size == rgb.size
+    assert gray.getextrema() == (0, 255)
+
+    rgba = renderer.render_text(text, mode="RGBA", text_color="#336699")
+    assert rgba.getpixel((0, 0)) == (0x33, 0x66, 0x99, 0)
+    assert rgba.getchannel("A").getextrema() == (0, 255)
+
+    palette = renderer.render_text(text, mode="P", background_color="white", text_color="navy")
+    assert palette.mode == "P"
+    assert {color for _, color in palette.convert("RGB").getcolors()} == {(255, 255, 255), (0, 0, 128)}
+    assert len(renderer.render_text(text, mode="P", palette_colors=4).getcolors()) <= 4
+
+    bilevel = renderer.render_text(text, mode="1")
+    assert bilevel.mode == "1" and set(bilevel.getdata()) == {0, 255}
+
+    document = "\n".join([text] * 8)
+    sizes = {mode: len(renderer.render_to_bytes(document, mode=mode, encoder_options={"optimize": True}))
+             for mode in ("RGB", "L", "P")}
+    assert sizes["P"] < sizes["L"] < sizes["RGB"]
+    assert Image.open(io.BytesIO(renderer.render_to_bytes(text, format="WEBP", mode="L",
+                                                          encoder_options={"lossless": True}))).format == "WEBP"
+
+    with pytest.raises(ValueError, match="Unknown output mode"):
+        renderer.render_text(text, mode="CMYK")
+    with pytest.raises(ValueError, match="palette_colors"):
+        renderer.render_text(text, mode="P", palette_colors=1)
+
+
+def test_render_html_emits_web_font_text_with_raster_fallback():
+    import pytest
+    from glaemscribe import transcribe
+
+    renderer = TengwarRenderer(font_name="alcarin-reg", font_size=30)
+    tengwar = transcribe("Elen síla lúmenn' omentielvo")
+
+    css = renderer.font_face_css("/fonts/AlcarinTengwar-Regular.ttf")
+    assert '@font-face { font-family: "AlcarinTengwar-Regular"; src: url("/fonts/AlcarinTengwar-Regular.ttf") ' \
+           'format("truetype")' in css
+    assert '.tengwar { font-family: "AlcarinTengwar-Regular";' in css
+
+    snippet = renderer.render_html(tengwar, alt_text='Elen "síla"')
+    assert snippet == (f'<span class="tengwar" style="font-size: 30px" role="img" '
+                       f'aria-label="Elen &quot;síla&quot;">{tengwar}</span>')
+
+    # Characters missing from the font fall back to a raster image
+    assert renderer.covers(tengwar)
+    assert not renderer.covers(tengwar + "中")
+    assert renderer.render_html(tengwar + "中").startswith('<img src="data:image/png;base64,')
+    assert renderer.render_html(tengwar, output="image") == renderer.render_html_embed(tengwar, alt_text="Tengwar text")
+
+    with pytest.raises(ValueError, match="Unknown HTML output"):
+        renderer.render_html(tengwar, output="svg")
+
+
+def test_rgb_rendering_draws_text_directly():
+    from PIL import Image, ImageDraw
+
+    renderer = TengwarRenderer(font_name="alcarin-bold", font_size=48)
+    text = "elen sila\nlumenn omentielvo"
+
+    image = renderer.render_text(text, background_color="#123456", text_color="gold", padding=7)
+
+    bbox = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox((0, 0), text, font=renderer.font)
+    expected = Image.new("RGB", image.size, "#123456")
+    ImageDraw.Draw(expected).text(((image.width - bbox[2] + bbox[0]) // 2, (image.height - bbox[3] + bbox[1]) // 2),
+                                  text, font=renderer.font, fill="gold")
+    assert image.tobytes() == expected.tobytes()
@@ -0,0 +1,81 @@
+"""Tests for the run-based input segmentation of the processor."""
+
+import random
+
+import pytest
+
+
+def reference_segmentation(processor, text):
+    """Character-by-character word splitting (the original algorithm)."""
+    result = []
+    current_group = None
+    accumulated_word = ""
+
+    for char in text:
+        if char in (" ", "\t"):
+            result.extend(processor._transcribe_word(accumulated_word, None, current_group))
+            result.append(processor.token_table.get("*SPACE"))
+            accumulated_word = ""
+        elif char == "\r":
+            continue
+        elif char == "\n":
+            result.extend(processor._transcribe_word(accumulated_word, None, current_group))
+            result.append(processor.token_table.get("*LF"))
+            accumulated_word = ""
+        else:
+            char_group = processor.in_charset.get(char)
+            if char_group == current_group:
+                accumulated_word += char
+            else:
+                result.extend(processor._transcribe_word(accumulated_word, None, current_group))
+                current_group = char_group
+                accumulated_word = char
+
+    result.extend(processor._transcribe_word(accumulated_word, None, current_group))
+    return result
+
+
+@pytest.mark.parametrize("mode_fixture", ["quenya_classical_mode", "sindarin_general_mode"])
+def test_segmentation_matches_character_scan(mode_fixture, request):
+    processor = request.getfixturevalue(mode_fixture).processor
+
+    group_chars = sorted(char for char in processor.in_charset if len(char) == 1)
+    alphabet = group_chars + [" ", "\t", "\r", "\n", "ñ", "日", "-", "]", "\\", "^"]
+    rng = random.Random(29)
+
+    cases = ["", " ", "\r\n", "a\rb", "ai ya\tnamárië\n", " \t  ", "日本 aiya"]
+    cases += ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40))) for _ in range(300)]
+
+    for text in cases:
+        assert processor.transcribe_ids(text) == reference_segmentation(processor, text), repr(text)
+
+
+def test_untranscribable_runs_follow_policy(mode_parser):
+    from glaemscribe.resources import get_mode_path
+
+    mode = mode_parser.parse(str(get_mode_path("quenya-tengwar-classical")))
+    mode.processor.finalize({})
+    processor = mode.processor
+
+    _, expected, _ = mode.transcribe("aiya 日本語 namárië")
+    assert "???" in expected
+
+    runs = []
+    ids = processor.transcribe_ids(mode.pre_processor.apply("aiya 日本語 namárië"), runs=runs)
+    assert ids.count(processor.token_table.get("*UNKNOWN_RUN")) == 1
+    assert runs == ["???"]
+
+    # The word breaker belongs to no group but is a rule source, so a word
+    # containing it is not an untranscribable run
+    for word in ["日|", "|日", "日|日", "a|日"]:
+        assert processor.transcribe_ids(word, runs=[]) == reference_segmentation(processor, word)
+
+    processor.set_unknown_run_policy("passthrough")
+    assert mode.transcribe("aiya 日本語 namárië")[1] == expected.replace("???", "日本語")
+    processor.set_unknown_run_policy("drop")
+    assert mode.transcribe("aiya 日本語 namárië")[1] == expected.replace("???", "")
+    processor.set_unknown_run_policy("replace")
+    assert mode.transcribe("aiya 日本語 namárië")[1] == expected
+
+    with pytest.raises(ValueError, match="Unknown run policy"):
+        processor.set_unknown_run_policy("ignore")
@@ -0,0 +1,238 @@
+"""Tests for token interning and the token-ID post-processing path."""
+
+import itertools
+import random
+
+import pytest
+from glaemscribe.parsers.charset_parser import CharsetParser, VirtualChar, VirtualClass
+from glaemscribe.core.token_table import TokenTable, CharsetTokenTables, charset_outputs
+from glaemscribe.core.post_processor import TranscriptionPostProcessor, ResolveVirtualsPostProcessorOperator
+
+
+SYNTHETIC_CHARSET = """\\char e000 TINCO T
+\\char e001 PARMA
+\\char e002 A_SMALL
+\\char e003 A_BIG
+\\char e004 OTHER
+\\sequence SEQ TINCO A_VIRT
+\\swap OTHER TINCO PARMA
+\\beg virtual A_VIRT
+  \\class A_SMALL TINCO
+  \\class A_BIG PARMA
+\\end
+"""
+
+
+@pytest.fixture
+def synthetic_charset(tmp_path):
+    """A charset with sequences, swaps and virtuals in both directions."""
+    path = tmp_path / "synthetic.cst"
+    path.write_text(SYNTHETIC_CHARSET, encoding="utf-8")
+    parser = CharsetParser()
+    charset = parser.parse(str(path))
+
+    reversed_virtual = VirtualChar(line=0, names=["R_VIRT"], classes=[VirtualClass("A_BIG", ["TINCO"])],
+                                   charset=parser, reversed=True)
+    reversed_virtual.finalize()
+    charset.virtual_chars["R_VIRT"] = reversed_virtual
+    return charset
+
+
+def make_post_processor():
+    post_processor = TranscriptionPostProcessor(None)
+    post_processor.operators.append(ResolveVirtualsPostProcessorOperator(None))
+    return post_processor
+
+
+def test_reserved_tokens_have_fixed_ids():
+    table = TokenTable()
+
+    assert table.get("*UNKNOWN") == TokenTable.UNKNOWN
+    assert table.get("*SPACE") == TokenTable.SPACE
+    assert table.get("*LF") == TokenTable.LF
+    assert table.intern("TINCO") == len(TokenTable.RESERVED)
+    assert table.intern("TINCO") == len(TokenTable.RESERVED)
+    assert table.names_of(table.intern_all(["PARMA", "TINCO"])) == ["PARMA", "TINCO"]
+
+    rebuilt = TokenTable.from_names(table.names)
+    assert rebuilt.names == table.names
+    with pytest.raises(ValueError, match="reserved tokens"):
+        TokenTable.from_names(["TINCO"])
+
+
+def test_charset_tables_cover_charset_vocabulary(synthetic_charset):
+    table = TokenTable()
+    tables = CharsetTokenTables(table, synthetic_charset)
+
+    assert tables.is_current()
+    assert tables.outputs[table.get("PARMA")] == "\ue001"
+    assert tables.sequences[table.get("SEQ")] == table.intern_all(["TINCO", "A_VIRT"])
+    assert tables.virtual_index[table.get("A_VIRT")] != tables.virtual_index[table.get("R_VIRT")]
+
+    table.intern("NOT_IN_CHARSET")
+    assert not tables.is_current()
+
+
+def test_id_path_matches_string_path(synthetic_charset):
+    vocabulary = ["TINCO", "T", "PARMA", "A_VIRT", "R_VIRT", "OTHER", "SEQ",
+                  "*SPACE", "*LF", "*UNKNOWN", "", "\\", "NOT_IN_CHARSET"]
+    string_post_processor = make_post_processor()
+    id_post_processor = make_post_processor()
+    table = TokenTable()
+
+    cases = [list(tokens) for tokens in itertools.product(vocabulary[:7], repeat=3)]
+    rng = random.Random(1)
+    cases += [[rng.choice(vocabulary) for _ in range(rng.randint(0, 20))] for _ in range(500)]
+
+    # Both virtual directions and the sequence expansion resolve
+    assert string_post_processor.apply(["SEQ", "*SPACE", "R_VIRT", "TINCO"], synthetic_charset) == "\ue000\ue002 \ue003\ue000"
+
+    for tokens in cases:
+        expected = string_post_processor.apply(list(tokens), synthetic_charset)
+        ids = [table.intern(token) for token in tokens]
+        assert id_post_processor.apply_ids(ids, synthetic_charset, table) == expected, tokens
+
+
+def test_fused_resolution_matches_staged_passes_on_long_inputs(synthetic_charset):
+    vocabulary = ["TINCO", "PARMA", "A_VIRT", "R_VIRT", "OTHER", "SEQ", "*SPACE", "*LF"]
+    string_post_processor = make_post_processor()
+    id_post_processor = make_post_processor()
+    table = TokenTable()
+    rng = random.Random(37)
+
+    for _ in range(200):
+        # Few separators, so that words are long and swaps chain
+        weights = [5, 5, 4, 4, 4, 2, 1, 1]
+        tokens = rng.choices(vocabulary, weights=weights, k=rng.randint(1, 80))
+        expected = string_post_processor.apply(list(tokens), synthetic_charset)
+        ids = [table.intern(token) for token in tokens]
+        assert id_post_processor.apply_ids(ids, synthetic_charset, table) == expected, tokens
+
+
+def test_processor_interns_its_replacements(quenya_classical_mode):
+    processor = quenya_classical_mode.processor
+
+    ids = processor.transcribe_ids("aiya")
+    assert all(isinstance(token_id, int) for token_id in ids)
+    assert processor.transcribe("aiya") == processor.token_table.names_of(ids)
+
+
+def test_output_table_covers_structural_tokens(synthetic_charset):
+    outputs = charset_outputs(synthetic_charset, ["TINCO", "MISSING"])
+
+    assert outputs["PARMA"] == "\ue001"
+    assert outputs["NOT_IN_CHARSET"] == "?"
+    assert outputs["*SPACE"] == "\ue000?"
+    assert outputs["*LF"] == "\n"
+    assert charset_outputs(synthetic_charset)["*SPACE"] == " "
+
+    post_processor = make_post_processor()
+    post_processor.out_space = ["PARMA"]
+    assert post_processor.apply(["TINCO", "*SPACE", "X", "*UNKNOWN", "*LF"], synthetic_charset) == "\ue000\ue001??\n"
+    assert post_processor.output_table(synthetic_charset) is post_processor.output_table(synthetic_charset)
+
+
+def string_path_space(charset, out_space):
+    """Space output as the string post-processing path used to build it."""
+    if out_space and charset:
+        return "".join([
+            charset.get_character(token) if charset.has_character(token) else "?"
+            for token in out_space
+        ])
+    return " "
+
+
+@pytest.mark.parametrize("out_space", [None, [], ["TINCO"], ["TINCO", "MISSING"], ["", "PARMA"], [""]])
+def test_space_output_matches_string_path(synthetic_charset, out_space):
+    assert charset_outputs(synthetic_charset, out_space)["*SPACE"] == string_path_space(synthetic_charset, out_space)
+    assert charset_outputs(None, out_space)["*SPACE"] == " "
+    # The empty token still outputs nothing in the token stream
+    assert charset_outputs(synthetic_charset, out_space)[""] == ""
+
+
+def scan_all_virtuals(charset, tokens):
+    """Virtual resolution looking at every virtual class for every token."""
+    new_tokens = list(tokens)
+    for reversed_pass in (False, True):
+        last_triggers = {}
+        order = range(len(tokens) - 1, -1, -1) if reversed_pass else range(len(tokens))
+        for idx in order:
+            token = tokens[idx]
+            if token in ("*SPACE", "*LF"):
+                last_triggers = {}
+                continue
+            vc = charset.virtual_chars.get(token)
+            if vc is not None and vc.reversed == reversed_pass and last_triggers.get(id(vc)) is not None:
+                new_tokens[idx] = token = last_triggers[id(vc)].names[0]
+            for vc in charset.virtual_chars.values():
+                if vc[token] is not None:
+                    last_triggers[id(vc)] = vc[token]
+    return new_tokens
+
+
+def test_virtual_trigger_index_matches_full_scan(synthetic_charset):
+    index = synthetic_charset.virtual_trigger_index()
+    assert [position for position, _ in index.triggers["TINCO"]] == [index.positions["A_VIRT"], index.positions["R_VIRT"]]
+    assert [position for position, _ in index.triggers["PARMA"]] == [index.positions["A_VIRT"]]
+
+    operator = ResolveVirtualsPostProcessorOperator(None)
+    vocabulary = ["TINCO", "T", "PARMA", "A_VIRT", "R_VIRT", "OTHER", "*SPACE", "*LF"]
+    rng = random.Random(36)
+    for _ in range(500):
+        tokens = [rng.choice(vocabulary) for _ in range(rng.randint(0, 15))]
+        # No sequences in the vocabulary, and swaps only touch OTHER
+        expected = scan_all_virtuals(synthetic_charset, operator.apply_swaps(synthetic_charset, list(tokens)))
+        assert operator.apply(list(tokens), synthetic_charset) == expected, tokens
+
+
+def feed_in_chunks(stream, token_ids, rng, runs=None):
+    """Feed token IDs in random chunks, checking only words are held back."""
+    output = ""
+    position = 0
+    runs = list(runs or [])
+    while position < len(token_ids):
+        chunk = token_ids[position:position + rng.randint(1, 7)]
+        position += len(chunk)
+        run_count = chunk.count(TokenTable.UNKNOWN_RUN)
+        output += stream.feed(chunk, runs[:run_count])
+        del runs[:run_count]
+        if stream.splittable:
+            assert TokenTable.SPACE not in stream._pending and TokenTable.LF not in stream._pending
+    return output + stream.flush()
+
+
+def test_stream_matches_whole_list(synthetic_charset):
+    vocabulary = ["TINCO", "PARMA", "A_VIRT", "R_VIRT", "OTHER", "SEQ", "*SPACE", "*LF", "", "\\"]
+    post_processor = make_post_processor()
+    table = TokenTable()
+    rng = random.Random(38)
+
+    for _ in range(300):
+        ids = [table.intern(rng.choice(vocabulary)) for _ in range(rng.randint(0, 40))]
+        stream = post_processor.stream(synthetic_charset, table)
+        assert stream.splittable
+        assert feed_in_chunks(stream, ids, rng) == post_processor.apply_ids(ids, synthetic_charset, table), ids
+
+
+def test_stream_holds_everything_when_swaps_cross_separators(synthetic_charset):
+    synthetic_charset.swaps["TINCO"] = {"*SPACE"}
+    post_processor = make_post_processor()
+    table = TokenTable()
+    ids = list(table.intern_all(["PARMA", "TINCO", "*SPACE", "PARMA"]))
+
+    stream = post_processor.stream(synthetic_charset, table)
+    assert not stream.splittable
+    assert stream.feed(ids) == ""
+    assert stream.flush() == post_processor.apply_ids(ids, synthetic_charset, table) == "\ue001 \ue000\ue001"
+
+
+def test_stream_transcribes_mode_output(quenya_classical_mode):
+    mode = quenya_classical_mode
+    charset = mode.default_charset
+    text = "ai laurië lantar lassi 日本 súrinen\nyéni únótimë"
+    runs = []
+    ids = mode.processor.transcribe_ids(mode.pre_processor.apply(text), runs=runs)
+
+    stream = mode.post_processor.stream(charset)
+    streamed = feed_in_chunks(stream, ids, random.Random(3), runs)
+    assert streamed == mode.post_processor.apply_ids(ids, charset, mode.processor.token_table, runs)
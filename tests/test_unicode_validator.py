@@ -1,5 +1,7 @@
 """Tests for glaemscribe.validation.unicode_validator."""
 
+import pytest
+
 from glaemscribe.validation.unicode_validator import (
     UnicodeValidator,
     ValidationResult,
@@ -78,3 +80,46 @@ def test_get_validation_summary_formats_success_and_failure():
     assert "Invalid Unicode transcription" in bad_summary
     assert "Errors: 4" in bad_summary
     assert "Invalid character at position 0" in bad_summary
+
+
+def bulk_sample_texts():
+    """Long texts mixing every character type, valid and invalid."""
+    import random
+
+    alphabet = (["\ue02a", "\ue040", "\U000e0041", " ", "\n", "\r", "?", ",", "a", "\u2028", "⸱",
+                 "—", "\u0001", "é", "中", "\U0001f600", "\ud800", "\x7f", "\x80"]
+                + ["\ue000"] * 10)
+    rng = random.Random(50)
+    texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(64, 400))) for _ in range(200)]
+    texts += ["\ue02a" * 100, " " * 100, "?" * 100]
+    return texts
+
+
+def test_bulk_validation_matches_per_character_validation(monkeypatch):
+    from glaemscribe.validation import unicode_validator
+
+    texts = bulk_sample_texts()
+
+    backends = [unicode_validator.numpy, None] if unicode_validator.numpy is not None else [None]
+    for backend in backends:
+        monkeypatch.setattr(unicode_validator, "numpy", backend)
+        v = UnicodeValidator()
+        for text in texts:
+            assert v._validate_bulk(text) == v._validate_characters(text), repr(text)
+
+        # The bulk tables follow changes to the allowed ranges
+        v.allowed_chars.add(0x0001)
+        v.valid_ranges["cjk"] = (0x4E00, 0x9FFF)
+        for text in texts[:20]:
+            assert v._validate_bulk(text) == v._validate_characters(text), repr(text)
+
+
+def test_numpy_bulk_path_matches_pure_python_path(monkeypatch):
+    pytest.importorskip("numpy")
+    from glaemscribe.validation import unicode_validator
+
+    v = UnicodeValidator()
+    texts = bulk_sample_texts()
+    with_numpy = [v._validate_bulk(text) for text in texts]
+    monkeypatch.setattr(unicode_validator, "numpy", None)
+    assert [v._validate_bulk(text) for text in texts] == with_numpy